@@ -0,0 +1,111 @@
+"""
+bench_db_profiles.py - Microbenchmark: default vs read-only/pooled SQLite profiles
+
+Builds a synthetic savegame.db (real schema) in a temp directory and times
+CODEX report rendering through:
+  default   - sqlite3.connect() per report (the old query.py::_conn behaviour)
+  readonly  - fresh connection per report with the 'readonly' profile
+  snapshot  - pooled connection with the 'snapshot' profile (what query.py uses)
+
+Usage:
+    python scripts/bench_db_profiles.py                # 200 reports, scale 1
+    python scripts/bench_db_profiles.py --runs 500 --scale 10
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.db.connection import close_pool, connect, pooled  # noqa: E402
+from src.db.query import _render_sections                  # noqa: E402
+from src.db.schema import init_savegame_db                  # noqa: E402
+
+
+def build_db(path: Path, scale: int) -> None:
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    init_savegame_db(conn)
+    conn.execute("INSERT INTO gs_global VALUES (1, 421.0, 3.0, 0, 0)")
+    n_nations = 200 * scale
+    conn.executemany(
+        "INSERT INTO gs_nations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(k, f"Nation {k}", rng.uniform(0.05, 25), rng.uniform(-3, 3),
+          rng.uniform(0, 5), rng.uniform(-1, 1), rng.uniform(0, 10), rng.randint(0, 500))
+         for k in range(n_nations)]
+    )
+    conn.executemany(
+        "INSERT INTO gs_control_points VALUES (?, ?, ?, ?, ?, ?)",
+        [(k, rng.randrange(n_nations), f % 8, f"Faction {f % 8}", 'Executive', int(f % 8 == 0))
+         for k, f in ((k, rng.randrange(64)) for k in range(n_nations * 6))]
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO gs_public_opinion VALUES (?, ?, ?, ?, ?, ?)",
+        [(k, f"Nation {k}", slug, slug.title(), rng.uniform(0, 60), rng.uniform(-2, 2))
+         for k in range(n_nations) for slug in ('resist', 'destroy', 'exploit', 'undecided')]
+    )
+    conn.executemany(
+        "INSERT INTO gs_research_completed VALUES (?)",
+        [(f"Tech{i}",) for i in range(150 * scale)]
+    )
+    conn.executemany(
+        "INSERT INTO gs_habs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(k, 7, 'Mars', f"Hab {k}", 'Base', 1, k % 8, f"Faction {k % 8}", int(k % 8 == 0))
+         for k in range(40 * scale)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def time_runs(fn, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--scale', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "savegame_bench.db"
+        build_db(db, args.scale)
+        print(f"Synthetic savegame.db: {db.stat().st_size / 1024:.0f}KB (scale {args.scale})")
+
+        def default():
+            conn = sqlite3.connect(db)
+            conn.row_factory = sqlite3.Row
+            _render_sections(conn)
+            conn.close()
+
+        def readonly():
+            conn = connect(db, 'readonly')
+            _render_sections(conn)
+            conn.close()
+
+        def snapshot():
+            _render_sections(pooled(db, 'snapshot'))
+
+        print(f"\n{'Profile':<10} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+        print("-" * 38)
+        for name, fn in (('default', default), ('readonly', readonly), ('snapshot', snapshot)):
+            fn()  # warmup
+            samples = sorted(time_runs(fn, args.runs))
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            print(f"{name:<10} {statistics.median(samples):>8.3f} {p95:>8.3f} {statistics.fmean(samples):>8.3f}")
+        close_pool()
+
+
+if __name__ == '__main__':
+    main()
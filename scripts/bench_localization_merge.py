@@ -0,0 +1,126 @@
+"""
+bench_localization_merge.py - Recursive-copy vs in-place iterative localization merge
+
+Runs both merge implementations over the largest shipped game templates
+(GAME_INSTALL_DIR from .env, or --game-dir) and reports wall time and
+tracemalloc peak for the merge alone (JSON parsing is excluded):
+  recursive - the previous merge_localization (copies every dict and list)
+  in-place  - src.load.command.merge_localization (explicit stack, no copies)
+
+Without a game install, a synthetic nested template is used instead.
+
+Usage:
+    python scripts/bench_localization_merge.py                 # 5 largest templates
+    python scripts/bench_localization_merge.py --top 10 --runs 5
+    python scripts/bench_localization_merge.py --game-dir "C:/Games/Terra Invicta"
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.tolerant_json import repair                # noqa: E402
+from src.db.localization import iter_localization_file  # noqa: E402
+from src.load.command import merge_localization         # noqa: E402
+
+
+def merge_recursive(data, localizations: dict):
+    """The pre-iterative implementation, kept here as the baseline."""
+    if isinstance(data, dict):
+        merged = {}
+        for key, value in data.items():
+            merged[key] = merge_recursive(value, localizations)
+
+        data_name = merged.get('dataName')
+        if data_name and data_name in localizations:
+            loc = localizations[data_name]
+            if 'displayName' in loc:
+                merged['displayName'] = loc['displayName']
+            if 'description' in loc:
+                merged['description'] = loc['description']
+
+        return merged
+
+    elif isinstance(data, list):
+        return [merge_recursive(item, localizations) for item in data]
+
+    else:
+        return data
+
+
+def load_cases(game_dir: Path | None, top: int) -> list[tuple[str, str, dict]]:
+    """Return [(name, raw_json_text, localizations)] for the largest templates."""
+    if game_dir is None:
+        items = [{'dataName': f"Item{i}", 'stats': [{'k': j, 'mods': {'a': j}} for j in range(20)]}
+                 for i in range(5000)]
+        loc = {f"Item{i}": {'displayName': f"Item {i}", 'description': 'x' * 80} for i in range(5000)}
+        return [('synthetic', json.dumps(items), loc)]
+
+    streaming = game_dir / "TerraInvicta_Data/StreamingAssets"
+    files = sorted((streaming / "Templates").glob("*.json"), key=lambda p: p.stat().st_size, reverse=True)
+    cases = []
+    for path in files[:top]:
+        loc_file = streaming / "Localization/en" / f"{path.stem}.en"
+        loc: dict[str, dict] = {}
+        if loc_file.exists():
+            for data_name, field, value in iter_localization_file(loc_file):
+                loc.setdefault(data_name, {})[field] = value
+        cases.append((path.stem, repair(path.read_text(encoding='utf-8-sig'))[0], loc))
+    return cases
+
+
+def measure(fn, text: str, loc: dict, runs: int) -> tuple[float, float]:
+    """Return (median ms, peak MiB) for fn over fresh parses of text.
+
+    Timing runs are untraced; peak memory comes from one extra traced run,
+    since tracemalloc itself slows allocation-heavy code.
+    """
+    times = []
+    for _ in range(runs):
+        data = json.loads(text)
+        t0 = time.perf_counter()
+        fn(data, loc)
+        times.append((time.perf_counter() - t0) * 1000)
+
+    data = json.loads(text)
+    tracemalloc.start()
+    fn(data, loc)
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--game-dir', type=Path)
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    game_dir = args.game_dir
+    if game_dir is None:
+        env_file = Path(__file__).parent.parent / ".env"
+        if env_file.exists():
+            for line in env_file.read_text(encoding='utf-8').splitlines():
+                if line.startswith('GAME_INSTALL_DIR='):
+                    game_dir = Path(line.split('=', 1)[1].strip())
+    if game_dir is not None and not (game_dir / "TerraInvicta_Data").exists():
+        print(f"Game install not found at {game_dir}, using synthetic template")
+        game_dir = None
+
+    print(f"{'Template':<32} {'KB':>7} {'rec ms':>8} {'rec MiB':>8} {'inpl ms':>8} {'inpl MiB':>8}")
+    print("-" * 76)
+    for name, text, loc in load_cases(game_dir, args.top):
+        rec_ms, rec_mib = measure(merge_recursive, text, loc, args.runs)
+        inp_ms, inp_mib = measure(merge_localization, text, loc, args.runs)
+        print(f"{name:<32} {len(text) // 1024:>7} {rec_ms:>8.1f} {rec_mib:>8.2f} {inp_ms:>8.1f} {inp_mib:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
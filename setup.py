@@ -12,7 +12,7 @@ setup(
     python_requires=">=3.11",
     packages=find_namespace_packages(include=['src*']),  # Changed: finds packages even without __init__.py
     install_requires=[
-        # No runtime dependencies - uses stdlib only
+        'numpy>=1.26',  # site yields, launch calendar, transfer windows
     ],
     extras_require={
         'dev': [
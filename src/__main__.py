@@ -18,34 +18,74 @@ if sys.version_info < (3, 11):
 # Import core utilities
 from src.core.core import setup_logging
 
-# Import command functions
-from src.clean.command    import cmd_clean
-from src.install.command  import cmd_install
-from src.load.command     import cmd_load
-from src.validate.command import cmd_validate
-from src.perf.command     import cmd_perf
-from src.parse.command    import cmd_parse
-from src.stage.command    import cmd_stage
-from src.preset.command   import cmd_preset
-from src.play.command     import cmd_play
+# Command name -> 'module:function'. A command's module (and everything it
+# imports) is loaded only when that command runs, so `tias perf` does not pay
+# for requests, numpy or the orchestrator. tests/perf/test_startup.py gates this.
+COMMANDS = {
+    'install':  'src.install.command:cmd_install',
+    'clean':    'src.clean.command:cmd_clean',
+    'load':     'src.load.command:cmd_load',
+    'validate': 'src.validate.command:cmd_validate',
+    'perf':     'src.perf.command:cmd_perf',
+    'parse':    'src.parse.command:cmd_parse',
+    'stage':    'src.stage.command:cmd_stage',
+    'preset':   'src.preset.command:cmd_preset',
+    'play':     'src.play.command:cmd_play',
+    'bench':    'src.bench.command:cmd_bench',
+}
+
+
+def load_command(name: str):
+    """Import and return the cmd_* function registered for name."""
+    module, function = COMMANDS[name].split(':')
+    # __import__ rather than importlib.import_module: -X importtime only times the former
+    return getattr(__import__(module, fromlist=[function]), function)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Terra Invicta Advisory System')
     parser.add_argument('-v', '--verbose', action='count', default=0,
                         help='Increase verbosity (-v INFO, -vv DEBUG)')
+    parser.add_argument('--profile', choices=['cpu', 'mem'], metavar='{cpu,mem}',
+                        help='Profile the command (--profile or --profile=cpu: cProfile; --profile=mem: '
+                             'tracemalloc per span); reports in logs/profiles/, per turn for play')
 
     subparsers = parser.add_subparsers(dest='command', help='Command')
 
     subparsers.add_parser('install',  help='Interactive setup (auto-detect paths)')
     subparsers.add_parser('clean',    help='Remove build directory')
-    subparsers.add_parser('load',     help='Import game templates into SQLite database')
+    load_parser = subparsers.add_parser('load', help='Import game templates into SQLite database')
+    load_parser.add_argument('--force', action='store_true', help='Rebuild even if inputs are unchanged')
+    load_parser.add_argument('--explain', action='store_true', help='Show why each build step ran or was skipped')
+    load_parser.add_argument('-j', '--jobs', type=int, help='Template worker processes (default: CPU count)')
     subparsers.add_parser('validate', help='Validate configuration and paths')
-    subparsers.add_parser('perf',     help='Display performance statistics')
+    perf_parser = subparsers.add_parser('perf', help='Display performance statistics')
+    perf_parser.add_argument('--command', dest='perf_command', help='Only this command (e.g. stage)')
+    perf_parser.add_argument('--since', help='Runs on or after this date (YYYY-MM-DD)')
+    perf_parser.add_argument('--until', help='Runs on or before this date (YYYY-MM-DD)')
+    perf_parser.add_argument('--min-save-mb', type=float, help='Runs whose savegame is at least this size')
+    perf_parser.add_argument('--max-save-mb', type=float, help='Runs whose savegame is at most this size')
+    perf_parser.add_argument('--trend', choices=['day', 'week', 'month'], help='Show P50/P95 per period')
+    bench_parser = subparsers.add_parser('bench', help='Benchmark the pipeline on synthetic savegames')
+    bench_parser.add_argument('--scales', help='Comma-separated savegame scales (default: 0.5,1,2)')
+    bench_parser.add_argument('--seed', type=int, help='Synthetic savegame seed (default: 0, or the baseline\'s)')
+    bench_parser.add_argument('--repeat', type=int, help='Measured runs per phase (default: 1, or 5 with a baseline)')
+    bench_parser.add_argument('--warmup', type=int, help='Discarded runs per phase (default: 0, or 1 with a baseline)')
+    bench_parser.add_argument('--save-baseline', nargs='?', const=True, metavar='FILE',
+                              help='Save results as the baseline (default: logs/bench_baseline.json)')
+    bench_parser.add_argument('--compare', nargs='?', const=True, metavar='FILE',
+                              help='Compare with a saved baseline; exit 1 on regression')
+    bench_parser.add_argument('--threshold', type=float, help='Regression threshold in percent (default: 10)')
     stage_parser = subparsers.add_parser('stage', help='Parse savegame, evaluate tier, assemble actor context files')
-    stage_parser.add_argument('--faction', required=True, help='Faction slug (e.g. resist, exodus, academy)')
-    stage_parser.add_argument('--date', required=True, help='Date (YYYY-M-D or YYYY-MM-DD or DD/MM/YYYY)')
-    stage_parser.add_argument('--force', action='store_true', help='Re-parse savegame even if DB is current')
+    stage_parser.add_argument('--faction', required=True,
+                              help='Faction slug, or comma-separated slugs (e.g. resist or resist,destroy)')
+    stage_dates = stage_parser.add_mutually_exclusive_group(required=True)
+    stage_dates.add_argument('--date', help='Date (YYYY-M-D or YYYY-MM-DD or DD/MM/YYYY)')
+    stage_dates.add_argument('--from', dest='date_from', help='First date of a range (with --to)')
+    stage_parser.add_argument('--to', dest='date_to', help='Last date of a range (with --from)')
+    stage_parser.add_argument('-j', '--jobs', type=int, help='Savegame parse processes for a range (default: CPU count)')
+    stage_parser.add_argument('--force', action='store_true', help='Rebuild every stage artifact even if current')
+    stage_parser.add_argument('--explain', action='store_true', help='Show why each build step ran or was skipped')
 
     parse_parser = subparsers.add_parser('parse', help='Parse savegame into SQLite database')
     parse_parser.add_argument('--date', required=True, help='Date (YYYY-M-D or YYYY-MM-DD or DD/MM/YYYY)')
@@ -53,14 +93,24 @@ def main():
     preset_parser = subparsers.add_parser('preset', help='Combine actor contexts and game state into LLM context')
     preset_parser.add_argument('--faction', required=True, help='Faction slug (e.g. resist, exodus, academy)')
     preset_parser.add_argument('--date', required=True, help='Date (YYYY-M-D or YYYY-MM-DD or DD/MM/YYYY)')
+    preset_parser.add_argument('--force', action='store_true', help='Re-render even if the savegame DB is unchanged')
+    preset_parser.add_argument('--explain', action='store_true', help='Show why each build step ran or was skipped')
 
     play_parser = subparsers.add_parser('play', help='Launch KoboldCpp')
     play_parser.add_argument('--faction', required=True, help='Faction slug (e.g. resist, exodus, academy)')
     play_parser.add_argument('--date', required=True, help='Date (YYYY-M-D or YYYY-MM-DD or DD/MM/YYYY)')
     play_parser.add_argument('--quality', choices=['base', 'max', 'nuclear', 'ridiculous', 'ludicrous'],
                              help='Model quality tier (default: base or KOBOLDCPP_QUALITY from .env)')
+    play_parser.add_argument('--explain', action='store_true', help='Show why each build step ran or was skipped')
 
-    args = parser.parse_args()
+    # A bare --profile means cpu; rewritten so it cannot swallow the command name
+    args = parser.parse_args(['--profile=cpu' if a == '--profile' else a for a in sys.argv[1:]])
+
+    if args.command == 'stage':
+        if args.date and args.date_to:
+            stage_parser.error("--to goes with --from, not --date")
+        if args.date_from and not args.date_to:
+            stage_parser.error("--from needs --to")
 
     setup_logging(args.verbose)
 
@@ -68,20 +118,12 @@ def main():
         parser.print_help()
         return 1
 
-    commands = {
-        'install':  cmd_install,
-        'clean':    cmd_clean,
-        'load':     cmd_load,
-        'validate': cmd_validate,
-        'perf':     cmd_perf,
-        'parse':    cmd_parse,
-        'stage':    cmd_stage,
-        'preset':   cmd_preset,
-        'play':     cmd_play,
-    }
-
-    commands[args.command](args)
+    if args.profile and args.command != 'play':     # play profiles each turn itself
+        from src.perf.profiling import profiled
+        with profiled(args.command, args.profile):
+            return load_command(args.command)(args)
+    return load_command(args.command)(args)
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
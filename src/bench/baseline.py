@@ -0,0 +1,143 @@
+"""
+Terra Invicta Advisory System - Bench baselines
+
+Stores tias bench results as a baseline JSON and compares a later run
+against it, phase by phase and scale by scale.
+
+A phase's wall-time samples are compared on their median. A percentile
+bootstrap (resampling both sample sets) gives a confidence interval for
+the relative change of the median. A phase regresses only when the whole
+interval lies beyond the threshold, so run-to-run noise does not fail the
+check; a real but noisy slowdown needs more repeats to show.
+
+Usage:
+    from src.bench.baseline import compare, load_baseline, save_baseline
+    save_baseline(path, results, seed=0, repeat=5, warmup=1)
+    rows = compare(load_baseline(path), results, threshold=0.10)
+"""
+
+import json
+import logging
+import random
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+
+BASELINE_VERSION = 1
+BASELINE_FILE    = "bench_baseline.json"    # in logs/
+
+BOOTSTRAP_RESAMPLES = 2000
+CONFIDENCE          = 0.95
+# Changes this small (seconds) are timer and process-start noise, never regressions
+MIN_REGRESSION_S    = 0.005
+
+
+def scale_key(scale) -> str:
+    """JSON key of a scale: 1 -> '1', 0.5 -> '0.5'."""
+    return f"{scale:g}"
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+def save_baseline(path: Path, results: dict, root: Path | None = None, **settings) -> dict:
+    """
+    Write run_bench() results to path with host, revision and run settings
+    (seed, repeat, warmup). Returns the baseline dict.
+    """
+    from src.perf.store import git_revision, host_info
+
+    baseline = {
+        'version':    BASELINE_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'revision':   git_revision(root) if root else None,
+        'host':       host_info(),
+        **settings,
+        'saves':  {scale_key(s): save for s, save in results['saves'].items()},
+        'phases': {phase: {scale_key(s): samples for s, samples in by_scale.items()}
+                   for phase, by_scale in results['phases'].items()},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2), encoding='utf-8')
+    return baseline
+
+
+def load_baseline(path: Path) -> dict | None:
+    """Load a baseline. Returns None if missing, corrupt or from an older format."""
+    if not path.exists():
+        return None
+    try:
+        baseline = json.loads(path.read_text(encoding='utf-8'))
+    except json.JSONDecodeError:
+        logging.warning(f"Corrupt bench baseline ignored: {path.name}")
+        return None
+    if baseline.get('version') != BASELINE_VERSION:
+        logging.warning(f"Bench baseline {path.name} has version {baseline.get('version')} — ignored")
+        return None
+    return baseline
+
+
+def baseline_scales(baseline: dict) -> list:
+    """Scales of a baseline as numbers, in the order they were run."""
+    return [float(k) if '.' in k else int(k) for k in baseline['saves']]
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def bootstrap_ci(base: list[float], current: list[float], resamples: int = BOOTSTRAP_RESAMPLES,
+                 confidence: float = CONFIDENCE, seed: int = 0) -> tuple[float, float]:
+    """Percentile bootstrap interval for median(current) / median(base) - 1."""
+    rng = random.Random(seed)
+    changes = sorted(
+        median(rng.choices(current, k=len(current))) / median(rng.choices(base, k=len(base))) - 1
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    return changes[int(tail * (resamples - 1))], changes[round((1 - tail) * (resamples - 1))]
+
+
+def compare(baseline: dict, results: dict, threshold: float) -> list[dict]:
+    """
+    One row per phase and scale present in both: median wall times, relative
+    change with its confidence interval, peak RSS change (KB) and whether the
+    phase regressed: the interval's lower bound is beyond threshold (a
+    fraction, 0.10 = 10% slower).
+    """
+    rows = []
+    for phase, by_scale in results['phases'].items():
+        for scale, samples in by_scale.items():
+            base = baseline['phases'].get(phase, {}).get(scale_key(scale))
+            if not base or not base['wall'] or not samples['wall']:
+                continue
+            base_p50, now_p50 = median(base['wall']), median(samples['wall'])
+            if base_p50 <= 0:
+                continue
+            change = now_p50 / base_p50 - 1
+            low, high = bootstrap_ci(base['wall'], samples['wall'])
+            rows.append({
+                'phase': phase, 'scale': scale,
+                'base': base_p50, 'now': now_p50, 'change': change, 'low': low, 'high': high,
+                'rss_kb': max(samples['peak_kb']) - max(base['peak_kb']),
+                'regressed': low > threshold and now_p50 - base_p50 > MIN_REGRESSION_S,
+            })
+    return rows
+
+
+def format_comparison(rows: list[dict], threshold: float) -> str:
+    """Per-phase deltas against the baseline; regressions marked with !"""
+    lines = [f"{'Phase':<20} {'Scale':>6} {'Base P50':>10} {'Now P50':>10} {'Change':>8} "
+             f"{f'{CONFIDENCE:.0%} CI':>18} {'RSS MB':>8}",
+             "-" * 86]
+    for r in rows:
+        mark = "!" if r['regressed'] else " "
+        ci = f"[{r['low']:+.1%}, {r['high']:+.1%}]"
+        lines.append(f"{mark}{r['phase']:<19} {scale_key(r['scale']) + 'x':>6} {r['base']:>10.3f} "
+                     f"{r['now']:>10.3f} {r['change']:>+8.1%} {ci:>18} {r['rss_kb'] / 1024:>+8.1f}")
+    regressed = [r for r in rows if r['regressed']]
+    lines.append("")
+    lines.append(f"{len(regressed)} regression(s) beyond +{threshold:.0%}" if regressed
+                 else f"No regression beyond +{threshold:.0%}")
+    return "\n".join(lines)
@@ -0,0 +1,314 @@
+"""
+Bench command - End-to-end benchmark on synthetic savegames
+
+Generates a synthetic savegame per scale (src/bench/synthetic.py) in a
+temporary directory and times every pipeline phase on it: parse, the stage
+phases (tier_state, savegame_db, report, contexts), preset and the CODEX
+report. Each phase runs in a fresh process, so its peak RSS is its own;
+its modules are imported before the timer starts.
+
+Scale 1 is a real early-campaign save. Nation history grows with the scale
+too, so the save's JSON grows with its square: 2x (~50 MB) is roughly a
+late-game save, and the default range stops there.
+
+Stage needs game_templates.db: the bench writes synthetic templates
+matching its saves and builds the templates DB from them as tias load
+does, once per run and untimed. Actors come from the project's resources/
+when present; without them the contexts phase is skipped.
+
+With --save-baseline the results are stored (src/bench/baseline.py);
+--compare reruns the baseline's scales and seed and exits non-zero when a
+phase's median wall time regressed beyond --threshold.
+
+Usage:
+  tias bench                      # scales 0.5, 1 and 2 (1 = a real early-campaign save)
+  tias bench --scales 1,3 --seed 7
+  tias bench --save-baseline      # logs/bench_baseline.json, 5 runs after 1 warmup
+  tias bench --compare --threshold 15
+"""
+
+import json
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from statistics import median
+from typing import Callable
+
+from src.core.core import get_project_root
+from src.perf.performance import timed_command
+
+DEFAULT_SCALES = (0.5, 1, 2)
+REPEAT         = 5      # runs per phase when saving or comparing a baseline
+WARMUP         = 1
+THRESHOLD_PCT  = 10     # slowdown of a phase's median that fails --compare
+GAME_DATE      = datetime(2027, 8, 1)
+FACTION        = 'resist'
+
+PHASES = ('parse', 'stage/tier_state', 'stage/savegame_db', 'stage/report', 'stage/contexts',
+          'preset', 'codex')
+
+# DEVELOPER_GUIDE.md performance targets (seconds), checked at scale 1, the size of a real save
+TARGETS = {'parse': 0.5, 'stage/contexts': 0.1, 'preset': 0.02}
+
+
+# ---------------------------------------------------------------------------
+# Phases (run in a child process)
+# ---------------------------------------------------------------------------
+
+# Modules each phase imports lazily, loaded before its timings start
+LAZY_IMPORTS = {
+    'stage/tier_state':  ('src.stage.tier_rules', 'src.db.body_index', 'src.db.template_tables'),
+    'stage/savegame_db': ('src.db.body_index', 'src.db.launch_calendar', 'src.db.localization',
+                          'src.db.research_bits', 'src.db.template_tables',
+                          'src.preset.launch_windows', 'src.preset.transfers'),
+    'stage/report':      ('src.db.query',),
+    'preset':            ('src.core.build_graph', 'src.db.query'),
+}
+
+
+def _phase(phase: str, work: Path, templates_dir: Path, resources_dir: Path | None) -> Callable[[], object]:
+    """
+    The phase as a call against the files of earlier phases in work/. Its
+    modules are imported here, so cold imports stay out of the timings.
+    """
+    import importlib
+
+    iso_date     = GAME_DATE.strftime('%Y-%m-%d')
+    raw_db       = work / "raw.db"
+    savegame_db  = work / "savegame.db"
+    bodies_file  = templates_dir / 'TISpaceBodyTemplate.json'
+    templates_db = templates_dir.parent / 'game_templates.db'
+    for module in LAZY_IMPORTS.get(phase, ()):
+        importlib.import_module(module)
+
+    if phase == 'parse':
+        from src.parse.command import parse_savegame
+        return lambda: parse_savegame(work / "saves", GAME_DATE, raw_db)
+    if phase == 'stage/tier_state':
+        from src.db.gamestate import GameState
+        from src.stage.command import evaluate_tier
+        return lambda: evaluate_tier(raw_db, work, iso_date, GameState(raw_db, templates_db), faction=FACTION)
+    if phase == 'stage/savegame_db':
+        from src.db.gamestate import GameState
+        from src.db.populate import populate_savegame_db
+        return lambda: populate_savegame_db(
+            raw_db, savegame_db, FACTION, iso_date, GameState(raw_db, templates_db).helpers(FACTION),
+            game_date=GAME_DATE, templates_file=bodies_file, templates_dir=templates_dir)
+    if phase == 'stage/report':
+        from src.db.report_artifact import write_report_artifact
+        return lambda: write_report_artifact(savegame_db, work / "report.json")
+    if phase == 'stage/contexts':
+        from src.stage.command import assemble_contexts
+
+        def contexts():
+            tier = json.loads((work / f"tier_state_{iso_date}.json").read_text(encoding='utf-8'))['current_tier']
+            (work / "contexts").mkdir(exist_ok=True)
+            assemble_contexts(resources_dir, work / "contexts", tier)
+        return contexts
+    if phase == 'preset':
+        from src.preset.command import render_preset
+        return lambda: render_preset(savegame_db, work / "preset")
+    if phase == 'codex':
+        from src.db.query import build_codex_report
+        return lambda: build_codex_report(savegame_db)
+    raise ValueError(f"Unknown bench phase: {phase}")
+
+
+def _process_peak_kb() -> int:
+    """
+    Peak RSS of this process image in KB. Linux carries ru_maxrss across
+    exec, so a spawned child would report its parent's peak; VmHWM does not.
+    """
+    from src.perf.performance import _peak_rss_kb
+
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return _peak_rss_kb()
+
+
+def measure_phase(phase: str, work: Path, templates_dir: Path, resources_dir: Path | None = None) -> dict:
+    """
+    Run one phase and return its wall and CPU seconds and the process's peak
+    RSS (KB). Wall and CPU time exclude importing the phase's modules.
+    """
+    import time
+
+    run = _phase(phase, work, templates_dir, resources_dir)
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    run()
+    return {'wall': time.perf_counter() - start_wall, 'cpu': time.process_time() - start_cpu,
+            'peak_kb': _process_peak_kb()}
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def run_bench(scales, seed: int = 0, resources_dir: Path | None = None,
+              repeat: int = 1, warmup: int = 0) -> dict:
+    """
+    Benchmark every phase at each scale, repeat times after warmup discarded rounds.
+    Returns {'saves': {scale: {records, save_bytes, json_bytes}},
+             'phases': {phase: {scale: {'wall': [...], 'cpu': [...], 'peak_kb': [...]}}}}.
+    """
+    from src.bench.synthetic import (
+        generate_gamestates, record_count, savegame_name, write_gamestates, write_templates)
+    from src.load.command import create_templates_db
+
+    phases = [p for p in PHASES if p != 'stage/contexts' or
+              (resources_dir is not None and (resources_dir / "actors").is_dir())]
+    results = {'saves': {}, 'phases': {p: {} for p in phases}}
+    # One task per process: the child's peak RSS belongs to that phase alone
+    with tempfile.TemporaryDirectory(prefix='tias-bench-') as tmp, \
+            ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn'), max_tasks_per_child=1) as pool:
+        templates_dir = write_templates(Path(tmp) / "build" / "templates", seed)
+        create_templates_db(templates_dir.parent, templates_dir)
+        for scale in scales:
+            work = Path(tmp) / f"x{scale}"
+            save = work / "saves" / savegame_name(GAME_DATE)
+            gamestates = generate_gamestates(scale, GAME_DATE, seed)
+            json_bytes = write_gamestates(save, gamestates)
+            results['saves'][scale] = {
+                'records':    record_count(gamestates),
+                'save_bytes': save.stat().st_size,
+                'json_bytes': json_bytes,
+            }
+            del gamestates
+            samples = {p: {'wall': [], 'cpu': [], 'peak_kb': []} for p in phases}
+            # Whole rounds, so each phase reads files the previous phase just wrote
+            for round_no in range(warmup + repeat):
+                for phase in phases:
+                    logging.info(f"Bench {phase} at {_scale_label(scale)} "
+                                 f"({'warmup' if round_no < warmup else f'run {round_no - warmup + 1}/{repeat}'})...")
+                    m = pool.submit(measure_phase, phase, work, templates_dir, resources_dir).result()
+                    if round_no >= warmup:
+                        for key, value in m.items():
+                            samples[phase][key].append(value)
+            for phase in phases:
+                results['phases'][phase][scale] = samples[phase]
+    return results
+
+
+def _scale_label(scale) -> str:
+    return f"{scale:g}x"
+
+
+def format_tables(results: dict) -> str:
+    """Save sizes, then latency, throughput and peak memory per phase (rows) and scale (columns)."""
+    saves = results['saves']
+    scales = list(saves)
+    header = f"{'Phase':<20}" + "".join(f"{_scale_label(s):>12}" for s in scales)
+    rule = "-" * len(header)
+
+    lines = ["Synthetic savegames:",
+             f"{'Scale':<8} {'Records':>10} {'Save MB':>9} {'JSON MB':>9}", "-" * 39]
+    for scale, save in saves.items():
+        lines.append(f"{_scale_label(scale):<8} {save['records']:>10,} {save['save_bytes'] / 2**20:>9.2f} "
+                     f"{save['json_bytes'] / 2**20:>9.2f}")
+
+    def table(title: str, cell) -> list[str]:
+        rows = ["", title, header, rule]
+        for phase, by_scale in results['phases'].items():
+            rows.append(f"{phase:<20}" + "".join(f"{cell(phase, s, by_scale[s]):>12}" for s in scales))
+        return rows
+
+    def latency(phase, scale, m):
+        wall = median(m['wall'])
+        warning = "!" if scale == 1 and wall > TARGETS.get(phase, float('inf')) else ""
+        return f"{warning}{wall:.3f}"
+
+    def throughput(phase, scale, m):
+        wall = median(m['wall'])
+        return f"{saves[scale]['records'] / wall:,.0f}" if wall else "-"
+
+    lines += table("Latency (median wall seconds; ! = over target at 1x):", latency)
+    lines += table("Throughput (gamestate records per second):", throughput)
+    lines += table("Peak memory (process RSS MB):",
+                   lambda phase, scale, m: f"{max(m['peak_kb']) / 1024:.1f}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Command entry point
+# ---------------------------------------------------------------------------
+
+@timed_command
+def cmd_bench(args):
+    """Benchmark parse, stage, preset and CODEX report on synthetic savegames"""
+    from src.bench.baseline import (
+        BASELINE_FILE, baseline_scales, compare, format_comparison, load_baseline, save_baseline)
+
+    print("Terra Invicta Advisory System - Benchmark")
+    print("=" * 60)
+
+    project_root = get_project_root()
+
+    def baseline_path(value) -> Path | None:
+        if value is None:
+            return None
+        return project_root / "logs" / BASELINE_FILE if value is True else Path(value)
+
+    save_to      = baseline_path(getattr(args, 'save_baseline', None))
+    compare_with = baseline_path(getattr(args, 'compare', None))
+    checked      = save_to is not None or compare_with is not None
+    seed         = getattr(args, 'seed', None)
+    repeat       = getattr(args, 'repeat', None) or (REPEAT if checked else 1)
+    warmup       = getattr(args, 'warmup', None)
+    warmup       = warmup if warmup is not None else (WARMUP if checked else 0)
+    threshold    = (getattr(args, 'threshold', None) or THRESHOLD_PCT) / 100
+
+    baseline = None
+    if compare_with is not None:
+        baseline = load_baseline(compare_with)
+        if baseline is None:
+            logging.error(f"No bench baseline at {compare_with}. Run: tias bench --save-baseline")
+            return 1
+        # Same saves as the baseline, or the comparison means nothing
+        if seed is not None and seed != baseline.get('seed', 0):
+            logging.warning(f"--seed {seed} ignored: comparing with baseline seed {baseline.get('seed', 0)}")
+        seed = baseline.get('seed', 0)
+
+    try:
+        if getattr(args, 'scales', None):
+            scales = [float(s) if '.' in s else int(s) for s in args.scales.split(',')]
+        else:
+            scales = baseline_scales(baseline) if baseline else list(DEFAULT_SCALES)
+    except ValueError:
+        logging.error(f"Invalid --scales: {args.scales} (expected e.g. 0.5,1,2)")
+        return 1
+    if any(s <= 0 for s in scales):
+        logging.error("Scales must be positive")
+        return 1
+    if repeat < 1 or warmup < 0:
+        logging.error("--repeat must be at least 1 and --warmup at least 0")
+        return 1
+
+    seed = seed or 0
+    results = run_bench(scales, seed, project_root / "resources", repeat=repeat, warmup=warmup)
+    print(f"\nFaction {FACTION}, game date {GAME_DATE:%Y-%m-%d}, seed {seed}, "
+          f"{repeat} run(s) after {warmup} warmup\n")
+    print(format_tables(results))
+
+    regressed = False
+    if baseline is not None:
+        rows = compare(baseline, results, threshold)
+        print(f"\nCompared with {compare_with.name} "
+              f"(revision {baseline.get('revision') or '?'}, {baseline.get('created_at', '?')}):")
+        print(format_comparison(rows, threshold))
+        regressed = any(r['regressed'] for r in rows)
+
+    if save_to is not None:
+        save_baseline(save_to, results, project_root, seed=seed, repeat=repeat, warmup=warmup)
+        print(f"\n[OK] Baseline saved: {save_to}")
+
+    if regressed:
+        logging.error(f"Performance regression beyond +{threshold:.0%} against {compare_with.name}")
+        return 1
@@ -0,0 +1,368 @@
+"""
+Terra Invicta Advisory System - Synthetic savegames
+
+Writes valid .gz savegames holding every gamestate type and field that
+parse, stage and preset read (src/db/populate.py, src/db/gamestate.py,
+src/stage/tier_rules.py), so the pipeline can be benchmarked without
+shipping real late-game saves.
+
+scale multiplies the counts of nations (with their regions and control
+points), councilors, habs (with their sectors and modules), fleets,
+federations, minor bodies and finished techs, and the length of every
+nation history. Scale 1 matches a real early-campaign save: every nation,
+region and control point, five years of weekly history and ~13 MB of JSON.
+The solar system's major bodies and the seven factions are fixed. The same
+(scale, seed) always produces the same save.
+
+write_templates() writes the matching game templates (bodies with orbits,
+hab sites, mining profiles, hab modules, techs and projects) for tias load's
+create_templates_db, since stage joins against game_templates.db. Game data
+does not grow with the save, so the templates do not scale.
+
+Usage:
+    from src.bench.synthetic import write_savegame, write_templates
+    path = write_savegame(saves_dir, scale=2, game_date=date(2027, 8, 1))   # .../Bench_2027-8-1.gz
+    write_templates(build_dir / "templates")
+"""
+
+import gzip
+import itertools
+import json
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.db.gamestate import FACTIONS, GS
+
+# Counts at scale 1: an early-campaign save (mid 2027) with every nation,
+# region and control point of a real one. Its JSON is ~13 MB, like a real
+# save's, so TARGETS are checked at 1x.
+NATIONS            = 200
+REGIONS_PER_NATION = 2
+CPS_PER_NATION     = 4
+COUNCILORS         = 6      # per faction
+HABS               = 30
+MODULES_PER_HAB    = 8
+FLEETS             = 20
+FEDERATIONS        = 4
+MINOR_BODIES       = 10
+TECHS              = 80
+HISTORY            = 290    # weekly samples per nation history, 2022 to mid 2027
+
+# (field, start low, start high, weekly drift) of the nation histories only the
+# game reads; they carry a real save's share of history data
+OTHER_HISTORIES = (
+    ('historyPopulation', 1e5, 1.4e9, 0.001), ('historyGDPPerCapita', 500, 80000, 0.01),
+    ('historyDemocracy', 0, 10, 0.02), ('historyCohesion', 0, 10, 0.02),
+    ('historyEducation', 0, 12, 0.005), ('historyInequality', 0, 10, 0.01),
+    ('historyMilitaryTech', 0, 4, 0.005),
+)
+
+# (name, barycenter name, hab sites, max hab tier)
+BODIES = [
+    ('Sol', None, 0, 0), ('Mercury', 'Sol', 2, 2), ('Venus', 'Sol', 2, 2),
+    ('Earth', 'Sol', 0, 0), ('Luna', 'Earth', 4, 3), ('Mars', 'Sol', 4, 3),
+    ('Phobos', 'Mars', 1, 2), ('Deimos', 'Mars', 1, 2), ('Ceres', 'Sol', 2, 3),
+    ('Vesta', 'Sol', 1, 2), ('Jupiter', 'Sol', 0, 0), ('Io', 'Jupiter', 1, 2),
+    ('Europa', 'Jupiter', 2, 3), ('Ganymede', 'Jupiter', 2, 3), ('Callisto', 'Jupiter', 2, 3),
+    ('Saturn', 'Sol', 0, 0), ('Titan', 'Saturn', 2, 3), ('Enceladus', 'Saturn', 1, 2),
+]
+
+# Heliocentric semi-major axes (AU) of the major bodies that orbit the Sun
+PLANET_AXES = {'Mercury': 0.387, 'Venus': 0.723, 'Earth': 1.0, 'Mars': 1.524, 'Ceres': 2.767,
+               'Vesta': 2.362, 'Jupiter': 5.203, 'Saturn': 9.537}
+MINING_PROFILES   = 8
+TECH_TEMPLATES    = 300
+PROJECT_TEMPLATES = 600
+
+MODULE_TEMPLATES = ('Core', 'SolarCollector', 'Mine', 'Shipyard', 'Farm', 'ResearchLab',
+                    'Barracks', 'Spaceport', 'FusionReactor', 'OrbitalRing')
+COUNCILOR_TYPES  = ('Spy', 'Investigator', 'Diplomat', 'Tycoon', 'Officer', 'Astronaut',
+                    'Hacker', 'Activist', 'Commando', 'Journalist')
+CP_TYPES         = ('Executive', 'Legislature', 'Military', 'Media', 'Economy', 'SpaceProgram')
+OPINION_KEYS     = ('Resist', 'Destroy', 'Exploit', 'Submit', 'Appease', 'Cooperate', 'Escape', 'Undecided')
+
+
+def _count(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def _ref(key: int) -> dict:
+    return {'value': key}
+
+
+def _typed_ref(kind: str, key: int) -> dict:
+    return {'$type': f'{GS}{kind}', 'value': key}
+
+
+def _entry(key: int, value: dict) -> dict:
+    return {'Key': {'value': key}, 'Value': value}
+
+
+def _walk(rng: random.Random, start: float, steps: int, drift: float) -> list[float]:
+    """Random walk of steps samples, rounded like the game's float output."""
+    values, x = [], start
+    for _ in range(steps):
+        x = max(0.0, x * (1 + rng.uniform(-drift, drift)))
+        values.append(round(x, 4))
+    return values
+
+
+def _opinion(rng: random.Random) -> dict[str, float]:
+    weights = [rng.random() for _ in OPINION_KEYS]
+    total = sum(weights)
+    return {k: round(w / total, 4) for k, w in zip(OPINION_KEYS, weights)}
+
+
+def generate_gamestates(scale: float = 1, game_date: date = date(2027, 8, 1), seed: int = 0) -> dict[str, list]:
+    """{gamestate type: [{'Key': {'value': k}, 'Value': {...}}]} for a save of the given scale."""
+    rng = random.Random(seed)
+    next_key = itertools.count(1000).__next__
+    history = _count(HISTORY, scale)
+
+    # --- Factions and players (The Resistance is the human player) ---
+    faction_keys = {slug: next_key() for slug in FACTIONS}
+    factions = {slug: {
+        'displayName': name, 'exists': True, 'archived': False,
+        'resources': {'Money': round(rng.uniform(50, 5000), 2), 'Influence': round(rng.uniform(5, 500), 2),
+                      'Operations': round(rng.uniform(1, 100), 2), 'Boost': round(rng.uniform(0, 200), 2)},
+        'baseIncomes_year': {'MissionControl': rng.randint(4, 40)},
+        'councilors': [], 'controlPoints': [], 'fleets': [], 'intel': [], 'internalCouncilorSuspicion': [],
+    } for slug, name in FACTIONS.items()}
+    players = [_entry(next_key(), {'isAI': slug != 'resist', 'faction': _ref(key)})
+               for slug, key in faction_keys.items()]
+    slugs = list(FACTIONS)
+
+    # --- Earth: nations, regions, control points, federations ---
+    nations, regions, cps = [], [], []
+    for i in range(_count(NATIONS, scale)):
+        nk = next_key()
+        region_keys = [next_key() for _ in range(REGIONS_PER_NATION)]
+        regions += [_entry(rk, {'displayName': f'Region {nk}-{j}'}) for j, rk in enumerate(region_keys)]
+        gdp = rng.uniform(5e9, 2e13)
+        nation = {
+            'displayName': f'Nation {i}', 'capital': _ref(region_keys[0]), 'GDP': round(gdp, 0),
+            'historyGDP': _walk(rng, gdp, history, 0.01),
+            'historyUnrest': _walk(rng, rng.uniform(0, 6), history, 0.1),
+            **{field: _walk(rng, rng.uniform(low, high), history, drift)
+               for field, low, high, drift in OTHER_HISTORIES},
+            'unrest': round(rng.uniform(0, 8), 2), 'democracy': round(rng.uniform(0, 10), 2),
+            'numNuclearWeapons': rng.choice([0, 0, 0, 10, 200]),
+            'publicOpinion': _opinion(rng),
+            'historyPublicOpinion': [_opinion(rng) for _ in range(history)],
+            'regions': [_ref(rk) for rk in region_keys],
+            'aggregateNation': False,
+        }
+        for j in range(CPS_PER_NATION):
+            ck = next_key()
+            owner = rng.choice(slugs + [None, None])
+            cp = {'nation': _ref(nk), 'controlPointType': CP_TYPES[j % len(CP_TYPES)],
+                  'faction': _ref(faction_keys[owner]) if owner else None}
+            cps.append(_entry(ck, cp))
+            if owner:
+                factions[owner]['controlPoints'].append(_ref(ck))
+        nations.append(_entry(nk, nation))
+
+    federations = []
+    for i in range(_count(FEDERATIONS, scale)):
+        fk = next_key()
+        members = rng.sample(nations, min(len(nations), rng.randint(2, 8)))
+        for m in members:
+            m['Value'].setdefault('federation', _ref(fk))
+        federations.append(_entry(fk, {'exists': True, 'displayName': f'Federation {i}',
+                                       'members': [_ref(m['Key']['value']) for m in members]}))
+
+    # --- Space: bodies, sites, orbits ---
+    bodies, sites, orbits = [], [], []
+    body_keys: dict[str, int] = {}
+    site_keys: list[int] = []
+    minor = [(f'Asteroid {i}', 'Sol', 1, 2) for i in range(_count(MINOR_BODIES, scale))]
+    for name, barycenter, n_sites, max_tier in BODIES + minor:
+        bk = body_keys[name] = next_key()
+        body_sites = [next_key() for _ in range(n_sites)]
+        sites += [_entry(sk, {'parentBody': _ref(bk)}) for sk in body_sites]
+        site_keys += body_sites
+        body = {'displayName': name, 'exists': True, 'templateName': name.replace(' ', ''),
+                'habSites': [_ref(sk) for sk in body_sites], 'maxHabTier': max_tier}
+        if barycenter:
+            body['barycenter'] = _ref(body_keys[barycenter])
+        bodies.append(_entry(bk, body))
+        orbits.append(_entry(next_key(), {'parentBody': _ref(bk)}))
+    orbit_keys = [o['Key']['value'] for o in orbits]
+
+    # --- Habs, sectors, modules ---
+    habs, sectors, modules = [], [], []
+    hab_keys = []
+    completed = (game_date - timedelta(days=30)).strftime('%Y-%m-%d')
+    pending = (game_date + timedelta(days=60)).strftime('%Y-%m-%d')
+    for i in range(_count(HABS, scale)):
+        hk = next_key()
+        owner = slugs[0] if i % 3 == 0 else rng.choice(slugs)
+        hab = {'displayName': f'Hab {i}', 'exists': True, 'tier': rng.randint(1, 3),
+               'faction': _ref(faction_keys[owner])}
+        if i % 2 == 0:
+            hab.update(habType='Base', habSite=_ref(rng.choice(site_keys)))
+        elif i % 5 == 1:
+            hab.update(habType='Station', barycenter=_ref(body_keys['Earth']), inEarthLEO=True)
+        else:
+            hab.update(habType='Station', orbitState=_ref(rng.choice(orbit_keys)))
+        habs.append(_entry(hk, hab))
+        hab_keys.append(hk)
+        sk = next_key()
+        sectors.append(_entry(sk, {'hab': _ref(hk)}))
+        for j in range(MODULES_PER_HAB):
+            done = rng.random() < 0.8
+            modules.append(_entry(next_key(), {
+                'exists': True, 'templateName': '' if j == MODULES_PER_HAB - 1 else rng.choice(MODULE_TEMPLATES),
+                'sector': _ref(sk), 'displayName': None,
+                'completionDate': f'{completed if done else pending}T00:00:00',
+                'constructionCompleted': done, 'powered': done, 'destroyed': False,
+            }))
+
+    # --- Councilors, intel, fleets ---
+    councilors = []
+    for slug in slugs:
+        for i in range(_count(COUNCILORS, scale)):
+            ck = next_key()
+            location = (_typed_ref('TIHabState', rng.choice(hab_keys)) if rng.random() < 0.2
+                        else _typed_ref('TIRegionState', rng.choice(regions)['Key']['value']))
+            councilors.append(_entry(ck, {
+                'displayName': f'{FACTIONS[slug]} Councilor {i}',
+                'typeTemplateName': rng.choice(COUNCILOR_TYPES),
+                'faction': _ref(faction_keys[slug]), 'location': location,
+            }))
+            factions[slug]['councilors'].append(_ref(ck))
+            if slug == 'resist':
+                factions[slug]['internalCouncilorSuspicion'].append(
+                    {'Key': {'value': ck}, 'Value': round(rng.random(), 3)})
+            else:
+                factions['resist']['intel'].append(
+                    {'Key': _typed_ref('TICouncilorState', ck), 'Value': round(rng.uniform(0.1, 1), 2)})
+    factions['resist']['intel'] += [{'Key': _typed_ref('TIFactionState', key), 'Value': round(rng.uniform(0.1, 1), 2)}
+                                    for slug, key in faction_keys.items() if slug != 'resist']
+
+    fleets = []
+    for i in range(_count(FLEETS, scale)):
+        fk = next_key()
+        owner = slugs[0] if i % 3 == 0 else rng.choice(slugs)
+        fleet = {'displayName': f'Fleet {i}', 'exists': True, 'faction': _ref(faction_keys[owner]),
+                 'dummyFleet': i % 7 == 6}
+        if i % 4:
+            fleet['barycenter'] = _ref(rng.choice(list(body_keys.values())))
+        fleets.append(_entry(fk, fleet))
+        factions[owner]['fleets'].append(_ref(fk))
+
+    # --- Globals ---
+    techs = [f'Tech{i}' for i in range(_count(TECHS, scale))]
+    global_values = _entry(next_key(), {
+        'earthAtmosphericCO2_ppm': round(rng.uniform(410, 480), 2),
+        'globalSeaLevelAnomaly_cm': round(rng.uniform(0, 30), 2),
+        'nuclearStrikes': rng.randint(0, 3), 'looseNukes': rng.randint(0, 5),
+    })
+    research = _entry(next_key(), {
+        'finishedTechsNames': techs,
+        'finishedOneTimeOnlyProjectNames': [f'Project{i}' for i in range(len(techs) // 3)],
+    })
+
+    return {
+        f'{GS}TIPlayerState':         players,
+        f'{GS}TIFactionState':        [_entry(faction_keys[slug], v) for slug, v in factions.items()],
+        f'{GS}TINationState':         nations,
+        f'{GS}TIRegionState':         regions,
+        f'{GS}TIControlPoint':        cps,
+        f'{GS}TIFederationState':     federations,
+        f'{GS}TICouncilorState':      councilors,
+        f'{GS}TIGlobalValuesState':   [global_values],
+        f'{GS}TIGlobalResearchState': [research],
+        f'{GS}TISpaceBodyState':      bodies,
+        f'{GS}TIHabSiteState':        sites,
+        f'{GS}TIOrbitState':          orbits,
+        f'{GS}TIHabState':            habs,
+        f'{GS}TISectorState':         sectors,
+        f'{GS}TIHabModuleState':      modules,
+        f'{GS}TISpaceFleetState':     fleets,
+    }
+
+
+def generate_templates(seed: int = 0) -> dict[str, list]:
+    """{template name: records} for the bodies and names generate_gamestates uses."""
+    rng = random.Random(seed)
+    bodies, sites = [], []
+    minor = [(f'Asteroid {i}', 'Sol', 1, 2) for i in range(MINOR_BODIES)]
+    for n, (name, barycenter, n_sites, _) in enumerate(BODIES + minor):
+        data_name = name.replace(' ', '')
+        object_type = ('Star' if barycenter is None else 'Asteroid' if n >= len(BODIES)
+                       else 'Planet' if barycenter == 'Sol' else 'Moon')
+        body = {'dataName': data_name, 'friendlyName': name, 'displayName': name,
+                'barycenterName': barycenter, 'objectType': object_type}
+        if barycenter == 'Sol':
+            body.update(semiMajorAxis_AU=PLANET_AXES.get(name, round(rng.uniform(2.1, 3.3), 4)),
+                        eccentricity=round(rng.uniform(0, 0.2), 4),
+                        inclination_Deg=round(rng.uniform(0, 10), 3),
+                        longAscendingNode_Deg=round(rng.uniform(0, 360), 3),
+                        argPeriapsis_Deg=round(rng.uniform(0, 360), 3),
+                        meanAnomalyAtEpoch_Deg=round(rng.uniform(0, 360), 3))
+        elif barycenter:
+            body['semiMajorAxis_AU'] = round(rng.uniform(0.0001, 0.01), 6)
+        bodies.append(body)
+        sites += [{'dataName': f'{data_name}Site{j}', 'parentBodyName': data_name,
+                   'miningProfileName': f'Profile{rng.randrange(MINING_PROFILES)}'} for j in range(n_sites)]
+
+    profiles = [{'dataName': f'Profile{i}',
+                 **{f'{r}_{stat}': round(rng.uniform(0, 20), 1)
+                    for r in ('water', 'metals', 'nobles', 'fissiles') for stat in ('mean', 'width')}}
+                for i in range(MINING_PROFILES)]
+    modules = [{'dataName': name, 'tier': 1 + i % 3, 'crew': rng.randint(0, 200), 'power': rng.randint(-50, 50)}
+               for i, name in enumerate(MODULE_TEMPLATES)]
+
+    def tree(prefix: str, count: int) -> list[dict]:
+        # Prerequisites among the previous 20 keep depths and closures game-like
+        return [{'dataName': f'{prefix}{i}', 'researchCost': rng.randint(100, 10000),
+                 'prereqs': sorted({f'{prefix}{rng.randrange(max(0, i - 20), i)}' for _ in range(rng.randint(1, 2))})
+                 if i else []}
+                for i in range(count)]
+
+    return {
+        'TISpaceBodyTemplate':     bodies,
+        'TIHabSiteTemplate':       sites,
+        'TIMiningProfileTemplate': profiles,
+        'TIHabModuleTemplate':     modules,
+        'TITechTemplate':          tree('Tech', TECH_TEMPLATES),
+        'TIProjectTemplate':       tree('Project', PROJECT_TEMPLATES),
+    }
+
+
+def write_templates(templates_dir: Path, seed: int = 0) -> Path:
+    """Write generate_templates() as build/templates/*.json. Returns templates_dir."""
+    templates_dir.mkdir(parents=True, exist_ok=True)
+    for template, records in generate_templates(seed).items():
+        (templates_dir / f"{template}.json").write_text(json.dumps(records, indent=2), encoding='utf-8')
+    return templates_dir
+
+
+def savegame_name(game_date: date, campaign: str = 'Bench') -> str:
+    """Savegame filename in the game's format: Bench_2027-8-1.gz (no zero-padding)."""
+    return f"{campaign}_{game_date.year}-{game_date.month}-{game_date.day}.gz"
+
+
+def write_gamestates(path: Path, gamestates: dict[str, list]) -> int:
+    """Write gamestates as a savegame .gz at path. Returns the uncompressed JSON size in bytes."""
+    text = json.dumps({'currentID': {'value': 0}, 'gamestates': gamestates}, separators=(',', ':'))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # The game writes UTF-8 with a BOM; parse reads it back with utf-8-sig
+    with gzip.open(path, 'wt', encoding='utf-8-sig', compresslevel=6) as f:
+        f.write(text)
+    return len(text.encode('utf-8'))
+
+
+def write_savegame(saves_dir: Path, scale: float = 1, game_date: date = date(2027, 8, 1),
+                   seed: int = 0) -> Path:
+    """Write a synthetic savegame for game_date into saves_dir. Returns its path."""
+    path = saves_dir / savegame_name(game_date)
+    write_gamestates(path, generate_gamestates(scale, game_date, seed))
+    return path
+
+
+def record_count(gamestates: dict[str, list]) -> int:
+    """Total gamestate records, the unit of bench throughput."""
+    return sum(len(records) for records in gamestates.values())
@@ -0,0 +1,326 @@
+"""
+Terra Invicta Advisory System - Fingerprinted Build Graph
+
+Small make-style dependency engine shared by load, stage, preset and play.
+Each artifact is a Node that declares its input files, upstream nodes,
+parameters and outputs. Content fingerprints (SHA-256) are stored in a
+manifest; a node re-runs only when something it depends on changed:
+
+  - forced (--force)
+  - never built, or an output is missing
+  - an input file's content changed (stat fast-path: size + mtime unchanged
+    means the cached digest is reused, so no-op runs never re-read inputs)
+  - a parameter changed (date, faction, ...)
+  - an upstream node's *outputs* changed (early cutoff: an upstream rebuild
+    that produces identical bytes does not cascade)
+
+Independent nodes (same topological level) run in parallel threads. Each
+node that runs is a performance span named after the node, without its
+bracketed parameters (raw_db, savegame_db, ...).
+
+Usage:
+    graph = BuildGraph(project_root / "build" / "build_manifest.json", project_root)
+    graph.add(Node("raw_db[2027-08-01]", action=..., inputs=[gz], outputs=[db]))
+    graph.add(Node("tier[...]", action=..., deps=["raw_db[2027-08-01]"], outputs=[...]))
+    results = graph.run(force=args.force)
+    if args.explain:
+        print(explain(results))
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from src.perf.performance import span
+
+MANIFEST_VERSION = 1
+_CHUNK = 1024 * 1024
+
+
+# ---------------------------------------------------------------------------
+# Data types
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Node:
+    name: str
+    action: Callable[[], Any]
+    inputs: list[Path] = field(default_factory=list)    # files or directories
+    outputs: list[Path] = field(default_factory=list)   # files or directories
+    deps: list[str] = field(default_factory=list)       # upstream node names
+    params: dict = field(default_factory=dict)          # non-file inputs
+
+
+@dataclass
+class NodeResult:
+    name: str
+    ran: bool
+    reason: str
+    elapsed: float = 0.0
+    value: Any = None
+    record: dict | None = None      # manifest entry, set when the node ran
+
+
+# ---------------------------------------------------------------------------
+# Fingerprints
+# ---------------------------------------------------------------------------
+
+def _iter_files(path: Path):
+    """Yield files under path (path itself if it is a file), sorted for stability."""
+    if path.is_file():
+        yield path
+    elif path.is_dir():
+        for p in sorted(path.rglob('*')):
+            if p.is_file() and '__pycache__' not in p.parts:
+                yield p
+
+
+def _hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _hash_params(params: dict) -> str:
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class _DigestCache:
+    """File digests keyed by path, reused while (size, mtime_ns) is unchanged."""
+
+    def __init__(self, entries: dict):
+        self.entries = entries
+
+    def file(self, path: Path) -> str:
+        st = path.stat()
+        key = str(path)
+        cached = self.entries.get(key)
+        if cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+            return cached['sha256']
+        digest = _hash_file(path)
+        self.entries[key] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}
+        return digest
+
+    def path(self, path: Path) -> str | None:
+        """Digest of a file, or combined digest of a directory tree. None if missing."""
+        if not path.exists():
+            return None
+        if path.is_file():
+            return self.file(path)
+        h = hashlib.sha256()
+        for p in _iter_files(path):
+            h.update(p.relative_to(path).as_posix().encode())
+            h.update(self.file(p).encode())
+        return h.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+
+class BuildGraph:
+    """Dependency graph of build artifacts backed by a JSON manifest."""
+
+    def __init__(self, manifest_path: Path, root: Path | None = None, workers: int = 4):
+        self.manifest_path = manifest_path
+        self.root = root
+        self.workers = workers
+        self.nodes: dict[str, Node] = {}
+
+    def add(self, node: Node) -> Node:
+        if node.name in self.nodes:
+            raise ValueError(f"Duplicate build node: {node.name}")
+        self.nodes[node.name] = node
+        return node
+
+    # --- manifest ---------------------------------------------------------
+
+    def _load_manifest(self) -> dict:
+        if not self.manifest_path.exists():
+            return {'version': MANIFEST_VERSION, 'nodes': {}, 'files': {}}
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except json.JSONDecodeError:
+            logging.warning(f"Corrupt build manifest ignored: {self.manifest_path.name}")
+            return {'version': MANIFEST_VERSION, 'nodes': {}, 'files': {}}
+        if data.get('version') != MANIFEST_VERSION:
+            return {'version': MANIFEST_VERSION, 'nodes': {}, 'files': {}}
+        return data
+
+    def _save_manifest(self, nodes: dict, files: dict) -> None:
+        # Merge with what is on disk so graphs sharing the manifest (load,
+        # stage, other dates) keep each other's entries. The merge is not
+        # locked: processes running at the same time must not each save it;
+        # workers use run(save=False) and the parent calls save().
+        current = self._load_manifest()
+        current['nodes'].update(nodes)
+        current['files'].update(files)
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(current, indent=1, sort_keys=True), encoding='utf-8')
+        os.replace(tmp, self.manifest_path)
+
+    def _label(self, path: Path) -> str:
+        if self.root is not None:
+            try:
+                return path.relative_to(self.root).as_posix()
+            except ValueError:
+                pass
+        return str(path)
+
+    # --- scheduling -------------------------------------------------------
+
+    def _levels(self) -> list[list[Node]]:
+        """Group nodes into topological levels (longest path from a root). Raises on cycles/unknown deps."""
+        for node in self.nodes.values():
+            for dep in node.deps:
+                if dep not in self.nodes:
+                    raise ValueError(f"Node '{node.name}' depends on unknown node '{dep}'")
+        depth: dict[str, int] = {}
+
+        def visit(name: str, stack: tuple = ()) -> int:
+            if name in stack:
+                raise ValueError(f"Build graph cycle: {' -> '.join(stack + (name,))}")
+            if name not in depth:
+                deps = self.nodes[name].deps
+                depth[name] = 1 + max((visit(d, stack + (name,)) for d in deps), default=-1)
+            return depth[name]
+
+        for name in self.nodes:
+            visit(name)
+        levels: list[list[Node]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for name, d in depth.items():
+            levels[d].append(self.nodes[name])
+        return levels
+
+    def _stale_reason(self, node: Node, record: dict | None, digests: dict,
+                      dep_outputs: dict, force: bool) -> str | None:
+        if force:
+            return "forced"
+        if record is None:
+            return "never built"
+        for out in node.outputs:
+            if not out.exists():
+                return f"output missing: {self._label(out)}"
+        old_inputs = record.get('inputs', {})
+        for label, digest in digests.items():
+            if old_inputs.get(label) != digest:
+                return f"input changed: {label}" if label in old_inputs else f"new input: {label}"
+        if record.get('params') != _hash_params(node.params):
+            return "params changed"
+        old_deps = record.get('deps', {})
+        for dep, fp in dep_outputs.items():
+            if old_deps.get(dep) != fp:
+                return f"upstream changed: {dep}"
+        return None
+
+    def save(self, results) -> None:
+        """Record NodeResults from run(save=False) (e.g. returned by worker processes) in the manifest."""
+        self._save_manifest({r.name: r.record for r in results if r.record is not None}, {})
+
+    def run(self, force: bool = False, only: set[str] | None = None,
+            save: bool = True) -> dict[str, NodeResult]:
+        """
+        Bring every node up to date. Returns {node_name: NodeResult}.
+        Exceptions from node actions propagate after the manifest is saved
+        for nodes that did complete, including the failed node's siblings.
+        With save=False the manifest is left alone; each NodeResult that ran
+        carries its record for a later save().
+        """
+        manifest = self._load_manifest()
+        cache = _DigestCache(dict(manifest.get('files', {})))
+        records = manifest.get('nodes', {})
+        updated: dict[str, dict] = {}
+        results: dict[str, NodeResult] = {}
+
+        try:
+            for level in self._levels():
+                plan = []
+                for node in level:
+                    if only is not None and node.name not in only:
+                        continue
+                    digests = {self._label(p): cache.path(p) for p in node.inputs}
+                    dep_outputs = {
+                        d: (updated.get(d) or records.get(d) or {}).get('outputs')
+                        for d in node.deps
+                    }
+                    reason = self._stale_reason(node, records.get(node.name), digests,
+                                                dep_outputs, force)
+                    if reason is None:
+                        results[node.name] = NodeResult(node.name, ran=False, reason="up to date")
+                    else:
+                        plan.append((node, reason, digests, dep_outputs))
+
+                if not plan:
+                    continue
+
+                def execute(item):
+                    node, reason, _, _ = item
+                    t0 = time.perf_counter()
+                    with span(node.name.split('[')[0]):
+                        value = node.action()
+                    return NodeResult(node.name, ran=True, reason=reason,
+                                      elapsed=time.perf_counter() - t0, value=value)
+
+                def record(item, result):
+                    node, _, digests, dep_outputs = item
+                    results[node.name] = result
+                    out_hash = hashlib.sha256()
+                    for out in node.outputs:
+                        out_hash.update((cache.path(out) or '').encode())
+                    updated[node.name] = {
+                        'inputs':   digests,
+                        'params':   _hash_params(node.params),
+                        'deps':     dep_outputs,
+                        'outputs':  out_hash.hexdigest(),
+                        'built_at': datetime.now().isoformat(timespec='seconds'),
+                        'elapsed':  round(result.elapsed, 3),
+                    }
+                    result.record = updated[node.name]
+
+                if len(plan) == 1 or self.workers <= 1:
+                    for item in plan:
+                        record(item, execute(item))
+                    continue
+
+                # Every sibling that finished is recorded before the first
+                # failure (in plan order) propagates
+                with ThreadPoolExecutor(max_workers=min(self.workers, len(plan))) as pool:
+                    futures = [pool.submit(execute, item) for item in plan]
+                errors = [f.exception() for f in futures if f.exception() is not None]
+                for item, future in zip(plan, futures):
+                    if future.exception() is None:
+                        record(item, future.result())
+                if errors:
+                    raise errors[0]
+        finally:
+            if save:
+                self._save_manifest(updated, cache.entries)
+
+        return results
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def explain(results: dict[str, NodeResult]) -> str:
+    """Human-readable table of why each node ran or was skipped (--explain)."""
+    if not results:
+        return "Build graph: nothing to do"
+    width = max(len(name) for name in results)
+    lines = ["Build graph:"]
+    for r in results.values():
+        status = "ran" if r.ran else "skipped"
+        timing = f"  ({r.elapsed:.3f}s)" if r.ran else ""
+        lines.append(f"  {status:<8} {r.name:<{width}}  {r.reason}{timing}")
+    return "\n".join(lines)
@@ -0,0 +1,48 @@
+"""
+Terra Invicta Advisory System - Orbital elements of TISpaceBodyTemplate records
+
+Shared by launch windows, transfers and the body index. Fields read:
+semiMajorAxis_AU, longAscendingNode_Deg, argPeriapsis_Deg,
+meanAnomalyAtEpoch_Deg and epoch_floatJYears; bodies form a tree through
+barycenterName.
+
+Usage:
+    from src.core.orbits import heliocentric_root, semi_major_axis_au
+    semi_major_axis_au(bodies['Mars'])         # 1.5237
+    heliocentric_root('Europa', bodies)        # 'Jupiter'
+"""
+
+SUN = 'Sol'
+EARTH = 'Earth'
+
+
+def semi_major_axis_au(body: dict) -> float | None:
+    """Semi-major axis in AU (around the barycenter), None if missing."""
+    value = body.get('semiMajorAxis_AU')
+    return float(value) if isinstance(value, (int, float)) and value > 0 else None
+
+
+def mean_longitude_deg(body: dict) -> float | None:
+    """Ω + ω + M at the template epoch, or None if the mean anomaly is missing."""
+    m = body.get('meanAnomalyAtEpoch_Deg')
+    if not isinstance(m, (int, float)):
+        return None
+    return float(body.get('longAscendingNode_Deg') or 0) + float(body.get('argPeriapsis_Deg') or 0) + float(m)
+
+
+def epoch_days(body: dict) -> float:
+    """Template epoch (epoch_floatJYears) as days from J2000; J2000 if absent."""
+    years = body.get('epoch_floatJYears')
+    return (years - 2000.0) * 365.25 if isinstance(years, (int, float)) else 0.0
+
+
+def heliocentric_root(name: str, bodies: dict[str, dict]) -> str | None:
+    """The body directly orbiting the Sun that name belongs to (itself for planets)."""
+    seen = set()
+    while name in bodies and name not in seen:
+        seen.add(name)
+        parent = bodies[name].get('barycenterName')
+        if not parent or parent == SUN:
+            return name
+        name = parent
+    return None
@@ -0,0 +1,93 @@
+"""
+Terra Invicta Advisory System - Tolerant JSON Reader
+
+Terra Invicta ships several templates that are not strict JSON: trailing
+commas before ] or }, and // line comments (occasionally /* */ blocks).
+This reader repairs them in a single regex pass that understands string
+literals, so a "//" inside a string (URLs, paths) is never touched.
+
+Each repair is recorded as (line, column, kind). Repaired text is cached by
+the SHA-256 of the source bytes and this module's code ({sha}.json +
+{sha}.repairs), so a malformed file costs one failed parse and one repair the first time, and a single
+parse on every later build of the same game version.
+
+Usage:
+    from src.core.tolerant_json import load_tolerant
+    data, repairs = load_tolerant(path, cache_dir=build_dir / "repair_cache")
+    # repairs == [] for valid JSON; [(12, 5, 'trailing_comma'), ...] otherwise
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+# Strings are matched (and kept) first, so comment/comma patterns only ever
+# apply outside string literals.
+_TOKENS = re.compile(
+    r'''
+      (?P<string>  "(?:[^"\\]|\\.)*" )
+    | (?P<line_comment>  //[^\n]* )
+    | (?P<block_comment> /\*.*?\*/ )
+    | (?P<trailing_comma> ,(?=(?:\s|//[^\n]*|/\*.*?\*/)*[\]}]) )
+    ''',
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def repair(text: str) -> tuple[str, list[tuple[int, int, str]]]:
+    """Strip comments and trailing commas outside strings. Returns (text, repairs)."""
+    repairs: list[tuple[int, int, str]] = []
+
+    def replace(match: re.Match) -> str:
+        kind = match.lastgroup
+        if kind == 'string':
+            return match.group()
+        start = match.start()
+        line = text.count('\n', 0, start) + 1
+        column = start - text.rfind('\n', 0, start)
+        repairs.append((line, column, kind))
+        # Keep newlines of block comments so later line numbers stay meaningful
+        return '\n' * match.group().count('\n') if kind == 'block_comment' else ''
+
+    return _TOKENS.sub(replace, text), repairs
+
+
+_CODE = hashlib.sha256(Path(__file__).read_bytes()).digest()
+
+
+def load_tolerant(path: Path, cache_dir: Path | None = None) -> tuple[object, list]:
+    """
+    Parse a JSON file, repairing it if needed.
+    Returns (data, repairs). Raises json.JSONDecodeError if repair is not enough.
+    """
+    raw = path.read_bytes()
+    cached = digest = None
+    if cache_dir is not None:
+        digest = hashlib.sha256(_CODE + raw).hexdigest()
+        cached = cache_dir / f"{digest}.json"
+        if cached.exists():
+            repairs_file = cached.with_suffix('.repairs')
+            repairs = json.loads(repairs_file.read_text(encoding='utf-8')) if repairs_file.exists() else []
+            with open(cached, encoding='utf-8') as f:
+                return json.load(f), [tuple(r) for r in repairs]
+
+    text = raw.decode('utf-8-sig')
+    try:
+        return json.loads(text), []
+    except json.JSONDecodeError:
+        pass
+
+    repaired, repairs = repair(text)
+    data = json.loads(repaired)
+
+    if cached is not None:
+        # Repairs first: a cache hit is keyed on the .json file existing
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cached.with_suffix('.repairs').write_text(json.dumps(repairs), encoding='utf-8')
+        tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(repaired, encoding='utf-8')
+        os.replace(tmp, cached)
+
+    return data, repairs
@@ -0,0 +1,187 @@
+"""
+body_index.py — Solar-system hierarchy index over TISpaceBodyState.
+
+Bodies form a tree through their barycenter references (Sol → Jupiter →
+Europa). The index is built once per snapshot and gives, for every body:
+
+    depth        0 for Sol, 1 for planets / asteroids, 2 for their moons
+    path         ancestor keys from the root, '/2/10/46/'
+    helio_key    the body directly orbiting the Sun (itself for planets)
+    zone         orbital zone of that heliocentric body (ZONES)
+    tin, tout    Euler-tour interval: b lies within a iff a.tin <= b.tin <= a.tout
+
+so "is this fleet in the Jupiter system" is one interval comparison and
+"Jupiter system or beyond" is a zone test, whatever the body keys are.
+Stage stores it as gs_body_index:
+
+    SELECT f.name FROM gs_fleets f
+    JOIN gs_body_index b ON b.body_key = f.body_key
+    JOIN gs_body_index j ON j.name = 'Jupiter'
+    WHERE b.tin BETWEEN j.tin AND j.tout
+
+Zones come from the heliocentric body's semi-major axis (tpl_TISpaceBodyTemplate,
+read once per GameState as SpaceBodies), falling back to known planet names
+when the templates lack one.
+
+Usage:
+    from src.db.body_index import build_body_index, load_space_bodies
+    index = build_body_index(bodies, load_space_bodies(templates_db).axes)
+    index.within(fleet_body_key, jupiter_key)   # O(1)
+    index.zone(fleet_body_key) in OUTER_ZONES
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.core.orbits import semi_major_axis_au
+
+ZONES = ('sol', 'earth', 'inner', 'belt', 'jupiter', 'outer', 'unknown')
+OUTER_ZONES = ('jupiter', 'outer')      # "Jupiter system or beyond"
+
+# Heliocentric semi-major axis (AU) upper bounds per zone; Earth's system is
+# its own zone regardless of distance
+ZONE_LIMITS_AU = (('inner', 2.0), ('belt', 4.6), ('jupiter', 6.0), ('outer', float('inf')))
+
+# Used when the templates give no semi-major axis
+KNOWN_ZONES = {
+    'Sol': 'sol', 'Earth': 'earth',
+    'Mercury': 'inner', 'Venus': 'inner', 'Mars': 'inner',
+    'Ceres': 'belt', 'Vesta': 'belt', 'Pallas': 'belt',
+    'Jupiter': 'jupiter',
+    'Saturn': 'outer', 'Uranus': 'outer', 'Neptune': 'outer', 'Pluto': 'outer',
+}
+
+
+@dataclass(frozen=True)
+class BodyNode:
+    key: int
+    name: str
+    template: str
+    parent: int | None
+    depth: int
+    path: tuple[int, ...]       # root → self, inclusive
+    helio_key: int
+    zone: str
+    tin: int
+    tout: int
+
+
+class BodyIndex:
+    """Body tree with O(1) ancestor / descendant / zone checks."""
+
+    def __init__(self, nodes: dict[int, BodyNode]):
+        self.nodes = nodes
+
+    def __contains__(self, key) -> bool:
+        return key in self.nodes
+
+    def within(self, key: int | None, ancestor: int) -> bool:
+        """True if key is ancestor or lies anywhere below it."""
+        node, anc = self.nodes.get(key), self.nodes.get(ancestor)
+        return bool(node and anc and anc.tin <= node.tin <= anc.tout)
+
+    def zone(self, key: int | None) -> str:
+        node = self.nodes.get(key)
+        return node.zone if node else 'unknown'
+
+    def key_of(self, name: str) -> int | None:
+        """Key of the body with this display or template name."""
+        return next((n.key for n in self.nodes.values() if name in (n.name, n.template)), None)
+
+
+@dataclass(frozen=True)
+class SpaceBodies:
+    """TISpaceBodyTemplate records by dataName, bodies with hab sites, semi-major axes (AU)."""
+    bodies: dict[str, dict]
+    targets: tuple[str, ...]
+    axes: dict[str, float]
+
+
+def load_space_bodies(templates_db: Path) -> SpaceBodies:
+    """
+    Space body templates from game_templates.db (tpl_TISpaceBodyTemplate,
+    tpl_TIHabSiteTemplate). Targets are the bodies with hab sites, every body
+    if the templates have none. Empty if the DB is missing.
+    """
+    from src.db.connection import connect
+    from src.db.template_tables import template_records
+    if not templates_db.exists():
+        logging.debug(f"Templates DB not found: {templates_db}; body zones from planet names")
+        return SpaceBodies({}, (), {})
+    conn = connect(templates_db, 'readonly')
+    try:
+        records = template_records(conn, 'TISpaceBodyTemplate')
+        sites = template_records(conn, 'TIHabSiteTemplate')
+    finally:
+        conn.close()
+    bodies = {b['dataName']: b for b in records if b.get('dataName')}
+    with_sites = {s.get('parentBodyName') for s in sites} & bodies.keys()
+    axes = {name: a for name, b in bodies.items() if (a := semi_major_axis_au(b)) is not None}
+    return SpaceBodies(bodies, tuple(sorted(with_sites or bodies)), axes)
+
+
+def _zone(name: str, template: str, axes: dict[str, float]) -> str:
+    """Zone of a heliocentric body (or of the star itself)."""
+    for n in (template, name):
+        if n in ('Sol', 'Earth'):
+            return KNOWN_ZONES[n]
+    a = axes.get(template, axes.get(name))
+    if a is not None:
+        return next(zone for zone, limit in ZONE_LIMITS_AU if a < limit)
+    return KNOWN_ZONES.get(template) or KNOWN_ZONES.get(name, 'unknown')
+
+
+def build_body_index(bodies: list[dict], axes: dict[str, float] | None = None) -> BodyIndex:
+    """
+    Index TISpaceBodyState records ({'Key': {'value'}, 'Value': {...}}).
+    Archived / non-existent bodies are skipped; a body whose barycenter is
+    missing becomes a root, and a barycenter cycle is cut at its lowest key.
+    """
+    axes = axes or {}
+    info: dict[int, tuple[str, str]] = {}
+    children: dict[int | None, list[int]] = {}
+    parents: dict[int, int | None] = {}
+    for b in bodies:
+        v = b['Value']
+        if not v.get('exists', True) or v.get('archived'):
+            continue
+        info[b['Key']['value']] = (v.get('displayName', '?'), v.get('templateName', ''))
+        parents[b['Key']['value']] = (v.get('barycenter') or {}).get('value')
+    for key, parent in parents.items():
+        children.setdefault(parent if parent in info and parent != key else None, []).append(key)
+
+    # Iterative DFS; tin on entry, tout = last tin inside the subtree
+    tin, tout, paths = {}, {}, {}
+    clock = 0
+    for root in sorted(children.get(None, [])) + sorted(info):
+        if root in tin:
+            continue
+        stack = [(root, (), False)]
+        while stack:
+            key, path, leaving = stack.pop()
+            if leaving:
+                tout[key] = clock - 1
+                continue
+            if key in tin:
+                continue
+            path += (key,)
+            tin[key], paths[key] = clock, path
+            clock += 1
+            stack.append((key, path, True))
+            stack.extend((c, path, False) for c in sorted(children.get(key, ()), reverse=True))
+
+    zones: dict[int, str] = {}
+    nodes: dict[int, BodyNode] = {}
+    for key, path in paths.items():
+        star = 'Sol' in info[path[0]]
+        helio = path[1] if star and len(path) > 1 else path[0]
+        if helio not in zones:
+            zones[helio] = _zone(*info[helio], axes)
+        nodes[key] = BodyNode(
+            key=key, name=info[key][0], template=info[key][1],
+            parent=path[-2] if len(path) > 1 else None, depth=len(path) - 1, path=path,
+            helio_key=helio, zone=zones[helio], tin=tin[key], tout=tout[key],
+        )
+    logging.debug(f"Body index: {len(nodes)} bodies, {len(zones)} heliocentric")
+    return BodyIndex(nodes)
@@ -0,0 +1,120 @@
+"""
+connection.py — SQLite connection factory with named profiles.
+
+Profiles:
+  readwrite  — populate/stage writers: WAL journal, foreign keys on
+  readonly   — readers of databases that may still change (raw parse DB):
+               mode=ro URI, query_only, mmap, larger page cache
+  snapshot   — readers of finalized snapshots (savegame_{date}.db after stage):
+               readonly + immutable=1, so SQLite skips locking and change detection
+
+Read profiles are served from a per-thread pool: the first call opens the
+connection, later calls on the same thread reuse it. A pooled connection is
+dropped and reopened when the file's identity (inode, size, mtime) changes,
+so a re-parsed or re-staged DB is never read through a stale handle.
+
+Usage:
+    from src.db.connection import connect, pooled
+    conn = pooled(savegame_db, 'snapshot')   # do not close — owned by the pool
+    conn = connect(output_db, 'readwrite')   # caller closes
+    attach(conn, templates_db, 'tpl')        # read-only ATTACH for cross-DB joins
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from urllib.parse import quote
+
+MMAP_SIZE  = 256 * 1024 * 1024   # bytes; SQLite caps this at the file size
+CACHE_KIB  = 64 * 1024           # page cache per connection (negative pragma = KiB)
+
+PROFILES: dict[str, dict] = {
+    'readwrite': {
+        'uri':     {},
+        'pragmas': {'journal_mode': 'WAL', 'foreign_keys': 'ON'},
+    },
+    'readonly': {
+        'uri':     {'mode': 'ro'},
+        'pragmas': {'query_only': 'ON', 'mmap_size': MMAP_SIZE, 'cache_size': -CACHE_KIB},
+    },
+    'snapshot': {
+        'uri':     {'mode': 'ro', 'immutable': '1'},
+        'pragmas': {'query_only': 'ON', 'mmap_size': MMAP_SIZE, 'cache_size': -CACHE_KIB},
+    },
+}
+
+_local = threading.local()
+
+
+def _uri(db: Path, params: dict) -> str:
+    query = '&'.join(f"{k}={v}" for k, v in params.items())
+    path = quote(Path(db).resolve().as_posix())
+    return f"file:{path}?{query}" if query else f"file:{path}"
+
+
+def connect(db: Path, profile: str = 'readonly') -> sqlite3.Connection:
+    """Open a new connection using a named profile. Caller owns (and closes) it."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown connection profile '{profile}'. Known: {', '.join(PROFILES)}")
+    spec = PROFILES[profile]
+
+    if spec['uri'].get('mode') == 'ro' and not Path(db).exists():
+        # mode=ro never creates the file — fail with a clear message instead of
+        # sqlite3.OperationalError: unable to open database file
+        raise FileNotFoundError(f"Database not found: {db}")
+
+    conn = sqlite3.connect(_uri(db, spec['uri']), uri=True)
+    conn.row_factory = sqlite3.Row
+    for pragma, value in spec['pragmas'].items():
+        conn.execute(f"PRAGMA {pragma}={value}")
+    return conn
+
+
+def attach(conn: sqlite3.Connection, db: Path, alias: str, profile: str = 'readonly') -> None:
+    """ATTACH another database to conn using a read profile's URI (e.g. mode=ro)."""
+    if PROFILES.get(profile, {}).get('uri', {}).get('mode') != 'ro':
+        raise ValueError(f"Profile '{profile}' cannot be attached (read profiles only)")
+    if not Path(db).exists():
+        raise FileNotFoundError(f"Database not found: {db}")
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (_uri(db, PROFILES[profile]['uri']),))
+
+
+def _signature(db: Path) -> tuple:
+    st = Path(db).stat()
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def pooled(db: Path, profile: str = 'readonly') -> sqlite3.Connection:
+    """
+    Return this thread's pooled connection for (db, profile).
+    Read profiles only — the pool never hands out writers.
+    """
+    if PROFILES.get(profile, {}).get('uri', {}).get('mode') != 'ro':
+        raise ValueError(f"Profile '{profile}' cannot be pooled (read profiles only)")
+
+    pool = getattr(_local, 'pool', None)
+    if pool is None:
+        pool = _local.pool = {}
+
+    key = (str(Path(db).resolve()), profile)
+    sig = _signature(db)
+    entry = pool.get(key)
+    if entry is not None:
+        conn, cached_sig = entry
+        if cached_sig == sig:
+            return conn
+        logging.debug(f"DB changed on disk, reopening: {Path(db).name} [{profile}]")
+        conn.close()
+
+    conn = connect(db, profile)
+    pool[key] = (conn, sig)
+    return conn
+
+
+def close_pool() -> None:
+    """Close every pooled connection owned by the calling thread."""
+    pool = getattr(_local, 'pool', None) or {}
+    for conn, _ in pool.values():
+        conn.close()
+    pool.clear()
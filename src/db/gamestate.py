@@ -0,0 +1,195 @@
+"""
+gamestate.py — Accessors for the raw parse DB (build/savegame_{date}.db).
+
+The raw DB holds one JSON blob per gamestate type. These helpers decode them
+for populate.py; everything downstream of stage reads the normalized
+savegame.db instead.
+
+GameState decodes each array once and shares it between every faction
+staged from the same save; its helpers() bundle has the same shape as
+RAW_HELPERS, with player_faction bound to the requested faction. The space
+body templates (build/game_templates.db next to the raw DB) are read once
+the same way.
+
+Usage:
+    from src.db.gamestate import RAW_HELPERS
+    populate_savegame_db(raw_db, output_db, faction_slug, iso_date, RAW_HELPERS)
+
+    gs = GameState(raw_db)
+    populate_savegame_db(raw_db, output_db, 'academy', iso_date, gs.helpers('academy'))
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+
+from src.db.body_index import SpaceBodies, load_space_bodies
+from src.db.connection import pooled
+
+# Faction slugs are the public-opinion ideology keys, lower-cased
+FACTIONS = {
+    'resist':    'The Resistance',
+    'destroy':   'Humanity First',
+    'exploit':   'The Initiative',
+    'submit':    'The Servants',
+    'appease':   'The Protectorate',
+    'cooperate': 'The Academy',
+    'escape':    'Project Exodus',
+}
+FACTION_ALIASES = {
+    'resistance': 'resist', 'humanityfirst': 'destroy', 'initiative': 'exploit',
+    'servants': 'submit', 'protectorate': 'appease', 'academy': 'cooperate', 'exodus': 'escape',
+}
+
+GS = 'PavonisInteractive.TerraInvicta.'
+TEMPLATES_DB = 'game_templates.db'
+
+
+def faction_slug(slug: str | None) -> str | None:
+    """Canonical faction slug for a slug or alias (any case), None if unknown."""
+    slug = (slug or '').lower()
+    slug = FACTION_ALIASES.get(slug, slug)
+    return slug if slug in FACTIONS else None
+
+
+def load_gs(db_path: Path, key: str):
+    """Load one gamestate array from the DB, parsed from JSON."""
+    row = pooled(db_path, 'readonly').execute(
+        "SELECT data FROM gamestates WHERE key = ?", (key,)
+    ).fetchone()
+    return json.loads(row[0]) if row else []
+
+
+# Each accessor is written against load(key) so it can be served from the
+# raw DB (RAW_HELPERS) or from a shared GameState cache.
+
+def _player_faction(load) -> tuple[int, dict]:
+    players = load(f'{GS}TIPlayerState')
+    human = next(p for p in players if not p['Value']['isAI'])
+    faction_key = human['Value']['faction']['value']
+    pf = next(f['Value'] for f in load(f'{GS}TIFactionState') if f['Key']['value'] == faction_key)
+    return faction_key, pf
+
+
+def _faction_names(load) -> dict[int, str]:
+    return {f['Key']['value']: f['Value'].get('displayName', '?') for f in load(f'{GS}TIFactionState')}
+
+
+def _nations(load) -> dict[int, dict]:
+    return {n['Key']['value']: n['Value'] for n in load(f'{GS}TINationState')}
+
+
+def _hab_bodies(load) -> dict[int, str]:
+    body_name = {b['Key']['value']: b['Value'].get('displayName', '?') for b in load(f'{GS}TISpaceBodyState')}
+    site_body = {s['Key']['value']: body_name.get(s['Value'].get('parentBody', {}).get('value'), '?')
+                 for s in load(f'{GS}TIHabSiteState')}
+    return {
+        h['Key']['value']: site_body.get((h['Value'].get('habSite') or {}).get('value'), '?')
+        for h in load(f'{GS}TIHabState')
+    }
+
+
+def player_faction(db_path: Path) -> tuple[int, dict]:
+    """Return (faction_key, faction_value) for the human player."""
+    return _player_faction(lambda key: load_gs(db_path, key))
+
+
+def faction_name_map(db_path: Path) -> dict[int, str]:
+    """Return {faction_key: display_name}."""
+    return _faction_names(lambda key: load_gs(db_path, key))
+
+
+def nation_map(db_path: Path) -> dict[int, dict]:
+    """Return {nation_key: nation_value}."""
+    return _nations(lambda key: load_gs(db_path, key))
+
+
+def hab_body_map(db_path: Path) -> dict[int, str]:
+    """Return {hab_key: body_display_name} for all habs that have a site."""
+    return _hab_bodies(lambda key: load_gs(db_path, key))
+
+
+def space_bodies(db_path: Path) -> SpaceBodies:
+    """Space body templates from game_templates.db next to the raw DB."""
+    return load_space_bodies(db_path.parent / TEMPLATES_DB)
+
+
+# Helper bundle passed to populate_savegame_db
+RAW_HELPERS = {
+    'load_gs':          load_gs,
+    'player_faction':   player_faction,
+    'faction_name_map': faction_name_map,
+    'nation_map':       nation_map,
+    'hab_body_map':     hab_body_map,
+    'space_bodies':     space_bodies,
+}
+
+
+# ---------------------------------------------------------------------------
+# Shared decoded gamestate
+# ---------------------------------------------------------------------------
+
+class GameState:
+    """
+    Gamestate arrays of one raw DB, each decoded on first use and shared
+    (thread-safe). With player_fallback, a faction slug that is not in the save
+    resolves to the human player (single-faction stage); without it, it raises.
+    """
+
+    def __init__(self, db_path: Path, templates_db: Path | None = None, player_fallback: bool = True):
+        self.db_path = db_path
+        self.templates_db = templates_db or db_path.parent / TEMPLATES_DB
+        self.player_fallback = player_fallback
+        self._warned: set[str] = set()
+        self._arrays: dict[str, list] = {}
+        self._space_bodies = None
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> list:
+        """Decoded array for key. Callers must not mutate it."""
+        with self._lock:
+            if key not in self._arrays:
+                self._arrays[key] = load_gs(self.db_path, key)
+            return self._arrays[key]
+
+    def space_bodies(self) -> SpaceBodies:
+        """Space body templates from templates_db, read on first use."""
+        with self._lock:
+            if self._space_bodies is None:
+                self._space_bodies = load_space_bodies(self.templates_db)
+            return self._space_bodies
+
+    def faction_key(self, slug: str | None) -> int | None:
+        """TIFactionState key for a faction slug or alias, None if it is not in this save."""
+        display = FACTIONS.get(faction_slug(slug))
+        if display is None:
+            return None
+        return next((f['Key']['value'] for f in self.load(f'{GS}TIFactionState')
+                     if f['Value'].get('displayName') == display), None)
+
+    def faction(self, slug: str | None = None) -> tuple[int, dict]:
+        """
+        (faction_key, faction_value) for slug; the human player's if slug is None,
+        or not in the save with player_fallback (ValueError without it).
+        """
+        key = self.faction_key(slug)
+        if key is None:
+            if slug and not self.player_fallback:
+                raise ValueError(f"Faction '{slug}' is not in this save")
+            if slug and slug not in self._warned:
+                self._warned.add(slug)
+                logging.warning(f"Faction '{slug}' not found in save, using the human player")
+            return _player_faction(self.load)
+        return key, next(f['Value'] for f in self.load(f'{GS}TIFactionState') if f['Key']['value'] == key)
+
+    def helpers(self, slug: str | None = None) -> dict:
+        """RAW_HELPERS-compatible bundle served from this cache, bound to slug's faction."""
+        return {
+            'load_gs':          lambda _db, key: self.load(key),
+            'player_faction':   lambda _db: self.faction(slug),
+            'faction_name_map': lambda _db: _faction_names(self.load),
+            'nation_map':       lambda _db: _nations(self.load),
+            'hab_body_map':     lambda _db: _hab_bodies(self.load),
+            'space_bodies':     lambda _db: self.space_bodies(),
+        }
@@ -0,0 +1,167 @@
+"""
+launch_calendar.py — Precomputed launch window calendar for the campaign span.
+
+Launch windows depend only on the date and static templates, so tias load
+evaluates src/preset/launch_windows.py once for every day from START to END
+and stores:
+
+    game_templates.db
+      launch_bodies(body PK, display, row, synodic)     row into the penalty array
+      launch_windows(body, day, window_date)            every optimal window,
+                                                        PK (body, day)
+      launch_calendar_meta(key PK, value)               start day, span, file name
+
+    build/launch_calendar.npy   uint8 [bodies, days]    daily penalty %, memory-mapped
+
+Any date is then an index seek (next window: first launch_windows row with
+day >= today) plus one array read (penalty), and "the next three Mars
+windows" is a LIMIT 3 query.
+
+Usage:
+    from src.db.launch_calendar import build_launch_calendar, lookup_windows
+    build_launch_calendar(conn, templates_dir / "TISpaceBodyTemplate.json", build_dir / CALENDAR_NAME)
+    lookup_windows(conn, game_date, calendar_path, schema='tpl')   # {} if out of range
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from src.preset.launch_windows import REFERENCE, next_windows, window_parameters
+
+CALENDAR_NAME = 'launch_calendar.npy'
+START = datetime(2022, 1, 1)        # campaign start
+END = datetime(2151, 1, 1)          # exclusive; well past any campaign's end
+UPCOMING = 3                        # windows per body copied into savegame.db
+
+SCHEMA = """
+DROP TABLE IF EXISTS launch_bodies;
+DROP TABLE IF EXISTS launch_windows;
+DROP TABLE IF EXISTS launch_calendar_meta;
+
+CREATE TABLE launch_bodies (
+    body     TEXT PRIMARY KEY,
+    display  TEXT,
+    row      INTEGER NOT NULL UNIQUE,
+    synodic  REAL NOT NULL
+);
+
+CREATE TABLE launch_windows (
+    body         TEXT NOT NULL,
+    day          INTEGER NOT NULL,     -- days from REFERENCE
+    window_date  TEXT NOT NULL,
+    PRIMARY KEY (body, day)
+) WITHOUT ROWID;
+CREATE INDEX idx_launch_windows_date ON launch_windows(window_date);
+
+CREATE TABLE launch_calendar_meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT NOT NULL
+);
+"""
+
+_arrays: dict[str, tuple[tuple, np.ndarray]] = {}
+_arrays_lock = threading.Lock()
+
+
+def _day(date: datetime) -> int:
+    return (date - REFERENCE).days
+
+
+def build_launch_calendar(conn: sqlite3.Connection, templates_file: Path, calendar_path: Path,
+                          start: datetime = START, end: datetime = END) -> int:
+    """(Re)build the calendar tables and penalty array. Returns the window count."""
+    conn.executescript(SCHEMA)
+    if not templates_file.exists():
+        calendar_path.unlink(missing_ok=True)
+        return 0
+
+    params = window_parameters(templates_file)
+    days = np.arange(_day(start), _day(end))
+    nxt, penalty = next_windows(params, days)                     # (days, bodies)
+
+    penalties = np.ascontiguousarray(penalty.T.astype(np.uint8))  # int() truncation, as live
+    tmp = calendar_path.with_suffix('.tmp.npy')
+    np.save(tmp, penalties)
+    tmp.replace(calendar_path)
+
+    conn.executemany(
+        "INSERT INTO launch_bodies VALUES (?, ?, ?, ?)",
+        ((name, params.display[i], i, float(params.synodic[i])) for i, name in enumerate(params.names))
+    )
+    windows = 0
+    for i, name in enumerate(params.names):
+        col = nxt[:, i]
+        # A window is a day whose next window is itself
+        hits = days[col == days].tolist()
+        conn.executemany(
+            "INSERT INTO launch_windows VALUES (?, ?, ?)",
+            ((name, d, (REFERENCE + timedelta(days=d)).strftime('%Y-%m-%d')) for d in hits)
+        )
+        windows += len(hits)
+    conn.executemany(
+        "INSERT INTO launch_calendar_meta VALUES (?, ?)",
+        [('start_day', str(int(days[0]))), ('days', str(len(days))), ('array', calendar_path.name)]
+    )
+    logging.info(f"Launch calendar: {len(params.names)} bodies, {windows} windows, "
+                 f"{start:%Y}-{end.year - 1}")
+    return windows
+
+
+def _penalty_array(calendar_path: Path) -> np.ndarray | None:
+    """Shared read-only memmap of the penalty array, reopened when the file changes."""
+    try:
+        st = calendar_path.stat()
+    except FileNotFoundError:
+        return None
+    sig = (st.st_ino, st.st_size, st.st_mtime_ns)
+    key = str(calendar_path.resolve())
+    with _arrays_lock:
+        cached = _arrays.get(key)
+        if cached and cached[0] == sig:
+            return cached[1]
+        array = np.load(calendar_path, mmap_mode='r')
+        _arrays[key] = (sig, array)
+        return array
+
+
+def lookup_windows(conn: sqlite3.Connection, game_date: datetime, calendar_path: Path,
+                   schema: str = 'main') -> dict:
+    """
+    Same shape as calculate_launch_windows, read from the calendar.
+    Returns {} if there is no calendar or game_date is outside it.
+    """
+    try:
+        meta = dict(conn.execute(f"SELECT key, value FROM {schema}.launch_calendar_meta"))
+    except sqlite3.OperationalError:
+        return {}
+    penalties = _penalty_array(calendar_path)
+    if not meta or penalties is None:
+        return {}
+    offset = _day(game_date) - int(meta['start_day'])
+    if not 0 <= offset < int(meta['days']):
+        return {}
+
+    today = _day(game_date)
+    rows = conn.execute(f"""
+        SELECT b.body, b.display, b.row,
+               (SELECT w.day FROM {schema}.launch_windows w
+                WHERE w.body = b.body AND w.day >= ? ORDER BY w.day LIMIT 1) AS next_day
+        FROM {schema}.launch_bodies b
+    """, (today,)).fetchall()
+
+    results = {}
+    for body, display, row, next_day in rows:
+        if next_day is None:
+            continue  # next window falls after the calendar end
+        results[body] = {
+            'display': display,
+            'next_window': (REFERENCE + timedelta(days=next_day)).strftime('%Y-%m-%d'),
+            'days_away': next_day - today,
+            'current_penalty': int(penalties[row, offset]),
+        }
+    return results
@@ -0,0 +1,135 @@
+"""
+localization.py — Indexed localization store (build/localization.db).
+
+tias load ingests every Localization/en/*.en file once into
+
+    localization(template, data_name, field, value)   PK (template, data_name, field)
+    localization_files(template, sha256)
+
+Refresh is incremental: only files whose content hash changed are re-read,
+and their rows replaced. Template merging and runtime display-name lookups
+are then indexed probes instead of re-parsing .en files into nested dicts.
+
+.en line format:  TITraitTemplate.displayName.Brave=Brave
+                  └─ template ─┘ └ field ──┘ └ data_name (may contain dots)
+
+Usage:
+    from src.db.localization import ingest_localization, template_strings, display_name
+    ingest_localization(loc_dir, build_dir / "localization.db")
+    loc = template_strings(loc_db, 'TITraitTemplate')   # {data_name: {field: value}}
+    display_name(loc_db, 'TIHabModuleTemplate', 'Core')  # 'Core Module' or None
+"""
+
+import hashlib
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Iterator
+
+from src.db.connection import connect, pooled
+
+MERGED_FIELDS = ('displayName', 'description')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS localization (
+    template   TEXT NOT NULL,
+    data_name  TEXT NOT NULL,
+    field      TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    PRIMARY KEY (template, data_name, field)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_localization_data_name ON localization(data_name, field);
+
+CREATE TABLE IF NOT EXISTS localization_files (
+    template   TEXT PRIMARY KEY,
+    sha256     TEXT NOT NULL
+);
+"""
+
+
+def iter_localization_file(loc_file: Path) -> Iterator[tuple[str, str, str]]:
+    """Yield (data_name, field, value) for every well-formed line of an .en file."""
+    with open(loc_file, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or '=' not in line:
+                continue
+
+            key, value = line.split('=', 1)
+            parts = key.split('.')
+
+            if len(parts) < 3:
+                continue
+
+            yield '.'.join(parts[2:]), parts[1], value
+
+
+def ingest_localization(loc_dir: Path, db_path: Path) -> tuple[int, int]:
+    """
+    Bring db_path up to date with loc_dir/*.en.
+    Returns (files_refreshed, files_unchanged). Removed files drop their rows.
+    """
+    conn = connect(db_path, 'readwrite')
+    conn.executescript(SCHEMA)
+
+    known = dict(conn.execute("SELECT template, sha256 FROM localization_files").fetchall())
+    seen = set()
+    refreshed = unchanged = 0
+
+    with conn:
+        for loc_file in sorted(loc_dir.glob("*.en")):
+            template = loc_file.stem
+            seen.add(template)
+            digest = hashlib.sha256(loc_file.read_bytes()).hexdigest()
+            if known.get(template) == digest:
+                unchanged += 1
+                continue
+
+            conn.execute("DELETE FROM localization WHERE template = ?", (template,))
+            # Last definition wins, as with the previous dict-based parser
+            conn.executemany(
+                "INSERT OR REPLACE INTO localization VALUES (?, ?, ?, ?)",
+                ((template, data_name, field, value)
+                 for data_name, field, value in iter_localization_file(loc_file))
+            )
+            conn.execute("INSERT OR REPLACE INTO localization_files VALUES (?, ?)", (template, digest))
+            refreshed += 1
+
+        for template in set(known) - seen:
+            conn.execute("DELETE FROM localization WHERE template = ?", (template,))
+            conn.execute("DELETE FROM localization_files WHERE template = ?", (template,))
+
+    conn.close()
+    logging.info(f"Localization: {refreshed} files refreshed, {unchanged} unchanged")
+    return refreshed, unchanged
+
+
+def template_strings(db_path: Path, template: str, fields=MERGED_FIELDS) -> dict[str, dict[str, str]]:
+    """Return {data_name: {field: value}} for one template (primary-key range scan)."""
+    if not db_path.exists():
+        return {}
+    marks = ','.join('?' * len(fields))
+    rows = pooled(db_path, 'readonly').execute(
+        f"SELECT data_name, field, value FROM localization "
+        f"WHERE template = ? AND field IN ({marks})",
+        (template, *fields)
+    ).fetchall()
+    strings: dict[str, dict[str, str]] = {}
+    for data_name, field, value in rows:
+        strings.setdefault(data_name, {})[field] = value
+    return strings
+
+
+def display_name(db_path: Path, template: str, data_name: str) -> str | None:
+    """Localized display name for one template entry, or None."""
+    if not db_path.exists():
+        return None
+    try:
+        row = pooled(db_path, 'readonly').execute(
+            "SELECT value FROM localization WHERE template = ? AND data_name = ? AND field = 'displayName'",
+            (template, data_name)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None  # DB predates the localization table
+    return row[0] if row else None
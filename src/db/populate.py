@@ -1,12 +1,13 @@
 """
 populate.py — Populate savegame.db from the raw savegame SQLite DB.
 
-Reuses extractor logic from preset/extractors/ to avoid duplication.
-Called by stage/command.py after parse phase.
+Called by stage/command.py after parse phase. This is the only place the raw
+JSON blobs are decoded into domain rows; preset and CODEX read the result.
 
 Usage:
+    from src.db.gamestate import RAW_HELPERS
     from src.db.populate import populate_savegame_db
-    populate_savegame_db(savegame_db, output_db, faction_slug, iso_date, helpers)
+    populate_savegame_db(raw_db, output_db, faction_slug, iso_date, RAW_HELPERS)
 """
 
 import logging
@@ -14,7 +15,18 @@ import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
 
+from src.db.connection import connect
 from src.db.schema import init_savegame_db, SCHEMA_VERSION
+from src.perf.performance import note, span
+
+MINING_SITES = 15            # best hab sites copied into gs_mining_sites ...
+MINING_SITES_PER_BODY = 3    # ... taking at most this many per body
+
+# tpl_* tables (and their columns) populate joins against; built by tias load
+REQUIRED_TEMPLATES = {
+    'TISpaceBodyTemplate': ('dataName', 'objectType'),
+    'TIHabModuleTemplate': ('dataName', 'tier', 'crew', 'power'),
+}
 
 
 # ---------------------------------------------------------------------------
@@ -30,6 +42,7 @@ def populate_savegame_db(
     game_date=None,
     templates_file: Path = None,
     templates_dir: Path = None,
+    previous_db: Path = None,
 ) -> None:
     """
     Populate savegame.db from the raw parse DB.
@@ -39,45 +52,64 @@ def populate_savegame_db(
         output_db:       Path to campaigns/{faction}/{date}/savegame.db
         faction_slug:    e.g. 'resist'
         iso_date:        e.g. '2027-08-01'
-        helpers:         Shared helper functions from preset/command.py
+        helpers:         Raw gamestate accessors (src.db.gamestate.RAW_HELPERS)
         game_date:       datetime.date for launch window calculations
-        templates_file:  Path to TISpaceBodyTemplate.json
-        templates_dir:   Path to build/templates/ directory (for module template lookup)
+        templates_file:  Path to TISpaceBodyTemplate.json (live launch windows outside the calendar)
+        templates_dir:   Path to build/templates/; build/game_templates.db next to it
+                         must hold REQUIRED_TEMPLATES (FileNotFoundError otherwise)
+        previous_db:     Previous staged savegame_{date}.db of this faction (research diff)
     """
     _load_gs         = helpers['load_gs']
     _player_faction  = helpers['player_faction']
     _faction_name_map = helpers['faction_name_map']
     _nation_map      = helpers['nation_map']
     _hab_body_map    = helpers['hab_body_map']
+    _space_bodies    = helpers['space_bodies']
 
     player_faction_key, pf = _player_faction(raw_db)
     faction_names          = _faction_name_map(raw_db)
     nation_map_data        = _nation_map(raw_db)
     player_faction_display = faction_names.get(player_faction_key, faction_slug)
 
-    conn = sqlite3.connect(output_db)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
+    conn = connect(output_db, 'readwrite')
 
     try:
         init_savegame_db(conn)
+        # ATTACH must happen before the first write opens a transaction
+        _attach_templates(conn, templates_dir)
+        if previous_db is not None and previous_db.exists():
+            from src.db.connection import attach
+            attach(conn, previous_db, 'prev')
+        else:
+            previous_db = None
         _clear_snapshot(conn)
 
         _insert_meta(conn, faction_slug, faction_key=player_faction_key,
                      faction_display=player_faction_display, iso_date=iso_date)
-        _populate_earth(conn, raw_db, _load_gs, _player_faction,
-                        _faction_name_map, _nation_map,
-                        player_faction_key, faction_names, nation_map_data, pf)
-        _populate_intel(conn, raw_db, _load_gs, _player_faction,
-                        _faction_name_map, _nation_map,
-                        player_faction_key, faction_names, nation_map_data, pf)
-        _populate_research(conn, raw_db, _load_gs)
-        _populate_space(conn, raw_db, _load_gs, _player_faction,
-                        _faction_name_map, _hab_body_map,
-                        player_faction_key, faction_names,
-                        game_date=game_date, templates_file=templates_file,
-                        templates_dir=templates_dir)
+        with span('earth'):
+            _populate_earth(conn, raw_db, _load_gs, _player_faction,
+                            _faction_name_map, _nation_map,
+                            player_faction_key, faction_names, nation_map_data, pf)
+        with span('intel'):
+            _populate_intel(conn, raw_db, _load_gs, _player_faction,
+                            _faction_name_map, _nation_map,
+                            player_faction_key, faction_names, nation_map_data, pf)
+        with span('research'):
+            _populate_research(conn, raw_db, _load_gs)
+            _populate_research_targets(conn)
+            _populate_research_bits(conn, has_previous=previous_db is not None)
+        with span('space'):
+            _populate_space(conn, raw_db, _load_gs, _player_faction,
+                            _faction_name_map, _hab_body_map, _space_bodies,
+                            player_faction_key, faction_names,
+                            game_date=game_date, templates_file=templates_file,
+                            templates_dir=templates_dir)
+            _populate_mining_sites(conn)
+        if game_date:
+            with span('transfers'):
+                _populate_transfers(conn, game_date, _space_bodies(raw_db), templates_dir)
         conn.commit()
+        note(rows=conn.total_changes)
         logging.info(f"savegame.db populated: {output_db}")
 
     except Exception:
@@ -91,17 +123,53 @@ def populate_savegame_db(
 # Helpers
 # ---------------------------------------------------------------------------
 
+def require_templates(templates_db: Path) -> None:
+    """
+    Raise FileNotFoundError unless templates_db holds the REQUIRED_TEMPLATES
+    tables with their columns (the user should run tias load).
+    """
+    import json
+    if not templates_db.exists():
+        raise FileNotFoundError(f"Templates DB not found: {templates_db} (run: tias load)")
+    conn = connect(templates_db, 'readonly')
+    try:
+        rows = conn.execute("SELECT template, columns FROM template_tables").fetchall()
+    except sqlite3.OperationalError:
+        rows = []          # templates DB predates the generic import
+    finally:
+        conn.close()
+    columns = {template: {name for name, _ in json.loads(cols)} for template, cols in rows}
+    missing = [f"{template}({', '.join(c for c in needed if c not in columns.get(template, ()))})"
+               for template, needed in REQUIRED_TEMPLATES.items()
+               if not set(needed) <= columns.get(template, set())]
+    if missing:
+        raise FileNotFoundError(f"{templates_db} lacks template tables {', '.join(missing)} (run: tias load)")
+
+
+def _attach_templates(conn: sqlite3.Connection, templates_dir: Path | None) -> None:
+    """ATTACH build/game_templates.db read-only as 'tpl', once require_templates passes."""
+    if templates_dir is None:
+        raise FileNotFoundError("No build/templates/ given: stage needs game_templates.db (run: tias load)")
+    templates_db = templates_dir.parent / 'game_templates.db'
+    require_templates(templates_db)
+    from src.db.connection import attach
+    attach(conn, templates_db, 'tpl')
+
+
 def _clear_snapshot(conn: sqlite3.Connection) -> None:
-    """Wipe all snapshot tables for a fresh insert."""
+    """Wipe all snapshot tables for a fresh insert (children before parents: FKs are on)."""
     tables = [
-        "gs_global", "gs_nations", "gs_control_points", "gs_public_opinion",
+        "gs_control_points", "gs_public_opinion", "gs_global", "gs_nations",
         "gs_federations", "gs_faction_resources",
         "gs_councilors_enemy", "gs_councilors_player", "gs_faction_intel",
-        "gs_research_completed",
-        "gs_space_bodies", "gs_hab_modules", "gs_habs", "gs_fleets",
+        "gs_research_targets", "gs_research_bits", "gs_research_gained",
+        "gs_research_completed", "gs_projects_completed",
+        "gs_launch_windows", "gs_transfers", "gs_mining_sites", "gs_body_index",
+        "gs_hab_modules", "gs_habs", "gs_fleets", "gs_space_bodies",
     ]
     for t in tables:
         conn.execute(f"DELETE FROM {t}")
+    conn.execute("DELETE FROM meta WHERE key = 'research_baseline_date'")
 
 
 def _insert_meta(conn, faction_slug, faction_key, faction_display, iso_date):
@@ -393,6 +461,75 @@ def _populate_research(conn, raw_db, _load_gs):
         conn.execute(
             "INSERT OR IGNORE INTO gs_research_completed(tech_name) VALUES (?)", (tech,)
         )
+    for project in grs.get('finishedOneTimeOnlyProjectNames', []):
+        conn.execute(
+            "INSERT OR IGNORE INTO gs_projects_completed(project_name) VALUES (?)", (project,)
+        )
+
+
+def _populate_research_targets(conn):
+    """
+    Research frontier from the tech DAG in game_templates.db (tpl.tech_closure).
+
+    For every tech/project not yet completed: how many transitive prerequisites
+    it has, how many of those are still outstanding, and whether all direct
+    prerequisites (closure depth 1) are done, i.e. it can be researched now.
+    One set-based pass: closure LEFT JOIN the completed set, grouped per target.
+    """
+    has_tree = conn.execute(
+        "SELECT 1 FROM tpl.sqlite_master WHERE type = 'table' AND name = 'tech_closure'"
+    ).fetchone()
+    if not has_tree:
+        logging.info("game_templates.db has no tech tree, skipping research frontier (run: tias load)")
+        return
+    conn.execute("""
+        WITH done(name) AS (
+            SELECT tech_name FROM gs_research_completed
+            UNION
+            SELECT project_name FROM gs_projects_completed
+        )
+        INSERT INTO gs_research_targets
+            (name, kind, display_name, category, level,
+             total_prereqs, remaining_prereqs, available)
+        SELECT n.name, n.kind, n.display_name, n.category, n.level,
+               COUNT(c.ancestor),
+               COUNT(c.ancestor) - COUNT(d.name),
+               COALESCE(SUM(c.depth = 1 AND d.name IS NULL), 0) = 0
+        FROM tpl.tech_nodes n
+        LEFT JOIN tpl.tech_closure c ON c.name = n.name
+        LEFT JOIN done d ON d.name = c.ancestor
+        WHERE n.name NOT IN (SELECT name FROM done)
+        GROUP BY n.name
+    """)
+
+
+def _populate_research_bits(conn, has_previous: bool):
+    """
+    Store the completed sets as bitsets (gs_research_bits) and, when the
+    previous snapshot is attached as 'prev', what was gained since it
+    (kinds the previous snapshot has no record of are not diffed).
+    """
+    from src.db.research_bits import load_index, names_of, snapshot_bits, store_bits
+    names = load_index(conn)
+    if not names:
+        return
+    current = store_bits(conn, names)
+    if not has_previous:
+        return
+
+    previous = snapshot_bits(conn, names, schema='prev')
+    for kind, bits in current.items():
+        if kind not in previous:
+            continue
+        conn.executemany(
+            "INSERT OR IGNORE INTO gs_research_gained(name, kind) VALUES (?, ?)",
+            ((name, kind) for name in names_of(bits & ~previous[kind], names))
+        )
+    row = conn.execute("SELECT value FROM prev.meta WHERE key = 'iso_date'").fetchone()
+    if row:
+        conn.execute(
+            "INSERT OR REPLACE INTO meta(key, value) VALUES ('research_baseline_date', ?)", (row[0],)
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -410,23 +547,14 @@ def _populate_hab_modules(
 
     Requires gs_habs to already be populated (FK constraint).
     Modules with empty templateName are skipped (vacant/placeholder slots).
+    Modules without a displayName fall back to the localized template name
+    from build/localization.db.
+
+    Template stats (tier, crew, power) are joined in SQL against the attached
+    tpl_TIHabModuleTemplate table.
     """
-    # --- Load template data: {dataName: {tier, crew, power}} ---
-    module_template: dict[str, dict] = {}
-    if templates_dir is not None:
-        tmpl_path = templates_dir / 'TIHabModuleTemplate.json'
-        if tmpl_path.exists():
-            import json
-            with open(tmpl_path, encoding='utf-8') as f:
-                tmpl_list = json.load(f)
-            for t in tmpl_list:
-                dn = t.get('dataName', '')
-                if dn:
-                    module_template[dn] = {
-                        'tier':  t.get('tier', 0),
-                        'crew':  t.get('crew', 0),
-                        'power': t.get('power', 0),  # negative = consuming
-                    }
+    from src.db.localization import display_name
+    loc_db = templates_dir.parent / 'localization.db' if templates_dir is not None else None
 
     # --- Build sector_key → hab_key map from TISectorState ---
     sectors = _load_gs(raw_db, 'PavonisInteractive.TerraInvicta.TISectorState')
@@ -454,8 +582,6 @@ def _populate_hab_modules(
             logging.debug(f"gs_hab_modules: module {mk} ({tmpl_name}) has no resolvable hab — skipped")
             continue
 
-        tmpl = module_template.get(tmpl_name, {})
-
         # completionDate: ISO string, present for both completed and in-progress modules
         raw_date = v.get('completionDate', '')
         # Trim sub-second precision to plain ISO date string (YYYY-MM-DD)
@@ -466,17 +592,15 @@ def _populate_hab_modules(
         try:
             conn.execute(
                 "INSERT OR REPLACE INTO gs_hab_modules "
-                "(module_key, hab_key, module_name, display_name, tier, crew, power, "
+                "(module_key, hab_key, module_name, display_name, "
                 "construction_completed, completion_date, powered, destroyed) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
                 (
                     mk,
                     hab_key,
                     tmpl_name,
-                    v.get('displayName'),
-                    tmpl.get('tier'),
-                    tmpl.get('crew'),
-                    tmpl.get('power'),
+                    v.get('displayName') or (display_name(loc_db, 'TIHabModuleTemplate', tmpl_name)
+                                             if loc_db else None),
                     1 if v.get('constructionCompleted', True) else 0,
                     completion_date,
                     1 if v.get('powered', True) else 0,
@@ -487,11 +611,19 @@ def _populate_hab_modules(
         except sqlite3.IntegrityError as e:
             logging.debug(f"gs_hab_modules: skipped module {mk} ({tmpl_name}): {e}")
 
+    # power: negative = consuming
+    conn.execute(
+        "UPDATE gs_hab_modules "
+        "SET tier = COALESCE(t.tier, 0), crew = COALESCE(t.crew, 0), power = COALESCE(t.power, 0) "
+        "FROM tpl.tpl_TIHabModuleTemplate AS t "
+        "WHERE t.dataName = gs_hab_modules.module_name"
+    )
+
     logging.info(f"gs_hab_modules: inserted {inserted} modules")
 
 
 def _populate_space(conn, raw_db, _load_gs, _player_faction,
-                    _faction_name_map, _hab_body_map,
+                    _faction_name_map, _hab_body_map, _space_bodies,
                     player_faction_key, faction_names,
                     game_date=None, templates_file=None, templates_dir=None):
 
@@ -501,22 +633,19 @@ def _populate_space(conn, raw_db, _load_gs, _player_faction,
     body_name = {b['Key']['value']: b['Value'].get('displayName', '?') for b in bodies}
 
     # --- Launch windows (keyed by destination name for merge into gs_space_bodies) ---
+    # Read from the calendar built by tias load; computed live if it is missing
+    # or game_date falls outside it.
     windows: dict[str, dict] = {}
-    if game_date and templates_file:
+    if game_date:
+        from src.db.launch_calendar import CALENDAR_NAME, lookup_windows
+        windows = lookup_windows(conn, game_date, templates_dir.parent / CALENDAR_NAME, schema='tpl')
+        if windows:
+            _populate_launch_windows(conn, game_date)
+    if not windows and game_date and templates_file:
         from src.preset.launch_windows import calculate_launch_windows
         windows = calculate_launch_windows(game_date, templates_file)
-
-    # --- Build objectType map from template file ---
-    object_type_map: dict[str, str] = {}  # templateName → objectType
-    if templates_file and templates_file.exists():
-        import json
-        with open(templates_file, encoding='utf-8') as f:
-            tmpl_data = json.load(f)
-        for t in tmpl_data:
-            dn = t.get('dataName') or t.get('friendlyName', '')
-            ot = t.get('objectType', '')
-            if dn and ot:
-                object_type_map[dn] = ot
+        # Keyed by template dataName; older callers matched on display name
+        windows.update({w['display']: w for w in list(windows.values())})
 
     # --- Space bodies (must be inserted before fleets due to FK) ---
     for b in bodies:
@@ -526,24 +655,35 @@ def _populate_space(conn, raw_db, _load_gs, _player_faction,
         bk         = b['Key']['value']
         name       = v.get('displayName', '?')
         tmpl       = v.get('templateName', '')
-        obj_type   = object_type_map.get(tmpl, '')
         barycenter = (v.get('barycenter') or {}).get('value')
         max_tier   = v.get('maxHabTier', 0)
         has_sites  = 1 if v.get('habSites') else 0
-        win        = windows.get(name, {})
+        win        = windows.get(tmpl) or windows.get(name, {})
         conn.execute(
             "INSERT OR REPLACE INTO gs_space_bodies "
             "(body_key, name, object_type, barycenter_key, max_hab_tier, has_hab_sites, "
             "next_window_date, days_away, penalty_pct) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            "VALUES (?, ?, COALESCE((SELECT objectType FROM tpl.tpl_TISpaceBodyTemplate "
+            "WHERE dataName = ? LIMIT 1), ''), ?, ?, ?, ?, ?, ?)",
             (
-                bk, name, obj_type, barycenter, max_tier, has_sites,
+                bk, name, tmpl, barycenter, max_tier, has_sites,
                 win.get('next_window'),
                 win.get('days_away'),
                 win.get('current_penalty'),
             )
         )
 
+    # --- Body hierarchy: ancestor paths, zones, Euler-tour intervals ---
+    from src.db.body_index import build_body_index
+    index = build_body_index(bodies, _space_bodies(raw_db).axes)
+    conn.executemany(
+        "INSERT INTO gs_body_index "
+        "(body_key, name, parent_key, depth, path, helio_key, zone, tin, tout) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((n.key, n.name, n.parent, n.depth, '/' + ''.join(f'{k}/' for k in n.path),
+          n.helio_key, n.zone, n.tin, n.tout) for n in index.nodes.values())
+    )
+
     # --- Build orbit/site lookup maps for hab body resolution ---
     orbits = _load_gs(raw_db, 'PavonisInteractive.TerraInvicta.TIOrbitState')
     orbit_body: dict[int, int | None] = {}
@@ -616,3 +756,65 @@ def _populate_space(conn, raw_db, _load_gs, _player_faction,
                 1 if fk == player_faction_key else 0,
             )
         )
+
+
+def _populate_launch_windows(conn, game_date):
+    """Next UPCOMING windows per body from tpl.launch_windows (one indexed range scan per body)."""
+    from src.db.launch_calendar import UPCOMING
+    from src.preset.launch_windows import REFERENCE
+    today = (game_date - REFERENCE).days
+    conn.execute("""
+        INSERT INTO gs_launch_windows (body, display_name, seq, window_date, days_away)
+        SELECT body, display, seq, window_date, day - ?
+        FROM (
+            SELECT w.body, b.display, w.day, w.window_date,
+                   ROW_NUMBER() OVER (PARTITION BY w.body ORDER BY w.day) AS seq
+            FROM tpl.launch_windows w
+            JOIN tpl.launch_bodies b ON b.body = w.body
+            WHERE w.day >= ?
+        )
+        WHERE seq <= ?
+    """, (today, today, UPCOMING))
+
+
+def _populate_transfers(conn, game_date, space_bodies, templates_dir=None):
+    """Minimum-Δv Earth departures per hab-site body; grids cached under build/transfer_cache/."""
+    from datetime import timedelta
+    from src.preset.launch_windows import REFERENCE
+    from src.preset.transfers import CACHE_DIR_NAME, transfer_windows
+    cache_dir = templates_dir.parent / CACHE_DIR_NAME if templates_dir is not None else None
+
+    def date(day: float) -> str:
+        return (REFERENCE + timedelta(days=round(day))).strftime('%Y-%m-%d')
+
+    rows = [
+        (body, t['display'], seq, date(dep), date(dep + tof), round(tof), round(dv, 2))
+        for body, t in transfer_windows(game_date, space_bodies.bodies, space_bodies.targets, cache_dir).items()
+        for seq, (dep, tof, dv) in enumerate(t['windows'], 1)
+    ]
+    conn.executemany("""
+        INSERT INTO gs_transfers
+            (body, display_name, seq, departure_date, arrival_date, tof_days, dv_kms)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    logging.info(f"gs_transfers: {len(rows)} windows")
+
+
+def _populate_mining_sites(conn):
+    """Copy the best-valued hab sites from tpl.site_values (built by tias load)."""
+    has_values = conn.execute(
+        "SELECT 1 FROM tpl.sqlite_master WHERE type = 'table' AND name = 'site_values'"
+    ).fetchone()
+    if not has_values:
+        return
+    conn.execute("""
+        INSERT INTO gs_mining_sites
+        SELECT v.dataName, v.displayName, COALESCE(b.displayName, v.body),
+               v.water, v.metals, v.nobles, v.fissiles,
+               v.value, v.value_p10, v.value_p90, v.body_rank
+        FROM tpl.site_values v
+        LEFT JOIN tpl.space_bodies b ON b.dataName = v.body
+        WHERE v.body_rank <= ? AND v.value > 0
+        ORDER BY v.value DESC
+        LIMIT ?
+    """, (MINING_SITES_PER_BODY, MINING_SITES))
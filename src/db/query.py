@@ -6,16 +6,13 @@ but sourced from SQL queries against the normalized savegame.db schema.
 
 Public API:
     build_codex_report(savegame_db: Path) -> str
+    render_codex_sections(savegame_db: Path) -> list[tuple[str, str]]
+    render_codex_domains(savegame_db: Path) -> dict[str, str]
 """
 
-import sqlite3
 from pathlib import Path
 
-
-def _conn(db: Path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db)
-    conn.row_factory = sqlite3.Row
-    return conn
+from src.db.connection import pooled
 
 
 # ---------------------------------------------------------------------------
@@ -231,6 +228,73 @@ def _section_research(conn) -> list[str]:
     return lines
 
 
+def _section_projects(conn) -> list[str]:
+    rows = conn.execute(
+        "SELECT project_name FROM gs_projects_completed ORDER BY project_name"
+    ).fetchall()
+    if not rows:
+        return []
+    lines = [f"## Completed One-Time Projects ({len(rows)})"]
+    for r in rows:
+        lines.append(f"  {r['project_name']}")
+    lines.append("")
+    return lines
+
+
+def _section_research_gained(conn) -> list[str]:
+    baseline = conn.execute(
+        "SELECT value FROM meta WHERE key = 'research_baseline_date'"
+    ).fetchone()
+    if not baseline:
+        return []
+    rows = conn.execute(
+        "SELECT name, kind FROM gs_research_gained ORDER BY kind DESC, name"
+    ).fetchall()
+    techs = sum(r['kind'] == 'tech' for r in rows)
+    lines = [f"## Research Gained Since {baseline['value']} "
+             f"(+{techs} techs, +{len(rows) - techs} projects)"]
+    for r in rows:
+        lines.append(f"  {r['name']:<40} {r['kind']}")
+    lines.append("")
+    return lines
+
+
+def _section_research_frontier(conn) -> list[str]:
+    rows = conn.execute("""
+        SELECT name, kind, display_name, category, level
+        FROM gs_research_targets
+        WHERE available = 1
+        ORDER BY kind DESC, level, name
+    """).fetchall()
+    if not rows:
+        return []
+    lines = [f"## Available Research ({len(rows)})"]
+    for r in rows:
+        label = r['display_name'] or r['name']
+        category = f"  {r['category']}" if r['category'] else ""
+        lines.append(f"  {label:<40} {r['kind']:<8} L{r['level']}{category}")
+    lines.append("")
+    return lines
+
+
+def _section_research_targets(conn, limit: int = 15) -> list[str]:
+    rows = conn.execute("""
+        SELECT name, kind, display_name, remaining_prereqs, total_prereqs
+        FROM gs_research_targets
+        WHERE available = 0
+        ORDER BY remaining_prereqs, level, name
+        LIMIT ?
+    """, (limit,)).fetchall()
+    if not rows:
+        return []
+    lines = ["## Nearest Locked Research (remaining / total prerequisites)"]
+    for r in rows:
+        label = r['display_name'] or r['name']
+        lines.append(f"  {label:<40} {r['kind']:<8} {r['remaining_prereqs']}/{r['total_prereqs']}")
+    lines.append("")
+    return lines
+
+
 # ---------------------------------------------------------------------------
 # Space domain
 # ---------------------------------------------------------------------------
@@ -241,7 +305,8 @@ def _section_habs(conn) -> list[str]:
                h.hab_key, h.name, h.hab_type, h.tier, h.faction_name, h.is_player
         FROM gs_habs h
         LEFT JOIN gs_space_bodies sb ON sb.body_key = h.parent_body_key
-        ORDER BY body, h.name
+        LEFT JOIN gs_body_index bi ON bi.body_key = h.parent_body_key
+        ORDER BY bi.tin IS NULL, bi.tin, body, h.name      -- system order: Earth, Luna, Mars, Phobos, ...
     """).fetchall()
     if not rows:
         return []
@@ -264,7 +329,7 @@ def _section_habs(conn) -> list[str]:
         by_body.setdefault(body, []).append(r)
 
     lines = ["## Habs & Stations"]
-    for body in sorted(by_body.keys()):
+    for body in by_body:
         lines.append(f"\n### {body}")
         lines.append(f"  {'Name':<30} {'Type':<10} {'Tier':<5} {'Mod':>4} {'Crew':>5} {'Pwr':>5}  Faction")
         lines.append("  " + "-" * 78)
@@ -334,20 +399,21 @@ def _section_hab_modules(conn) -> list[str]:
 
 def _section_fleets(conn) -> list[str]:
     rows = conn.execute("""
-        SELECT f.name, f.faction_name, f.location, f.is_player
+        SELECT f.name, f.faction_name, f.location, f.is_player, COALESCE(bi.zone, '-') AS zone
         FROM gs_fleets f
+        LEFT JOIN gs_body_index bi ON bi.body_key = f.body_key
         ORDER BY f.name
     """).fetchall()
     if not rows:
         return []
     lines = [
         "## Fleets",
-        f"  {'Name':<25} {'Faction':<20} Location",
-        "  " + "-" * 65,
+        f"  {'Name':<25} {'Faction':<20} {'Zone':<8} Location",
+        "  " + "-" * 74,
     ]
     for r in rows:
         mark = " *" if r['is_player'] else ""
-        lines.append(f"  {r['name']:<25} {r['faction_name']:<20} {r['location']}{mark}")
+        lines.append(f"  {r['name']:<25} {r['faction_name']:<20} {r['zone']:<8} {r['location']}{mark}")
     lines.append("")
     return lines
 
@@ -371,6 +437,139 @@ def _section_launch_windows(conn) -> list[str]:
     return lines
 
 
+def _section_launch_calendar(conn) -> list[str]:
+    rows = conn.execute("""
+        SELECT body, display_name, group_concat(window_date || ' (' || days_away || 'd)', ', ') AS upcoming
+        FROM (SELECT * FROM gs_launch_windows ORDER BY body, seq)
+        GROUP BY body
+        ORDER BY MIN(days_away), body
+    """).fetchall()
+    if not rows:
+        return []
+    lines = ["## Upcoming Launch Windows"]
+    for r in rows:
+        lines.append(f"  {r['display_name'] or r['body']}: {r['upcoming']}")
+    lines.append("")
+    return lines
+
+
+def _section_transfers(conn) -> list[str]:
+    rows = conn.execute("""
+        SELECT body, display_name, seq, departure_date, arrival_date, tof_days, dv_kms
+        FROM gs_transfers
+        ORDER BY body, seq
+    """).fetchall()
+    if not rows:
+        return []
+    lines = ["## Cheapest Transfers from Earth (Δv = departure + arrival excess)"]
+    for r in rows:
+        label = (r['display_name'] or r['body']) if r['seq'] == 1 else ""
+        lines.append(
+            f"  {label:<20} depart {r['departure_date']}, arrive {r['arrival_date']} "
+            f"({r['tof_days']}d): {r['dv_kms']:.2f} km/s"
+        )
+    lines.append("")
+    return lines
+
+
+def _section_mining_sites(conn) -> list[str]:
+    rows = conn.execute("""
+        SELECT display_name, site, body, water, metals, nobles, fissiles,
+               value, value_p10, value_p90, body_rank
+        FROM gs_mining_sites
+        ORDER BY value DESC
+    """).fetchall()
+    if not rows:
+        return []
+    lines = ["## Best Mining Sites (expected water/metals/nobles/fissiles; value p10–p90)"]
+    for r in rows:
+        label = f"{r['body']} #{r['body_rank']} ({r['display_name'] or r['site']})"
+        lines.append(
+            f"  {label:<40} {r['water']:.1f}/{r['metals']:.1f}/{r['nobles']:.2f}/{r['fissiles']:.2f}"
+            f"  value {r['value']:.2f} ({r['value_p10']:.2f}–{r['value_p90']:.2f})"
+        )
+    lines.append("")
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# Report layout
+# ---------------------------------------------------------------------------
+
+# (domain, heading, [(section name, builder), ...]) in report order.
+CODEX_LAYOUT = [
+    ("earth", "# EARTH & POLITICAL STATE", [
+        ("global",             _section_global),
+        ("nations",            _section_nations),
+        ("public_opinion",     _section_public_opinion),
+        ("federations",        _section_federations),
+        ("faction_resources",  _section_faction_resources),
+    ]),
+    ("intel", "# INTELLIGENCE STATE", [
+        ("enemy_councilors",   _section_enemy_councilors),
+        ("player_councilors",  _section_player_councilors),
+        ("faction_intel",      _section_faction_intel),
+    ]),
+    ("research", "# RESEARCH STATE", [
+        ("completed_techs",    _section_research),
+        ("completed_projects", _section_projects),
+        ("research_gained",    _section_research_gained),
+        ("research_frontier",  _section_research_frontier),
+        ("research_targets",   _section_research_targets),
+    ]),
+    ("space", "# SPACE STATE", [
+        ("habs",               _section_habs),
+        ("hab_modules",        _section_hab_modules),
+        ("fleets",             _section_fleets),
+        ("launch_windows",     _section_launch_windows),
+        ("launch_calendar",    _section_launch_calendar),
+        ("transfers",          _section_transfers),
+        ("mining_sites",       _section_mining_sites),
+    ]),
+]
+
+_DOMAINS = {domain for domain, _, _ in CODEX_LAYOUT}
+
+
+def _render_sections(conn) -> list[tuple[str, str]]:
+    rendered = []
+    for domain, heading, sections in CODEX_LAYOUT:
+        rendered.append((domain, heading + "\n"))
+        for name, builder in sections:
+            lines = builder(conn)
+            if lines:
+                rendered.append((name, "\n".join(lines)))
+    return rendered
+
+
+def render_codex_sections(savegame_db: Path) -> list[tuple[str, str]]:
+    """
+    Render every CODEX section from savegame.db.
+
+    Returns [(section_name, text), ...] in report order. Domain headings are
+    emitted as their own entries named after the domain ('earth', 'intel', ...);
+    empty sections are omitted. Joining the texts with newlines yields the full report.
+
+    Reads through the pooled read-only 'snapshot' profile: savegame.db is
+    finalized by stage and never written by readers.
+    """
+    return _render_sections(pooled(savegame_db, 'snapshot'))
+
+
+def render_codex_domains(savegame_db: Path) -> dict[str, str]:
+    """
+    Render the report split by domain: {'earth': text, 'intel': text, ...}.
+    Each text starts with its domain heading. Used by preset for gamestate_{domain}.txt.
+    """
+    domains: dict[str, list[str]] = {}
+    current = None
+    for name, text in render_codex_sections(savegame_db):
+        if name in _DOMAINS:
+            current = domains.setdefault(name, [])
+        current.append(text)
+    return {d: "\n".join(parts).strip() for d, parts in domains.items()}
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -380,27 +579,5 @@ def build_codex_report(savegame_db: Path) -> str:
     Build the full CODEX gamestate report from savegame.db.
     Returns a multi-section text string, same format as old gamestate_*.txt files.
     """
-    conn = _conn(savegame_db)
-    try:
-        sections = [
-            "# EARTH & POLITICAL STATE", "",
-            *_section_global(conn),
-            *_section_nations(conn),
-            *_section_public_opinion(conn),
-            *_section_federations(conn),
-            *_section_faction_resources(conn),
-            "# INTELLIGENCE STATE", "",
-            *_section_enemy_councilors(conn),
-            *_section_player_councilors(conn),
-            *_section_faction_intel(conn),
-            "# RESEARCH STATE", "",
-            *_section_research(conn),
-            "# SPACE STATE", "",
-            *_section_habs(conn),
-            *_section_hab_modules(conn),
-            *_section_fleets(conn),
-            *_section_launch_windows(conn),
-        ]
-        return "\n".join(sections).strip()
-    finally:
-        conn.close()
+    sections = render_codex_sections(savegame_db)
+    return "\n".join(text for _, text in sections).strip()
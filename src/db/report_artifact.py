@@ -0,0 +1,104 @@
+"""
+report_artifact.py — Precomputed CODEX report sections, written at stage time.
+
+stage renders every CODEX section once (offline) and stores the text plus
+line/token counts in campaigns/{faction}/report_{date}.json, next to
+savegame_{date}.db. prompt_assemble then concatenates the stored sections
+without touching SQLite, so the first CODEX turn of a play session costs a
+single small file read.
+
+The artifact records the size and mtime of the savegame_{date}.db it was
+rendered from; if that DB has changed since (re-staged without the report,
+or edited), the artifact is ignored and callers render from the DB instead.
+ARTIFACT_VERSION is bumped whenever section output changes.
+
+Usage:
+    from src.db.report_artifact import write_report_artifact, load_report_text
+    write_report_artifact(savegame_db, artifact_path(campaign_dir, iso_date))
+    text = load_report_text(artifact_path(campaign_dir, iso_date))
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+ARTIFACT_VERSION = 2    # 2: source size/mtime recorded; transfer and body-zone sections
+
+# Rough chars-per-token ratio for the Mistral/Qwen tokenizers on this kind of
+# tabular English text. Only used for budgeting, never for truncation.
+CHARS_PER_TOKEN = 4
+
+
+def artifact_path(campaign_dir: Path, iso_date: str) -> Path:
+    """Return the report artifact path for a given campaign directory and date."""
+    return campaign_dir / f"report_{iso_date}.json"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (ceil of chars / CHARS_PER_TOKEN)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def write_report_artifact(savegame_db: Path, out: Path) -> dict:
+    """
+    Render all CODEX sections from savegame.db and write the artifact file.
+    Returns the artifact dict.
+    """
+    from src.db.query import render_codex_sections
+
+    sections = [
+        {
+            'name':   name,
+            'text':   text,
+            'lines':  text.count("\n") + 1,
+            'tokens': estimate_tokens(text),
+        }
+        for name, text in render_codex_sections(savegame_db)
+    ]
+    st = savegame_db.stat()
+    artifact = {
+        'version':         ARTIFACT_VERSION,
+        'source':          savegame_db.name,
+        'source_size':     st.st_size,
+        'source_mtime_ns': st.st_mtime_ns,
+        'generated_at':    datetime.now(timezone.utc).isoformat(),
+        'total_lines':     sum(s['lines'] for s in sections),
+        'total_tokens':    sum(s['tokens'] for s in sections),
+        'sections':        sections,
+    }
+    out.write_text(json.dumps(artifact, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+    logging.info(f"  -> {out.name} ({len(sections)} sections, ~{artifact['total_tokens']} tokens)")
+    return artifact
+
+
+def load_report_artifact(path: Path) -> dict | None:
+    """
+    Load a report artifact. Returns None if missing, from an older format, or
+    stale (its source DB next to it no longer matches the recorded size/mtime).
+    """
+    if not path.exists():
+        return None
+    try:
+        artifact = json.loads(path.read_text(encoding='utf-8'))
+    except json.JSONDecodeError:
+        logging.warning(f"Corrupt report artifact ignored: {path.name}")
+        return None
+    if artifact.get('version') != ARTIFACT_VERSION:
+        logging.debug(f"Report artifact {path.name} has version {artifact.get('version')} — ignored")
+        return None
+    source = path.parent / artifact.get('source', '')
+    if source.is_file():
+        st = source.stat()
+        if (st.st_size, st.st_mtime_ns) != (artifact.get('source_size'), artifact.get('source_mtime_ns')):
+            logging.info(f"Report artifact {path.name} does not match {source.name} — ignored")
+            return None
+    return artifact
+
+
+def load_report_text(path: Path) -> str | None:
+    """Concatenate all stored sections into the full CODEX report text."""
+    artifact = load_report_artifact(path)
+    if artifact is None:
+        return None
+    return "\n".join(s['text'] for s in artifact['sections']).strip()
@@ -0,0 +1,110 @@
+"""
+research_bits.py — Completed techs/projects as bitsets over the stable tech index.
+
+Each snapshot stores one row per kind in gs_research_bits:
+
+    kind ('tech' | 'project') | bits BLOB (little-endian) | width | index_digest | count
+
+Bit i is tech_index name i (game_templates.db, mirrored from the append-only
+build/tech_index.json). index_digest fingerprints the first `width` index
+names; if the index was regenerated since the snapshot was written, the bits
+are re-encoded from the snapshot's gs_research_completed / gs_projects_completed
+rows instead of being trusted.
+
+Set operations are plain int operations:
+    gained = newer & ~older      lost = older & ~newer      count = bits.bit_count()
+
+Usage:
+    from src.db.research_bits import load_index, snapshot_bits, names_of
+    names = load_index(conn)                      # needs tpl attached
+    bits = snapshot_bits(conn, names)             # {'tech': int, 'project': int}
+    names_of(bits['tech'] & ~older['tech'], names)
+"""
+
+import hashlib
+import sqlite3
+
+KINDS = {
+    'tech':    "SELECT tech_name FROM {schema}.gs_research_completed",
+    'project': "SELECT project_name FROM {schema}.gs_projects_completed",
+}
+
+
+def load_index(conn: sqlite3.Connection, schema: str = 'tpl') -> list[str]:
+    """Index names ordered by bit, or [] if the templates DB has no tech_index."""
+    try:
+        return [r[0] for r in conn.execute(f"SELECT name FROM {schema}.tech_index ORDER BY bit")]
+    except sqlite3.OperationalError:
+        return []
+
+
+def index_digest(names: list[str]) -> str:
+    return hashlib.sha256('\n'.join(names).encode('utf-8')).hexdigest()[:16]
+
+
+def encode(completed, names: list[str]) -> int:
+    """Bitset of the completed names that are in the index (others are ignored)."""
+    bit_of = {name: i for i, name in enumerate(names)}
+    bits = 0
+    for name in completed:
+        i = bit_of.get(name)
+        if i is not None:
+            bits |= 1 << i
+    return bits
+
+
+def names_of(bits: int, names: list[str]) -> list[str]:
+    """Index names for the set bits, in bit order."""
+    out = []
+    while bits:
+        low = bits & -bits
+        out.append(names[low.bit_length() - 1])
+        bits ^= low
+    return out
+
+
+def to_blob(bits: int, width: int) -> bytes:
+    return bits.to_bytes((width + 7) // 8, 'little')
+
+
+def store_bits(conn: sqlite3.Connection, names: list[str]) -> dict[str, int]:
+    """Encode this snapshot's completed sets into gs_research_bits. Returns {kind: bits}."""
+    width, digest = len(names), index_digest(names)
+    result = {}
+    for kind, sql in KINDS.items():
+        bits = encode((r[0] for r in conn.execute(sql.format(schema='main'))), names)
+        conn.execute(
+            "INSERT OR REPLACE INTO gs_research_bits VALUES (?, ?, ?, ?, ?)",
+            (kind, to_blob(bits, width), width, digest, bits.bit_count())
+        )
+        result[kind] = bits
+    return result
+
+
+def snapshot_bits(conn: sqlite3.Connection, names: list[str], schema: str = 'main') -> dict[str, int]:
+    """
+    {kind: bits} for the snapshot in schema, in terms of the current index.
+    Stored blobs are used when their index prefix still matches; otherwise
+    (older snapshot, regenerated index) the text rows are re-encoded. Kinds
+    whose table the snapshot predates are left out rather than read as empty.
+    """
+    stored = {}
+    try:
+        for kind, blob, width, digest in conn.execute(
+            f"SELECT kind, bits, width, index_digest FROM {schema}.gs_research_bits"
+        ):
+            if width <= len(names) and digest == index_digest(names[:width]):
+                stored[kind] = int.from_bytes(blob, 'little')
+    except sqlite3.OperationalError:
+        pass  # snapshot predates gs_research_bits
+
+    result = {}
+    for kind, sql in KINDS.items():
+        if kind in stored:
+            result[kind] = stored[kind]
+            continue
+        try:
+            result[kind] = encode((r[0] for r in conn.execute(sql.format(schema=schema))), names)
+        except sqlite3.OperationalError:
+            pass  # snapshot predates this kind's table
+    return result
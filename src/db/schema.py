@@ -21,7 +21,8 @@ CREATE TABLE IF NOT EXISTS meta (
     key     TEXT PRIMARY KEY,
     value   TEXT NOT NULL
 );
--- keys: schema_version, iso_date, faction_slug, faction_display, faction_key, generated_at
+-- keys: schema_version, iso_date, faction_slug, faction_display, faction_key, generated_at,
+--       research_baseline_date (when a previous snapshot was staged)
 
 -- ---------------------------------------------------------------------------
 -- V1: EARTH DOMAIN
@@ -125,6 +126,40 @@ CREATE TABLE IF NOT EXISTS gs_research_completed (
     tech_name           TEXT PRIMARY KEY
 );
 
+CREATE TABLE IF NOT EXISTS gs_projects_completed (
+    project_name        TEXT PRIMARY KEY   -- one-time-only projects
+);
+
+-- Derived at stage from game_templates.db tech_nodes/tech_closure:
+-- every not-yet-completed tech/project with its outstanding prerequisites.
+CREATE TABLE IF NOT EXISTS gs_research_targets (
+    name                TEXT PRIMARY KEY,
+    kind                TEXT NOT NULL,      -- 'tech' | 'project'
+    display_name        TEXT,
+    category            TEXT,
+    level               INTEGER,            -- topological level in the tech tree
+    total_prereqs       INTEGER NOT NULL,   -- transitive prerequisites
+    remaining_prereqs   INTEGER NOT NULL,   -- transitive prerequisites not completed
+    available           INTEGER NOT NULL    -- 1 = all direct prerequisites completed
+);
+CREATE INDEX IF NOT EXISTS idx_gs_research_targets_available
+    ON gs_research_targets(available, remaining_prereqs);
+
+-- Completed sets as bitsets over game_templates.db tech_index (see research_bits.py)
+CREATE TABLE IF NOT EXISTS gs_research_bits (
+    kind                TEXT PRIMARY KEY,   -- 'tech' | 'project'
+    bits                BLOB NOT NULL,      -- little-endian, bit i = tech_index name i
+    width               INTEGER NOT NULL,   -- index length when encoded
+    index_digest        TEXT NOT NULL,      -- fingerprint of the first `width` index names
+    count               INTEGER NOT NULL
+);
+
+-- Completed since the previous staged snapshot (meta research_baseline_date)
+CREATE TABLE IF NOT EXISTS gs_research_gained (
+    name                TEXT PRIMARY KEY,
+    kind                TEXT NOT NULL
+);
+
 -- ---------------------------------------------------------------------------
 -- V1: SPACE DOMAIN
 -- ---------------------------------------------------------------------------
@@ -174,6 +209,20 @@ CREATE TABLE IF NOT EXISTS gs_space_bodies (
 CREATE INDEX IF NOT EXISTS idx_bodies_barycenter ON gs_space_bodies(barycenter_key);
 CREATE INDEX IF NOT EXISTS idx_bodies_type ON gs_space_bodies(object_type);
 
+-- Body hierarchy (src/db/body_index.py): b is within a iff a.tin <= b.tin <= a.tout
+CREATE TABLE IF NOT EXISTS gs_body_index (
+    body_key            INTEGER PRIMARY KEY,
+    name                TEXT NOT NULL,
+    parent_key          INTEGER,        -- null for the root (Sol)
+    depth               INTEGER NOT NULL,
+    path                TEXT NOT NULL,  -- ancestor keys root → self, '/2/10/46/'
+    helio_key           INTEGER NOT NULL,  -- body directly orbiting the Sun
+    zone                TEXT NOT NULL,  -- sol, earth, inner, belt, jupiter, outer, unknown
+    tin                 INTEGER NOT NULL UNIQUE,
+    tout                INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_body_index_zone ON gs_body_index(zone);
+
 CREATE TABLE IF NOT EXISTS gs_fleets (
     fleet_key           INTEGER PRIMARY KEY,
     name                TEXT NOT NULL,
@@ -186,6 +235,45 @@ CREATE TABLE IF NOT EXISTS gs_fleets (
 );
 CREATE INDEX IF NOT EXISTS idx_fleets_body ON gs_fleets(body_key);
 
+-- Upcoming optimal windows per body, from game_templates.db launch_windows
+CREATE TABLE IF NOT EXISTS gs_launch_windows (
+    body                TEXT NOT NULL,      -- TISpaceBodyTemplate dataName
+    display_name        TEXT,
+    seq                 INTEGER NOT NULL,   -- 1 = next window
+    window_date         TEXT NOT NULL,
+    days_away           INTEGER NOT NULL,
+    PRIMARY KEY (body, seq)
+);
+
+-- Minimum-Δv Earth departures per body from the Lambert porkchop grid
+-- (src/preset/transfers.py), cheapest first
+CREATE TABLE IF NOT EXISTS gs_transfers (
+    body                TEXT NOT NULL,      -- TISpaceBodyTemplate dataName
+    display_name        TEXT,
+    seq                 INTEGER NOT NULL,   -- 1 = lowest Δv
+    departure_date      TEXT NOT NULL,
+    arrival_date        TEXT NOT NULL,
+    tof_days            INTEGER NOT NULL,
+    dv_kms              REAL NOT NULL,      -- departure + arrival excess speed
+    PRIMARY KEY (body, seq)
+);
+
+-- Best hab sites system-wide, copied from game_templates.db site_values
+-- (top MINING_SITES_PER_BODY per body, then best MINING_SITES overall)
+CREATE TABLE IF NOT EXISTS gs_mining_sites (
+    site                TEXT PRIMARY KEY,   -- TIHabSiteTemplate dataName
+    display_name        TEXT,
+    body                TEXT,               -- body display name
+    water               REAL,               -- expected yields
+    metals              REAL,
+    nobles              REAL,
+    fissiles            REAL,
+    value               REAL NOT NULL,      -- scarcity-weighted, 4.0 ≈ typical site
+    value_p10           REAL NOT NULL,
+    value_p90           REAL NOT NULL,
+    body_rank           INTEGER NOT NULL
+);
+
 """
 
 # ---------------------------------------------------------------------------
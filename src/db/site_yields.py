@@ -0,0 +1,140 @@
+"""
+site_yields.py — Vectorized mining site valuation in game_templates.db.
+
+Each hab site's resources are rolled by the game from its mining profile as
+max(min, Normal(mean, width)) per resource. This module loads every site and
+profile into arrays once and, in one NumPy pass over all sites:
+
+  - computes the expected yield per resource in closed form
+    (E[max(m, X)] = m·Φ(a) + μ·(1 − Φ(a)) + σ·φ(a), a = (m − μ) / σ)
+  - draws SAMPLES Monte Carlo rolls per site for p10 / p50 / p90 bands
+
+Resources are made comparable by scarcity: each is divided by its mean
+expected yield over all sites, and value is the sum of those ratios (1.0 per
+resource ≈ a typical site). The result is stored ranked and indexed:
+
+    site_values(dataName PK, displayName, body, miningProfile,
+                water, metals, nobles, fissiles,       -- expected yields
+                value, value_p10, value_p50, value_p90,
+                body_rank)                             -- 1 = best on its body
+
+The RNG is seeded, so rebuilding from unchanged templates gives the same values.
+
+Usage:
+    from src.db.site_yields import build_site_values
+    build_site_values(conn)          # after hab_sites / mining_profiles exist
+"""
+
+import logging
+import math
+import sqlite3
+
+import numpy as np
+
+RESOURCES = ('water', 'metals', 'nobles', 'fissiles')
+SAMPLES = 2000
+SEED = 20220926    # fixed: reproducible builds
+
+SCHEMA = """
+DROP TABLE IF EXISTS site_values;
+CREATE TABLE site_values (
+    dataName       TEXT PRIMARY KEY,
+    displayName    TEXT,
+    body           TEXT,
+    miningProfile  TEXT,
+    water          REAL,
+    metals         REAL,
+    nobles         REAL,
+    fissiles       REAL,
+    value          REAL NOT NULL,
+    value_p10      REAL NOT NULL,
+    value_p50      REAL NOT NULL,
+    value_p90      REAL NOT NULL,
+    body_rank      INTEGER NOT NULL
+);
+CREATE INDEX idx_site_values_body_rank ON site_values(body, body_rank);
+CREATE INDEX idx_site_values_value ON site_values(value DESC);
+"""
+
+
+def _erf(x: np.ndarray) -> np.ndarray:
+    """Abramowitz–Stegun 7.1.26 (|error| < 1.5e-7), array-wide without SciPy."""
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return sign * (1.0 - poly * np.exp(-x * x))
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + _erf(x / math.sqrt(2.0)))
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
+
+
+def expected_yield(mean: np.ndarray, width: np.ndarray, floor: np.ndarray) -> np.ndarray:
+    """E[max(floor, Normal(mean, width))], elementwise; width <= 0 means no spread."""
+    spread = width > 0
+    sigma = np.where(spread, width, 1.0)
+    a = (floor - mean) / sigma
+    clamped = floor * _norm_cdf(a) + mean * (1.0 - _norm_cdf(a)) + sigma * _norm_pdf(a)
+    return np.where(spread, clamped, np.maximum(floor, mean))
+
+
+def sample_yields(mean: np.ndarray, width: np.ndarray, floor: np.ndarray,
+                  samples: int, rng: np.random.Generator) -> np.ndarray:
+    """Monte Carlo rolls, shape (samples, *mean.shape)."""
+    draws = rng.standard_normal((samples, *mean.shape)) * np.maximum(width, 0.0) + mean
+    return np.maximum(draws, floor)
+
+
+def _load_arrays(conn: sqlite3.Connection):
+    rows = conn.execute(f"""
+        SELECT s.dataName, s.displayName, s.body, s.miningProfile,
+               {', '.join(f'COALESCE(p.{r}_mean, 0), COALESCE(p.{r}_width, 0), COALESCE(p.{r}_min, 0)'
+                          for r in RESOURCES)}
+        FROM hab_sites s
+        LEFT JOIN mining_profiles p ON p.dataName = s.miningProfile
+        WHERE s.dataName IS NOT NULL
+        ORDER BY s.dataName
+    """).fetchall()
+    meta = [r[:4] for r in rows]
+    params = np.array([r[4:] for r in rows], dtype=float).reshape(len(rows), len(RESOURCES), 3)
+    return meta, params[:, :, 0], params[:, :, 1], params[:, :, 2]
+
+
+def build_site_values(conn: sqlite3.Connection, samples: int = SAMPLES, seed: int = SEED) -> int:
+    """(Re)build site_values from hab_sites + mining_profiles. Returns the site count."""
+    conn.executescript(SCHEMA)
+    meta, mean, width, floor = _load_arrays(conn)
+    if not meta:
+        return 0
+
+    expected = expected_yield(mean, width, floor)                 # (sites, resources)
+    scale = expected.mean(axis=0)
+    scale = np.where(scale > 0, scale, 1.0)
+    value = (expected / scale).sum(axis=1)                        # (sites,)
+
+    rng = np.random.default_rng(seed)
+    rolls = sample_yields(mean, width, floor, samples, rng)       # (samples, sites, resources)
+    bands = np.percentile((rolls / scale).sum(axis=2), [10, 50, 90], axis=0)
+
+    # Rank within each body: sort by (body, -value), then count position per body
+    bodies = np.array([m[2] or '' for m in meta])
+    order = np.lexsort((-value, bodies))
+    rank = np.empty(len(meta), dtype=int)
+    sorted_bodies = bodies[order]
+    starts = np.r_[0, np.flatnonzero(sorted_bodies[1:] != sorted_bodies[:-1]) + 1]
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    rank[order] = np.arange(len(order)) - group_start + 1
+
+    conn.executemany(
+        "INSERT INTO site_values VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((*meta[i], *expected[i].round(4).tolist(), round(float(value[i]), 4),
+          *(round(float(b), 4) for b in bands[:, i]), int(rank[i]))
+         for i in range(len(meta)))
+    )
+    logging.info(f"Valued {len(meta)} hab sites ({samples} rolls each)")
+    return len(meta)
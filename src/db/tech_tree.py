@@ -0,0 +1,204 @@
+"""
+tech_tree.py — Research prerequisite DAG in game_templates.db.
+
+Built by tias load from TITechTemplate and TIProjectTemplate (both list
+their hard prerequisites in `prereqs`; techs and projects can require each
+other):
+
+    tech_nodes(name PK, kind, category, cost, level, display_name)
+    tech_prereqs(name, prereq)              direct edges
+    tech_closure(name, ancestor, depth)     every transitive prerequisite,
+                                            depth = shortest path length
+    tech_index(name PK, bit UNIQUE)         stable bit position per node
+
+tech_index is mirrored from build/tech_index.json, which is append-only:
+names keep their bit across game updates and rebuilds, new names take the
+next free bits. Snapshot bitsets (src/db/research_bits.py) stay decodable
+as long as that file survives.
+
+level is the topological level: 0 for nodes without prerequisites, otherwise
+1 + the highest prerequisite level. Stage joins these against the completed
+sets in savegame.db to derive the research frontier (see populate.py).
+
+Alternative prerequisites (altPrereq0) are not modelled; only the hard
+prereqs list is used.
+
+Usage:
+    from src.db.tech_tree import build_tech_tree
+    build_tech_tree(conn, build_dir / "templates")
+"""
+
+import json
+import logging
+import sqlite3
+from collections import deque
+from pathlib import Path
+
+SOURCES = (('TITechTemplate', 'tech'), ('TIProjectTemplate', 'project'))
+
+SCHEMA = """
+DROP TABLE IF EXISTS tech_nodes;
+DROP TABLE IF EXISTS tech_prereqs;
+DROP TABLE IF EXISTS tech_closure;
+DROP TABLE IF EXISTS tech_index;
+
+CREATE TABLE tech_nodes (
+    name          TEXT PRIMARY KEY,
+    kind          TEXT NOT NULL,      -- 'tech' | 'project'
+    category      TEXT,
+    cost          REAL,
+    level         INTEGER NOT NULL,
+    display_name  TEXT
+);
+CREATE INDEX idx_tech_nodes_level ON tech_nodes(level);
+
+CREATE TABLE tech_prereqs (
+    name    TEXT NOT NULL,
+    prereq  TEXT NOT NULL,
+    PRIMARY KEY (name, prereq)
+) WITHOUT ROWID;
+CREATE INDEX idx_tech_prereqs_prereq ON tech_prereqs(prereq);
+
+CREATE TABLE tech_closure (
+    name      TEXT NOT NULL,
+    ancestor  TEXT NOT NULL,
+    depth     INTEGER NOT NULL,
+    PRIMARY KEY (name, ancestor)
+) WITHOUT ROWID;
+CREATE INDEX idx_tech_closure_ancestor ON tech_closure(ancestor);
+
+CREATE TABLE tech_index (
+    name  TEXT PRIMARY KEY,
+    bit   INTEGER NOT NULL UNIQUE
+);
+"""
+
+
+def _read_nodes(templates_dir: Path) -> dict[str, dict]:
+    nodes: dict[str, dict] = {}
+    for template, kind in SOURCES:
+        path = templates_dir / f"{template}.json"
+        if not path.exists():
+            logging.warning(f"Tech tree: {path.name} not found, skipping {kind}s")
+            continue
+        with open(path, encoding='utf-8') as f:
+            records = json.load(f)
+        for r in records:
+            name = r.get('dataName')
+            if not name or name in nodes:
+                continue
+            nodes[name] = {
+                'kind':     kind,
+                'category': r.get('techCategory'),
+                'cost':     r.get('researchCost'),
+                'display':  r.get('displayName') or r.get('friendlyName'),
+                'prereqs':  [p for p in (r.get('prereqs') or []) if isinstance(p, str) and p],
+            }
+    return nodes
+
+
+def topological_levels(prereqs: dict[str, list[str]]) -> dict[str, int]:
+    """
+    Kahn's algorithm over name → [prereq]. Unknown prereqs are ignored.
+    Nodes on a cycle never become ready; they are logged and placed one
+    level above everything else.
+    """
+    dependents: dict[str, list[str]] = {n: [] for n in prereqs}
+    pending = {}
+    for name, reqs in prereqs.items():
+        known = [p for p in reqs if p in prereqs]
+        pending[name] = len(known)
+        for p in known:
+            dependents[p].append(name)
+
+    level = {n: 0 for n, count in pending.items() if count == 0}
+    queue = deque(level)
+    while queue:
+        node = queue.popleft()
+        for child in dependents[node]:
+            level[child] = max(level.get(child, 0), level[node] + 1)
+            pending[child] -= 1
+            if pending[child] == 0:
+                queue.append(child)
+
+    stuck = [n for n in prereqs if pending[n] > 0]
+    if stuck:
+        logging.warning(f"Tech tree: {len(stuck)} nodes on prerequisite cycles: {', '.join(sorted(stuck)[:5])}")
+        top = max(level.values(), default=-1) + 1
+        for n in stuck:
+            level[n] = top
+    return level
+
+
+def transitive_closure(prereqs: dict[str, list[str]], order: list[str]) -> dict[str, dict[str, int]]:
+    """name → {ancestor: shortest depth}, computed in topological order (each node once)."""
+    closure: dict[str, dict[str, int]] = {}
+    for name in order:
+        ancestors: dict[str, int] = {}
+        for p in prereqs[name]:
+            if p not in prereqs:
+                continue
+            ancestors[p] = 1
+            for a, d in closure.get(p, {}).items():
+                if d + 1 < ancestors.get(a, d + 2):
+                    ancestors[a] = d + 1
+        ancestors.pop(name, None)
+        closure[name] = ancestors
+    return closure
+
+
+def update_tech_index(index_path: Path, names) -> list[str]:
+    """
+    Extend the append-only index at index_path with any new names (sorted).
+    Returns the full list; position = bit.
+    """
+    index: list[str] = []
+    if index_path.exists():
+        index = json.loads(index_path.read_text(encoding='utf-8'))['names']
+    known = set(index)
+    added = sorted(n for n in names if n not in known)
+    if added or not index_path.exists():
+        index.extend(added)
+        index_path.write_text(json.dumps({'names': index}, indent=0), encoding='utf-8')
+        if added and known:
+            logging.info(f"Tech index: {len(added)} new names appended ({len(index)} total)")
+    return index
+
+
+def build_tech_tree(conn: sqlite3.Connection, templates_dir: Path,
+                    index_path: Path | None = None) -> int:
+    """
+    (Re)build tech_nodes / tech_prereqs / tech_closure / tech_index.
+    index_path defaults to tech_index.json next to templates_dir. Returns node count.
+    """
+    if index_path is None:
+        index_path = templates_dir.parent / 'tech_index.json'
+    nodes = _read_nodes(templates_dir)
+    prereqs = {name: n['prereqs'] for name, n in nodes.items()}
+    level = topological_levels(prereqs)
+    order = sorted(nodes, key=lambda n: level[n])
+    closure = transitive_closure(prereqs, order)
+
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        "INSERT INTO tech_nodes VALUES (?, ?, ?, ?, ?, ?)",
+        ((name, n['kind'], n['category'], n['cost'], level[name], n['display'])
+         for name, n in nodes.items())
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO tech_prereqs VALUES (?, ?)",
+        ((name, p) for name, reqs in prereqs.items() for p in reqs if p in nodes)
+    )
+    conn.executemany(
+        "INSERT INTO tech_closure VALUES (?, ?, ?)",
+        ((name, a, d) for name, ancestors in closure.items() for a, d in ancestors.items())
+    )
+    conn.executemany(
+        "INSERT INTO tech_index VALUES (?, ?)",
+        ((name, bit) for bit, name in enumerate(update_tech_index(index_path, nodes)))
+    )
+
+    edges = sum(len(a) for a in closure.values())
+    logging.info(f"Tech tree: {len(nodes)} nodes, {max(level.values(), default=-1) + 1} levels, "
+                 f"{edges} closure rows")
+    return len(nodes)
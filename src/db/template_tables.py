@@ -0,0 +1,179 @@
+"""
+template_tables.py — Generic import of every game template into game_templates.db.
+
+One table per template, tpl_{TemplateName}, with a column set inferred from
+the records:
+
+  - top-level keys whose values are all scalars of one kind become typed
+    columns (INTEGER / REAL / TEXT; booleans stored as 0/1)
+  - everything else (nested objects, lists, mixed-type keys) is kept in a
+    JSON column, data
+  - dataName and reference fields (string columns named *Name, or whose
+    values are mostly dataNames of some template) are indexed
+
+template_tables(template, table_name, row_count, columns, refs) records what
+was imported, so readers can check for a table before joining against it.
+
+Usage:
+    from src.db.template_tables import import_all_templates, template_table
+    import_all_templates(conn, build_dir / "templates")
+    table = template_table(conn, 'TIHabModuleTemplate')   # 'tpl_TIHabModuleTemplate' or None
+    bodies = template_records(conn, 'TISpaceBodyTemplate', schema='tpl')
+"""
+
+import json
+import logging
+import re
+import sqlite3
+from pathlib import Path
+
+MAX_COLUMNS = 1000              # well under SQLITE_MAX_COLUMN (2000)
+REF_MATCH_RATIO = 0.5           # share of values that must be known dataNames
+NON_REF_NAMES = {'dataName', 'displayName', 'friendlyName', 'description'}
+RESERVED = {'rowid', 'oid', '_rowid_', 'data'}
+
+REGISTRY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS template_tables (
+    template    TEXT PRIMARY KEY,
+    table_name  TEXT NOT NULL,
+    row_count   INTEGER NOT NULL,
+    columns     TEXT NOT NULL,      -- JSON [[name, type], ...]
+    refs        TEXT NOT NULL       -- JSON [name, ...] (indexed reference columns)
+);
+"""
+
+
+def table_name(template: str) -> str:
+    return 'tpl_' + re.sub(r'\W', '_', template)
+
+
+def _q(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def infer_columns(records: list[dict]) -> list[tuple[str, str]]:
+    """Return [(key, sql_type)] for keys that hold a single scalar kind across records."""
+    kinds: dict[str, set] = {}
+    for record in records:
+        for key, value in record.items():
+            kinds.setdefault(key, set()).add(type(value))
+
+    columns, seen = [], set()
+    for key, types in kinds.items():
+        types = types - {type(None)}
+        if not types or key.lower() in seen or key.lower() in RESERVED:
+            continue
+        if types <= {bool, int}:
+            sql_type = 'INTEGER'
+        elif types <= {bool, int, float}:
+            sql_type = 'REAL'
+        elif types == {str}:
+            sql_type = 'TEXT'
+        else:
+            continue  # nested or mixed str/number — keep in the JSON column
+        seen.add(key.lower())
+        columns.append((key, sql_type))
+        if len(columns) >= MAX_COLUMNS:
+            break
+    return columns
+
+
+def _reference_columns(records: list[dict], columns: list[tuple[str, str]],
+                       known_names: set[str]) -> list[str]:
+    refs = []
+    for key, sql_type in columns:
+        if sql_type != 'TEXT' or key in NON_REF_NAMES:
+            continue
+        if key.endswith('Name'):
+            refs.append(key)
+            continue
+        values = [r[key] for r in records if r.get(key)]
+        if values and sum(v in known_names for v in values) / len(values) >= REF_MATCH_RATIO:
+            refs.append(key)
+    return refs
+
+
+def _load(path: Path) -> list[dict]:
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    records = data if isinstance(data, list) else [data]
+    return [r for r in records if isinstance(r, dict)]
+
+
+def import_all_templates(conn: sqlite3.Connection, templates_dir: Path) -> int:
+    """Import every templates_dir/*.json into tpl_* tables. Returns total rows."""
+    conn.executescript(REGISTRY_SCHEMA)
+
+    templates = {p.stem: _load(p) for p in sorted(templates_dir.glob("*.json"))}
+    known_names = {r['dataName'] for records in templates.values() for r in records
+                   if isinstance(r.get('dataName'), str)}
+
+    total = 0
+    for template, records in templates.items():
+        table = table_name(template)
+        columns = infer_columns(records)
+        keys = [key for key, _ in columns]
+        refs = _reference_columns(records, columns, known_names)
+
+        conn.execute(f"DROP TABLE IF EXISTS {_q(table)}")
+        col_sql = ''.join(f"{_q(key)} {sql_type}, " for key, sql_type in columns)
+        conn.execute(f"CREATE TABLE {_q(table)} ({col_sql}data TEXT)")
+
+        key_set = set(keys)
+        marks = ', '.join('?' * (len(keys) + 1))
+        col_list = ', '.join([_q(k) for k in keys] + ['data'])
+        conn.executemany(
+            f"INSERT INTO {_q(table)} ({col_list}) VALUES ({marks})",
+            ([*(r.get(k) for k in keys),
+              json.dumps({k: v for k, v in r.items() if k not in key_set}, ensure_ascii=False)
+              if len(r) > len(key_set & r.keys()) else None]
+             for r in records)
+        )
+
+        for key in (['dataName'] if 'dataName' in key_set else []) + refs:
+            conn.execute(f"CREATE INDEX {_q(f'idx_{table}_{key}')} ON {_q(table)}({_q(key)})")
+
+        conn.execute(
+            "INSERT OR REPLACE INTO template_tables VALUES (?, ?, ?, ?, ?)",
+            (template, table, len(records), json.dumps(columns), json.dumps(refs))
+        )
+        total += len(records)
+
+    logging.info(f"Imported {len(templates)} templates ({total} rows) into tpl_* tables")
+    return total
+
+
+def template_table(conn: sqlite3.Connection, template: str, schema: str = 'main') -> str | None:
+    """Table name for an imported template, or None if it was not imported."""
+    try:
+        row = conn.execute(
+            f"SELECT table_name FROM {schema}.template_tables WHERE template = ?", (template,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None  # templates DB predates the generic import
+    return row[0] if row else None
+
+
+def template_records(conn: sqlite3.Connection, template: str, schema: str = 'main') -> list[dict]:
+    """
+    Records of an imported template, rebuilt from its columns and data JSON
+    ([] if it was not imported). Booleans come back as 0/1 and null values
+    are left out.
+    """
+    try:
+        row = conn.execute(
+            f"SELECT table_name, columns FROM {schema}.template_tables WHERE template = ?", (template,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return []
+    if not row:
+        return []
+    keys = [key for key, _ in json.loads(row[1])]
+    col_list = ', '.join([_q(k) for k in keys] + ['data'])
+    records = []
+    for values in conn.execute(f"SELECT {col_list} FROM {schema}.{_q(row[0])}"):
+        record = {k: v for k, v in zip(keys, values) if v is not None}
+        if values[-1]:
+            record.update(json.loads(values[-1]))
+        records.append(record)
+    return records
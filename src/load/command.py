@@ -3,65 +3,62 @@ Load command - Import game templates into SQLite database
 """
 
 import csv
+import hashlib
 import json
 import logging
+import multiprocessing
 import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import src.core.tolerant_json as tolerant_json
+import src.db.localization as localization
 from src.core.core import load_env, get_project_root
-from src.perf.performance import timed_command
-
-
-def parse_localization_file(loc_file: Path) -> dict:
-    """Parse .en localization file"""
-    localizations = {}
-
-    with open(loc_file, encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line or '=' not in line:
-                continue
-
-            key, value = line.split('=', 1)
-            parts = key.split('.')
-
-            if len(parts) < 3:
-                continue
-
-            field = parts[1]
-            data_name = '.'.join(parts[2:])
-
-            if data_name not in localizations:
-                localizations[data_name] = {}
-
-            localizations[data_name][field] = value
-
-    return localizations
+from src.core.tolerant_json import load_tolerant
+from src.db.connection import connect
+from src.db.launch_calendar import CALENDAR_NAME, build_launch_calendar
+from src.db.localization import ingest_localization, template_strings
+from src.db.site_yields import build_site_values
+from src.db.tech_tree import build_tech_tree
+from src.db.template_tables import import_all_templates
+from src.perf.performance import note, span, timed_command
 
 
 def merge_localization(data, localizations: dict):
-    """Recursively merge localization"""
-    if isinstance(data, dict):
-        merged = {}
-        for key, value in data.items():
-            merged[key] = merge_localization(value, localizations)
-
-        data_name = merged.get('dataName')
-        if data_name and data_name in localizations:
-            loc = localizations[data_name]
-            if 'displayName' in loc:
-                merged['displayName'] = loc['displayName']
-            if 'description' in loc:
-                merged['description'] = loc['description']
-
-        return merged
-
-    elif isinstance(data, list):
-        return [merge_localization(item, localizations) for item in data]
-
-    else:
+    """
+    Merge displayName/description into every dict whose dataName is localized.
+
+    Mutates data in place and returns it. Walks the tree with an explicit
+    stack, so no node is copied and deep templates cannot hit the recursion
+    limit.
+    """
+    if not localizations:
         return data
 
+    containers = (dict, list)
+    stack = [data]
+    push, pop = stack.append, stack.pop
+    while stack:
+        node = pop()
+        if isinstance(node, dict):
+            data_name = node.get('dataName')
+            if isinstance(data_name, str) and data_name in localizations:
+                loc = localizations[data_name]
+                if 'displayName' in loc:
+                    node['displayName'] = loc['displayName']
+                if 'description' in loc:
+                    node['description'] = loc['description']
+            for child in node.values():
+                if isinstance(child, containers):
+                    push(child)
+        elif isinstance(node, list):
+            for child in node:
+                if isinstance(child, containers):
+                    push(child)
+
+    return data
+
 
 def load_actors(resources_dir: Path, build_dir: Path) -> dict:
     """Load actor JSON files from TOML/CSV"""
@@ -119,57 +116,124 @@ def load_actors(resources_dir: Path, build_dir: Path) -> dict:
     return built_files
 
 
-def _repair_json(text: str) -> str:
-    """Best-effort repair of malformed JSON (trailing commas, // comments)"""
-    import re
-    text = re.sub(r'//[^\n]*', '', text)           # Remove // comments
-    text = re.sub(r',\s*([\]\}])', r'\1', text)   # Remove trailing commas
-    return text
+# Modules whose code shapes a built template: any change rebuilds every template
+TEMPLATE_CODE = (Path(__file__), Path(tolerant_json.__file__), Path(localization.__file__))
+
+
+def _sha256(path: Path) -> str | None:
+    return hashlib.sha256(path.read_bytes()).hexdigest() if path.exists() else None
+
+
+def _code_hash() -> str:
+    return hashlib.sha256(''.join(_sha256(p) for p in TEMPLATE_CODE).encode()).hexdigest()
+
+
+def _build_template(template_file: Path, loc_db: Path, output_file: Path,
+                    repair_cache: Path) -> tuple[str, str, float, list]:
+    """
+    Parse, localize and write one template. Runs in a worker process.
+    Returns (template_name, status, elapsed_seconds, repairs);
+    status is 'ok', 'recovered' or 'skipped'.
+    """
+    t0 = time.perf_counter()
+    try:
+        template_data, repairs = load_tolerant(template_file, cache_dir=repair_cache)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return template_file.stem, 'skipped', time.perf_counter() - t0, []
+    status = 'recovered' if repairs else 'ok'
+
+    localizations = template_strings(loc_db, template_file.stem)
+    merged_data = merge_localization(template_data, localizations)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(merged_data, f, indent=2, ensure_ascii=False)
+
+    return template_file.stem, status, time.perf_counter() - t0, repairs
 
 
-def load_templates(game_dir: Path, build_dir: Path) -> dict:
-    """Load and localize game templates"""
+def load_templates(game_dir: Path, build_dir: Path, workers: int | None = None,
+                   force: bool = False) -> dict:
+    """
+    Load and localize game templates across a process pool.
+
+    Localization is first refreshed into build/localization.db (only changed
+    .en files are re-read); workers then fetch their template's strings with
+    one indexed query. build/templates_manifest.json records the source and
+    localization hash of every built template; templates whose hashes (and
+    the TEMPLATE_CODE modules) are unchanged and whose output still exists are not
+    reprocessed, so a localization-only change rewrites only the affected
+    templates.
+    """
     templates_rsrc = game_dir / "TerraInvicta_Data/StreamingAssets/Templates"
     loc_dir = game_dir / "TerraInvicta_Data/StreamingAssets/Localization/en"
     templates_build = build_dir / "templates"
     templates_build.mkdir(exist_ok=True)
-
-    built_files = {}
-    skipped = []
-    recovered = []
-
-    for template_file in templates_rsrc.glob("*.json"):
-        template_name = template_file.stem
-        logging.debug(f"  -> {template_name}")
-
+    manifest_file = build_dir / "templates_manifest.json"
+    loc_db = build_dir / "localization.db"
+    repair_cache = build_dir / "repair_cache"
+
+    ingest_localization(loc_dir, loc_db)
+    loc_conn = connect(loc_db, 'readonly')
+    loc_hashes = dict(loc_conn.execute("SELECT template, sha256 FROM localization_files").fetchall())
+    loc_conn.close()
+
+    code_hash = _code_hash()
+    manifest = {}
+    if manifest_file.exists() and not force:
         try:
-            with open(template_file, encoding='utf-8') as f:
-                template_data = json.load(f)
+            manifest = json.loads(manifest_file.read_text(encoding='utf-8'))
         except json.JSONDecodeError:
-            try:
-                with open(template_file, encoding='utf-8') as f:
-                    template_data = json.loads(_repair_json(f.read()))
-                recovered.append(template_name)
-            except (json.JSONDecodeError, Exception):
-                skipped.append(template_name)
-                continue
-
-        # Load localization
-        loc_file = loc_dir / f"{template_name}.en"
-        localizations = {}
-        if loc_file.exists():
-            localizations = parse_localization_file(loc_file)
-
-        # Merge
-        merged_data = merge_localization(template_data, localizations)
-
-        # Write
+            manifest = {}
+    entries = manifest.get('templates', {}) if manifest.get('code') == code_hash else {}
+
+    built_files = {}
+    jobs = []
+    hashes = {}
+    for template_file in sorted(templates_rsrc.glob("*.json")):
+        name = template_file.stem
         output_file = templates_build / template_file.name
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(merged_data, f, indent=2, ensure_ascii=False)
+        hashes[name] = (_sha256(template_file), loc_hashes.get(name))
+        entry = entries.get(name)
+        if (entry and (entry['source'], entry['loc']) == hashes[name]
+                and entry['status'] != 'skipped' and output_file.exists()):
+            built_files[name] = str(output_file)
+            continue
+        jobs.append((template_file, loc_db, output_file, repair_cache))
 
-        built_files[template_name] = str(output_file)
+    logging.info(f"Templates: {len(jobs)} to build, {len(built_files)} unchanged")
 
+    results = []
+    if len(jobs) > 1 and workers != 1:
+        # spawn: load may run on a build-graph worker thread, where fork is unsafe
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = list(pool.map(_build_template, *zip(*jobs)))
+    else:
+        results = [_build_template(*job) for job in jobs]
+
+    recovered, skipped = [], []
+    for name, status, elapsed, repairs in results:
+        logging.debug(f"  -> {name} ({elapsed * 1000:.0f}ms, {status})")
+        for line, column, kind in repairs:
+            logging.debug(f"     repaired {kind} at {name}.json:{line}:{column}")
+        source_hash, loc_hash = hashes[name]
+        entries[name] = {'source': source_hash, 'loc': loc_hash,
+                         'status': status, 'elapsed': round(elapsed, 4),
+                         'repairs': [list(r) for r in repairs]}
+        if status == 'skipped':
+            skipped.append(name)
+            continue
+        if status == 'recovered':
+            recovered.append(name)
+        built_files[name] = str(templates_build / f"{name}.json")
+
+    # Drop entries for templates that no longer exist in the game
+    entries = {name: e for name, e in entries.items() if name in hashes}
+    manifest_file.write_text(json.dumps({'code': code_hash, 'templates': entries}, indent=1, sort_keys=True),
+                             encoding='utf-8')
+
+    if results:
+        slowest = sorted(results, key=lambda r: r[2], reverse=True)[:5]
+        logging.info("Slowest templates: " + ", ".join(f"{r[0]} {r[2]:.2f}s" for r in slowest))
     if recovered:
         logging.debug(f"Recovered {len(recovered)} malformed templates: {', '.join(recovered)}")
     if skipped:
@@ -179,7 +243,7 @@ def load_templates(game_dir: Path, build_dir: Path) -> dict:
 
 
 def create_templates_db(build_dir: Path, templates_dir: Path):
-    """Create SQLite DB from templates"""
+    """Create SQLite DB from templates (curated tables + generic tpl_* import)"""
     db_path = build_dir / "game_templates.db"
 
     if db_path.exists():
@@ -305,39 +369,107 @@ def create_templates_db(build_dir: Path, templates_dir: Path):
                             trait.get('displayName', trait.get('friendlyName')),
                             trait.get('description', '')))
 
+    # Expected yields, Monte Carlo bands and per-body ranks for every hab site
+    with span('site_values'):
+        build_site_values(conn)
+
+    # Launch windows and daily penalties for the whole campaign span
+    with span('launch_calendar'):
+        build_launch_calendar(conn, templates_dir / "TISpaceBodyTemplate.json", build_dir / CALENDAR_NAME)
+
+    # Every template, generically: tpl_{TemplateName} tables joined by stage
+    with span('template_tables'):
+        import_all_templates(conn, templates_dir)
+    # Research prerequisite DAG (closure + levels) for the stage frontier
+    with span('tech_tree'):
+        build_tech_tree(conn, templates_dir)
+
     conn.commit()
+    note(rows=conn.total_changes)
     conn.close()
 
     logging.info(f"OK Created game database: {db_path}")
 
 
+def build_load_graph(project_root: Path, game_dir: Path, workers: int | None = None,
+                     force: bool = False):
+    """
+    Declare load artifacts as build nodes:
+
+      actors                (resources/actors → build/actors/*.json)
+      templates ── templates_db   (game Templates + Localization → build/templates + localization.db
+                                  → game_templates.db)
+
+    actors and templates are independent and rebuild in parallel; within the
+    templates node, changed templates are rebuilt across a process pool.
+    """
+    import src.db.launch_calendar as launch_calendar
+    import src.db.site_yields as site_yields
+    import src.preset.launch_windows as launch_windows
+    import src.db.tech_tree as tech_tree
+    import src.db.template_tables as template_tables
+    from src.core.build_graph import BuildGraph, Node
+
+    resources_dir = project_root / "resources"
+    build_dir = project_root / "build"
+    streaming = game_dir / "TerraInvicta_Data/StreamingAssets"
+
+    graph = BuildGraph(build_dir / "build_manifest.json", project_root)
+    graph.add(Node(
+        "actors",
+        action=lambda: load_actors(resources_dir, build_dir),
+        inputs=[resources_dir / "actors", Path(__file__)],
+        outputs=[build_dir / "actors"],
+    ))
+    templates = graph.add(Node(
+        "templates",
+        action=lambda: load_templates(game_dir, build_dir, workers=workers, force=force),
+        inputs=[streaming / "Templates", streaming / "Localization/en", *TEMPLATE_CODE],
+        outputs=[build_dir / "templates", build_dir / "localization.db"],
+    ))
+    graph.add(Node(
+        "templates_db",
+        action=lambda: create_templates_db(build_dir, build_dir / "templates"),
+        inputs=[Path(__file__), Path(template_tables.__file__), Path(tech_tree.__file__),
+                Path(site_yields.__file__), Path(launch_calendar.__file__), Path(launch_windows.__file__)],
+        outputs=[build_dir / "game_templates.db", build_dir / "tech_index.json", build_dir / CALENDAR_NAME],
+        deps=[templates.name],
+    ))
+    return graph
+
+
 @timed_command
 def cmd_load(args):
     """Import game templates into SQLite database"""
+    from src.core.build_graph import explain
+
     env = load_env()
 
     project_root = get_project_root()
-    resources_dir = project_root / "resources"
     build_dir = project_root / "build"
     game_dir = Path(env['GAME_INSTALL_DIR'])
 
     # Ensure build directory exists
     build_dir.mkdir(exist_ok=True)
 
-    logging.info("Loading actors...")
-    actor_files = load_actors(resources_dir, build_dir)
-    logging.info(f"Loaded {len(actor_files)} actors")
+    logging.info("Loading actors and templates...")
+    force = getattr(args, 'force', False)
+    graph = build_load_graph(project_root, game_dir, workers=getattr(args, 'jobs', None), force=force)
+    results = graph.run(force=force)
+    if getattr(args, 'explain', False):
+        print(explain(results))
 
-    logging.info("Loading templates...")
-    template_files = load_templates(game_dir, build_dir)
-    logging.info(f"Loaded {len(template_files)} templates")
+    if not any(r.ran for r in results.values()):
+        logging.info("[OK] Load up to date: no game or actor files changed")
+        print("\n[OK] Load up to date")
+        return
 
-    logging.info("Creating database...")
-    create_templates_db(build_dir, build_dir / "templates")
+    n_actors = len(list((build_dir / "actors").glob("*.json")))
+    n_templates = len(list((build_dir / "templates").glob("*.json")))
 
     logging.info("=" * 60)
-    logging.info(f"[OK] Load complete: {len(actor_files) + len(template_files)} files")
-    logging.info(f"  Actors: {len(actor_files)}")
-    logging.info(f"  Templates: {len(template_files)}")
+    logging.info(f"[OK] Load complete: {n_actors + n_templates} files")
+    logging.info(f"  Actors: {n_actors}")
+    logging.info(f"  Templates: {n_templates}")
     logging.info(f"  Database: {build_dir / 'game_templates.db'}")
-    print(f"\n[OK] Load complete: {len(actor_files) + len(template_files)} files")
+    print(f"\n[OK] Load complete: {n_actors + n_templates} files")
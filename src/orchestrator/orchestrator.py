@@ -30,6 +30,7 @@ from src.orchestrator.parse_response import parse_response
 from src.orchestrator.prompt_assemble import HistoryTurn, prompt_assemble
 from src.orchestrator.tier_check import TierConfidence, tier_check_all, _is_codex
 from src.orchestrator.validate_action import validate_action
+from src.perf.performance import span
 
 
 # ---------------------------------------------------------------------------
@@ -108,10 +109,12 @@ def turn(query: str, state: OrchestratorState) -> str:
     """
     Process one user query. Returns formatted string for display.
     Updates state.history and state.debate_turn in place.
+    Each node is a performance span; play records every turn.
     """
 
     # --- identify_actor ---
-    result: IdentifyResult = identify_actor(query, state.specs)
+    with span('identify_actor'):
+        result: IdentifyResult = identify_actor(query, state.specs)
 
     if result.flow_type in (FlowType.TOO_VAGUE, FlowType.TOO_BROAD, FlowType.NO_MATCH):
         return _stage_direction(result.stage_note or "The council does not respond.")
@@ -121,7 +124,8 @@ def turn(query: str, state: OrchestratorState) -> str:
         pass  # falls through to normal processing below
 
     # --- tier_check ---
-    tier_results = tier_check_all(result.actors, state.tier)
+    with span('tier_check'):
+        tier_results = tier_check_all(result.actors, state.tier)
 
     # Handle blocked actors
     active = []
@@ -150,17 +154,18 @@ def turn(query: str, state: OrchestratorState) -> str:
             debating_specs = [tr.actor.spec for tr in active]
             interruptor = _select_interruptor(state.specs, debating_specs)
             if interruptor:
-                interrupt_fetch = fragment_fetch(
-                    interruptor, query, TierConfidence.FULL, spectator_only=False
-                )
-                interrupt_prompt = prompt_assemble(
-                    [interrupt_fetch], query,
-                    state.system_path, state.campaign_dir, state.codex_spec,
-                    history=state.history, tier=state.tier, date=state.date,
-                )
-                interrupt_llm = llm_call(interrupt_prompt, "debate_interrupt")
-                interrupt_parsed = parse_response(interrupt_llm)
-                output_lines.append(display(interrupt_parsed, "debate_interrupt", interruptor.display_name))
+                with span('debate_interrupt'):
+                    interrupt_fetch = fragment_fetch(
+                        interruptor, query, TierConfidence.FULL, spectator_only=False
+                    )
+                    interrupt_prompt = prompt_assemble(
+                        [interrupt_fetch], query,
+                        state.system_path, state.campaign_dir, state.codex_spec,
+                        history=state.history, tier=state.tier, date=state.date,
+                    )
+                    interrupt_llm = llm_call(interrupt_prompt, "debate_interrupt")
+                    interrupt_parsed = parse_response(interrupt_llm)
+                    output_lines.append(display(interrupt_parsed, "debate_interrupt", interruptor.display_name))
                 state.debate_turn = 0
                 return "\n\n".join(output_lines)
     else:
@@ -169,30 +174,35 @@ def turn(query: str, state: OrchestratorState) -> str:
     # --- fragment_fetch ---
     other_names = [tr.actor.spec.display_name for tr in active]
     fetches = []
-    for tr in active:
-        others = [n for n in other_names if n != tr.actor.spec.display_name]
-        fetches.append(
-            fragment_fetch(tr.actor.spec, query, tr.confidence, other_actor_names=others or None)
-        )
+    with span('fragment_fetch'):
+        for tr in active:
+            others = [n for n in other_names if n != tr.actor.spec.display_name]
+            fetches.append(
+                fragment_fetch(tr.actor.spec, query, tr.confidence, other_actor_names=others or None)
+            )
 
     # --- prompt_assemble ---
-    prompt = prompt_assemble(
-        fetches, query,
-        state.system_path, state.campaign_dir, state.codex_spec,
-        history=state.history, tier=state.tier, date=state.date,
-    )
+    with span('prompt_assemble'):
+        prompt = prompt_assemble(
+            fetches, query,
+            state.system_path, state.campaign_dir, state.codex_spec,
+            history=state.history, tier=state.tier, date=state.date,
+        )
 
     # --- llm_call ---
     llm_flow = "codex" if any(_is_codex(tr.actor.spec) for tr in active) else ("debate_turn" if flow_type == FlowType.DEBATE else "standard")
-    llm_result = llm_call(prompt, llm_flow)
+    with span('llm_call'):
+        llm_result = llm_call(prompt, llm_flow)
 
     # --- parse_response ---
-    parsed = parse_response(llm_result)
+    with span('parse_response'):
+        parsed = parse_response(llm_result)
 
     # --- validate_action ---
     action_result = None
     if parsed.action and parsed.action_valid:
-        action_result = validate_action(parsed.action, state.decision_log)
+        with span('validate_action'):
+            action_result = validate_action(parsed.action, state.decision_log)
 
     # --- commit_log ---
     speaker = active[0].actor.spec.display_name
@@ -205,7 +215,8 @@ def turn(query: str, state: OrchestratorState) -> str:
         parsed=parsed,
         action_result=action_result,
     )
-    commit_log(ctx, state.logs_dir)
+    with span('commit_log'):
+        commit_log(ctx, state.logs_dir)
 
     # --- update history ---
     state.history.append(HistoryTurn(role="user", speaker="User", content=query))
@@ -213,5 +224,6 @@ def turn(query: str, state: OrchestratorState) -> str:
     state.history = state.history[-20:]  # rolling window
 
     # --- display ---
-    output_lines.append(display(parsed, llm_flow, speaker))
+    with span('display'):
+        output_lines.append(display(parsed, llm_flow, speaker))
     return "\n\n".join(output_lines)
@@ -72,9 +72,16 @@ def load_system_prompt(system_path: Path) -> str:
 
 def _load_gamestate(campaign_dir: Path, date: str = '') -> str:
     """
-    Load gamestate from savegame_{date}.db if present, else fall back to gamestate_*.txt files.
+    Load gamestate in order of preference:
+      1. report_{date}.json  — sections precomputed by stage (no SQL)
+      2. savegame_{date}.db  — render the report on the fly
+      3. gamestate_*.txt     — legacy files
     """
     if date:
+        from src.db.report_artifact import artifact_path, load_report_text
+        report = load_report_text(artifact_path(campaign_dir, date))
+        if report is not None:
+            return report
         db_path = campaign_dir / f"savegame_{date}.db"
         if db_path.exists():
             from src.db.query import build_codex_report
@@ -6,11 +6,12 @@ import gzip
 import json
 import logging
 import sqlite3
+from datetime import datetime
 from pathlib import Path
 
 from src.core.core import load_env, get_project_root
 from src.core.date_utils import parse_flexible_date
-from src.perf.performance import timed_command
+from src.perf.performance import note, timed_command
 
 
 def find_savegame(saves_dir: Path, game_date) -> Path:
@@ -37,6 +38,22 @@ def find_savegame(saves_dir: Path, game_date) -> Path:
     return matches[0]
 
 
+def find_savegames(saves_dir: Path, start, end) -> dict[datetime, Path]:
+    """Savegames dated start..end inclusive, {game date: path} in date order.
+
+    Dates come from the *_YYYY-M-D.gz filename suffix; other files are ignored.
+    """
+    found = {}
+    for path in Path(saves_dir).glob("*_*.gz"):
+        try:
+            game_date = datetime.strptime(path.stem.rsplit('_', 1)[1], '%Y-%m-%d')
+        except ValueError:
+            continue
+        if start <= game_date <= end:
+            found.setdefault(game_date, path)
+    return dict(sorted(found.items()))
+
+
 def parse_savegame(saves_dir: Path, game_date, db_path: Path) -> int:
     """Parse savegame .gz into SQLite DB. Returns number of gamestate keys.
 
@@ -81,6 +98,7 @@ def cmd_parse(args):
     db_path = project_root / "build" / f"savegame_{iso_date}.db"
 
     n_keys = parse_savegame(saves_dir, game_date, db_path)
+    note(save_bytes=find_savegame(saves_dir, game_date).stat().st_size, rows=n_keys)
 
     db_size = db_path.stat().st_size / 1024 / 1024
     logging.info("=" * 60)
@@ -1,10 +1,36 @@
 """
 Perf command - Display performance statistics
+
+Reads logs/perf.db (src/perf/store.py): per-command and per-phase P50/P95/P99,
+optionally filtered by date, command or savegame size, and trends over time.
 """
 
 from collections import defaultdict
 
 from src.core.core import get_project_root
+from src.perf.store import PERF_DB, command_stats, open_store, phase_stats, trend
+
+
+def phase_tree(rows) -> dict[str, list[tuple[int, str, dict]]]:
+    """
+    {command: [(depth, phase, stats)]} in tree order (slowest sibling first)
+    from phase_stats() rows. Depth 1 are the command's direct phases.
+    """
+    children = defaultdict(list)
+    for row in rows:
+        children[(row['command'], row['parent'])].append(dict(row))
+
+    tree = {}
+    for command in sorted({row['command'] for row in rows}):
+        ordered = []
+        stack = [(1, command, row) for row in sorted(children[(command, command)], key=lambda r: r['p50'])]
+        while stack:
+            depth, parent, row = stack.pop()
+            ordered.append((depth, row['name'], row))
+            path = f"{parent}/{row['name']}"
+            stack.extend((depth + 1, path, kid) for kid in sorted(children[(command, path)], key=lambda r: r['p50']))
+        tree[command] = ordered
+    return tree
 
 
 def cmd_perf(args):
@@ -12,55 +38,59 @@ def cmd_perf(args):
     print("Terra Invicta Advisory System - Performance Report")
     print("=" * 60)
 
-    project_root = get_project_root()
-    perf_log = project_root / "logs" / "performance.log"
-
-    if not perf_log.exists():
+    logs_dir = get_project_root() / "logs"
+    if not (logs_dir / PERF_DB).exists() and not (logs_dir / "performance.log").exists():
         print("\nNo performance data available.")
         print("Performance tracking started automatically with this version.")
         return
 
-    # Parse performance log
-    stats = defaultdict(list)
-    failures = defaultdict(int)
-
-    with open(perf_log) as f:
-        for line in f:
-            parts = line.strip().split(',')
-            if len(parts) < 4:
-                continue
-
-            timestamp, command, elapsed, status = parts[:4]
-            elapsed = float(elapsed)
-
-            stats[command].append(elapsed)
-            if status == "FAILED":
-                failures[command] += 1
-
-    if not stats:
+    filters = {
+        'since':       getattr(args, 'since', None),
+        'until':       getattr(args, 'until', None),
+        'min_save_mb': getattr(args, 'min_save_mb', None),
+        'max_save_mb': getattr(args, 'max_save_mb', None),
+        'command':     getattr(args, 'perf_command', None),
+    }
+    with open_store(logs_dir) as conn:
+        commands = command_stats(conn, **filters)
+        phases = phase_tree(phase_stats(conn, **filters))
+        periods = trend(conn, args.trend, **filters) if getattr(args, 'trend', None) else []
+
+    if not commands:
         print("\nNo performance data available.")
         return
 
     # Display statistics
     print("\nCommand Performance:")
-    print(f"{'Command':<12} {'Count':<8} {'Min':<10} {'Avg':<10} {'Max':<10} {'P95':<10} {'Failures'}")
-    print("-" * 75)
-
-    for command in sorted(stats.keys()):
-        times = sorted(stats[command])
-        count = len(times)
-        min_time = min(times)
-        avg_time = sum(times) / count
-        max_time = max(times)
-        p95_idx = int(count * 0.95)
-        p95_time = times[p95_idx] if p95_idx < count else max_time
-        fails = failures.get(command, 0)
+    print(f"{'Command':<12} {'Count':<8} {'Min':<10} {'Avg':<10} {'P50':<10} {'P95':<10} "
+          f"{'P99':<10} {'Max':<10} {'Failures'}")
+    print("-" * 95)
 
+    for row in commands:
         # Highlight slow commands
-        warning = "!" if avg_time > 1.0 else " "
-
-        print(
-            f"{warning}{command:<11} {count:<8} {min_time:<10.3f} {avg_time:<10.3f} {max_time:<10.3f} {p95_time:<10.3f} {fails}")
+        warning = "!" if row['avg'] > 1.0 else " "
+        print(f"{warning}{row['command']:<11} {row['count']:<8} {row['min']:<10.3f} {row['avg']:<10.3f} "
+              f"{row['p50']:<10.3f} {row['p95']:<10.3f} {row['p99']:<10.3f} {row['max']:<10.3f} {row['failures']}")
+
+    if phases:
+        print("\nPhase Breakdown (wall seconds; CPU mean; peak RSS growth):")
+        print(f"{'Phase':<28} {'Count':<7} {'P50':<9} {'P95':<9} {'P99':<9} {'Max':<9} "
+              f"{'CPU':<9} {'RSS+MB':<8} {'Share'}")
+        print("-" * 97)
+        for command, rows in phases.items():
+            print(command)
+            for depth, name, st in rows:
+                label = ('  ' * depth + name)[:28]
+                print(f"{label:<28} {st['count']:<7} {st['p50']:<9.3f} {st['p95']:<9.3f} {st['p99']:<9.3f} "
+                      f"{st['max']:<9.3f} {st['cpu'] or 0:<9.3f} {(st['rss_kb'] or 0) / 1024:<8.1f} "
+                      f"{st['share'] or 0:.0%}")
+
+    if periods:
+        print(f"\nTrend (per {args.trend}):")
+        print(f"{'Command':<12} {'Period':<12} {'Count':<8} {'P50':<10} {'P95'}")
+        print("-" * 50)
+        for row in periods:
+            print(f" {row['command']:<11} {row['period']:<12} {row['count']:<8} {row['p50']:<10.3f} {row['p95']:.3f}")
 
     # Performance targets
     print("\n" + "=" * 60)
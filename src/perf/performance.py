@@ -2,13 +2,183 @@
 Terra Invicta Advisory System - Performance Monitoring
 
 Decorator and logging utilities for tracking command performance.
+
+A command run is recorded as a tree of spans. timed_command (or recorded()
+for work outside a command, such as one play turn) opens the root; span()
+marks a phase inside it and nests freely, across build-graph worker threads
+too. Each span records wall time, CPU time and the growth of the process's
+peak RSS while it was open. note() adds run metrics (savegame size, rows
+written). Finished runs go to logs/perf.db (src/perf/store.py).
+
+Usage:
+    from src.perf.performance import span
+
+    with span('populate'):
+        ...
+
+    @span('evaluate_tier')
+    def evaluate_tier(...):
+        ...
+
+Spans opened while nothing is being recorded are not measured. Under
+--profile every span boundary is also reported to the active profiler
+(src/perf/profiling.py).
 """
 
 import functools
 import logging
+import sqlite3
+import sys
+import threading
 import time
+from contextlib import ContextDecorator, contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
+
+try:
+    import resource
+except ImportError:      # Windows
+    resource = None
+
+
+@dataclass
+class Span:
+    name: str
+    parent: str | None       # path of enclosing spans from the root, 'stage/savegame_db'
+    wall: float = 0.0        # seconds
+    cpu: float = 0.0         # process CPU seconds (all threads) while open
+    rss_kb: int = 0          # growth of peak RSS while open
+
+
+# ---------------------------------------------------------------------------
+# Resource probes
+# ---------------------------------------------------------------------------
+
+def _peak_rss_kb() -> int:
+    """Peak resident set size of this process so far, in KB (0 if unavailable)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak   # macOS reports bytes
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                    'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage',
+                    'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = Counters(cb=ctypes.sizeof(Counters))
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize // 1024
+    except (AttributeError, OSError):
+        return 0
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+class _Recording:
+    """Spans of the command (or turn) being recorded."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.spans: list[Span] = []
+        self.metrics: dict[str, int] = {}     # save_bytes, rows (see note())
+        self.lock = threading.Lock()
+
+
+_recording: _Recording | None = None
+_local = threading.local()      # per-thread stack of open spans (name, wall, cpu, rss)
+_profiler = None                # src.perf.profiling.Profiler while --profile is active
+
+
+def _stack() -> list[tuple]:
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+class span(ContextDecorator):
+    """
+    Time a phase of the current recording; usable as `with span(name):` or
+    `@span(name)`. The parent is the path to the innermost open span of this
+    thread, or the recording's root for spans opened in a worker thread.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        if _profiler is not None:
+            _profiler.span_enter('/'.join([open_name for open_name, *_ in _stack()] + [self.name]))
+        if _recording is None:
+            _stack().append((self.name, None, None, None))
+        else:
+            _stack().append((self.name, time.perf_counter(), time.process_time(), _peak_rss_kb()))
+        return self
+
+    def __exit__(self, *exc):
+        stack = _stack()
+        name, wall, cpu, rss = stack.pop()
+        recording = _recording
+        if recording is not None and wall is not None:
+            parent = '/'.join([recording.name] + [open_name for open_name, *_ in stack])
+            record = Span(name, parent, time.perf_counter() - wall, time.process_time() - cpu,
+                          _peak_rss_kb() - rss)
+            with recording.lock:
+                recording.spans.append(record)
+        if _profiler is not None:
+            _profiler.span_exit('/'.join([open_name for open_name, *_ in stack] + [name]))
+        return False
+
+
+def note(**metrics: int) -> None:
+    """Add run metrics (save_bytes, rows) to the current recording; summed across calls."""
+    recording = _recording
+    if recording is None:
+        return
+    with recording.lock:
+        for key, value in metrics.items():
+            recording.metrics[key] = recording.metrics.get(key, 0) + value
+
+
+@contextmanager
+def recorded(command: str, args: dict | None = None):
+    """
+    Record command and every span inside it to logs/perf.db on exit.
+    Nested inside another recording it is an ordinary span.
+    """
+    global _recording
+    if _recording is not None:
+        with span(command):
+            yield
+        return
+
+    from src.perf.store import Run
+
+    _recording = recording = _Recording(command)
+    started_at = datetime.now().isoformat()
+    start_wall, start_cpu, start_rss = time.perf_counter(), time.process_time(), _peak_rss_kb()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        _recording = None
+        log_performance(Run(
+            started_at=started_at, command=command,
+            wall=time.perf_counter() - start_wall, cpu=time.process_time() - start_cpu,
+            rss_kb=_peak_rss_kb() - start_rss,
+            status='FAILED' if error is not None else 'SUCCESS', error=error,
+            args=args or {}, spans=recording.spans, **recording.metrics,
+        ))
 
 
 def timed_command(func):
@@ -19,41 +189,36 @@ def timed_command(func):
         command_name = func.__name__.replace('cmd_', '')
         start_time = time.time()
 
-        try:
+        command_args = {k: v for k, v in vars(args[0]).items() if k != 'command'} \
+            if args and hasattr(args[0], '__dict__') else {}
+        with recorded(command_name, command_args):
             result = func(*args, **kwargs)
-            elapsed = time.time() - start_time
-
-            # Log to performance log
-            log_performance(command_name, elapsed, success=True)
-
-            # Console output
-            if elapsed > 1.0:
-                logging.warning(f"Performance: {command_name} took {elapsed:.2f}s (threshold: 1.0s)")
-            else:
-                logging.debug(f"Performance: {command_name} completed in {elapsed:.3f}s")
+        elapsed = time.time() - start_time
 
-            return result
+        # Console output
+        if elapsed > 1.0:
+            logging.warning(f"Performance: {command_name} took {elapsed:.2f}s (threshold: 1.0s)")
+        else:
+            logging.debug(f"Performance: {command_name} completed in {elapsed:.3f}s")
 
-        except Exception as e:
-            elapsed = time.time() - start_time
-            log_performance(command_name, elapsed, success=False, error=str(e))
-            raise
+        return result
 
     return wrapper
 
 
-def log_performance(command: str, elapsed: float, success: bool = True, error: str = None):
-    """Append performance metrics to performance log"""
-    from src.core.core import get_project_root
-    log_dir = get_project_root() / "logs"
-    log_dir.mkdir(exist_ok=True)
-    perf_log = log_dir / "performance.log"
+# ---------------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------------
 
-    timestamp = datetime.now().isoformat()
-    status = "SUCCESS" if success else "FAILED"
+def log_performance(run) -> None:
+    """Write a finished run (src.perf.store.Run) and its spans to logs/perf.db"""
+    from src.core.core import get_project_root
+    from src.perf.store import open_store, write_run
 
-    with open(perf_log, 'a') as f:
-        if error:
-            f.write(f"{timestamp},{command},{elapsed:.3f},{status},{error}\n")
-        else:
-            f.write(f"{timestamp},{command},{elapsed:.3f},{status}\n")
+    project_root = get_project_root()
+    try:
+        with open_store(project_root / "logs") as conn:
+            write_run(conn, run, project_root)
+    except sqlite3.Error as e:
+        # Never fail a command because its timing could not be stored
+        logging.warning(f"Performance record not saved: {e}")
@@ -0,0 +1,194 @@
+"""
+Terra Invicta Advisory System - Profiling
+
+Backs the global --profile[=cpu|mem] flag. profiled() wraps a command (or
+one play turn) and writes its report to logs/profiles/:
+
+  cpu - cProfile: {name}_{stamp}.prof (for snakeviz, pstats) and a .txt
+        summary of the top functions by cumulative and by own time.
+        Build-graph worker threads are profiled from their outermost span
+        and merged in; stage's parse worker processes are not profiled.
+  mem - tracemalloc: a snapshot at every perf span boundary
+        (src/perf/performance.py). {name}_{stamp}_mem.txt lists the top
+        allocation sites of the whole run, then the net growth and top
+        sites of each span. Snapshots are process-wide, so a span that
+        overlaps a worker thread's span includes its allocations.
+
+Usage:
+    from src.perf.profiling import profiled
+
+    with profiled('stage', 'cpu'):
+        ...
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+MODES      = ('cpu', 'mem')
+TOP_N      = 30     # functions / allocation sites in a summary
+SPAN_TOP_N = 5      # allocation sites per span
+
+# Allocations made by the profiler and the import machinery are not the command's
+_MEM_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+]
+
+
+class Profiler:
+    """One profiled run; performance.span reports every span boundary to it."""
+
+    def __init__(self, name: str, mode: str, top: int = TOP_N):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (expected {' or '.join(MODES)})")
+        self.name = name
+        self.mode = mode
+        self.top = top
+        self.lock = threading.Lock()
+        self._owner = threading.get_ident()
+        self._local = threading.local()
+        self._thread_profiles: list[cProfile.Profile] = []
+        self._spans: list[tuple[str, int, list]] = []     # (path, net bytes, top sites) in exit order
+
+    # -- run -----------------------------------------------------------------
+
+    def start(self) -> None:
+        if self.mode == 'cpu':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._was_tracing = tracemalloc.is_tracing()
+            if not self._was_tracing:
+                tracemalloc.start()
+            self._start = self._snapshot()
+
+    def stop(self) -> None:
+        if self.mode == 'cpu':
+            self._profile.disable()
+        else:
+            self._end = self._snapshot()
+            self._peak = tracemalloc.get_traced_memory()[1]
+            if not self._was_tracing:
+                tracemalloc.stop()
+
+    # -- span boundaries -----------------------------------------------------
+
+    def span_enter(self, path: str) -> None:
+        if self.mode == 'cpu':
+            # cProfile sees only the thread that enabled it: give each worker
+            # thread its own profile from its outermost span on
+            if threading.get_ident() == self._owner:
+                return
+            depth = getattr(self._local, 'depth', 0)
+            if depth == 0:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError:      # Python 3.12+: the main profile already sees every thread
+                    profile = None
+                self._local.profile = profile
+            self._local.depth = depth + 1
+        else:
+            if not hasattr(self._local, 'open'):
+                self._local.open = []
+            self._local.open.append(self._snapshot())
+
+    def span_exit(self, path: str) -> None:
+        if self.mode == 'cpu':
+            if threading.get_ident() == self._owner or not getattr(self._local, 'depth', 0):
+                return
+            self._local.depth -= 1
+            if self._local.depth == 0 and self._local.profile is not None:
+                self._local.profile.disable()
+                with self.lock:
+                    self._thread_profiles.append(self._local.profile)
+        elif getattr(self._local, 'open', None):      # not for spans opened before start()
+            entered = self._local.open.pop()
+            stats = self._snapshot().compare_to(entered, 'lineno')
+            with self.lock:
+                self._spans.append((path, sum(s.size_diff for s in stats), stats[:SPAN_TOP_N]))
+
+    # -- reports -------------------------------------------------------------
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_MEM_FILTERS)
+
+    def write(self, out_dir: Path) -> list[Path]:
+        """Write the report files for this run. Returns their paths."""
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stem = out_dir / f"{self.name}_{datetime.now():%Y%m%d-%H%M%S}"
+        if self.mode == 'cpu':
+            stats = pstats.Stats(self._profile)
+            for profile in self._thread_profiles:
+                stats.add(profile)
+            prof = stem.with_suffix('.prof')
+            stats.dump_stats(prof)
+            txt = stem.with_suffix('.txt')
+            txt.write_text(self.cpu_summary(stats), encoding='utf-8')
+            return [prof, txt]
+        txt = stem.with_name(stem.name + '_mem.txt')
+        txt.write_text(self.mem_summary(), encoding='utf-8')
+        return [txt]
+
+    def cpu_summary(self, stats: pstats.Stats) -> str:
+        out = io.StringIO()
+        stats.stream = out
+        out.write(f"CPU profile: {self.name} ({len(self._thread_profiles)} worker thread profile(s) merged)\n\n")
+        out.write(f"Top {self.top} by cumulative time:\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        out.write(f"Top {self.top} by own time:\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        return out.getvalue()
+
+    def mem_summary(self) -> str:
+        stats = self._end.compare_to(self._start, 'lineno')
+        lines = [f"Memory profile: {self.name}",
+                 f"Net growth {sum(s.size_diff for s in stats) / 2**20:+.1f}MB, "
+                 f"traced peak {self._peak / 2**20:.1f}MB",
+                 "", f"Top {self.top} allocation sites (net growth over the run):"]
+        lines += [f"  {s.size_diff / 1024:>+10.1f}KB {s.count_diff:>+8} blocks  {s.traceback[0]}"
+                  for s in stats[:self.top]]
+        lines += ["", "Spans (net growth; top allocation sites):"]
+        for path, net, top in self._spans:
+            lines.append(f"  {path:<40} {net / 1024:>+10.1f}KB")
+            lines += [f"      {s.size_diff / 1024:>+10.1f}KB  {s.traceback[0]}" for s in top]
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profiled(name: str, mode: str = 'cpu', out_dir: Path | None = None, top: int = TOP_N):
+    """
+    Profile the enclosed block and write the report to out_dir (default
+    logs/profiles/). Nested inside another profiled() block it does nothing.
+    """
+    from src.perf import performance
+
+    if performance._profiler is not None:
+        yield None
+        return
+    if out_dir is None:
+        from src.core.core import get_project_root
+        out_dir = get_project_root() / "logs" / "profiles"
+
+    profiler = Profiler(name, mode, top)
+    profiler.start()
+    performance._profiler = profiler
+    try:
+        yield profiler
+    finally:
+        performance._profiler = None
+        profiler.stop()
+        for path in profiler.write(out_dir):
+            logging.info(f"Profile written: {path}")
+            print(f"[profile] {path}")
@@ -0,0 +1,68 @@
+"""
+Terra Invicta Advisory System - Startup import cost
+
+Runs tias under `python -X importtime` and reads back what the command
+imported and how long that took. Interpreter startup (everything up to and
+including `site`) is not counted: it is the same for every Python program.
+tests/perf/test_startup.py uses this to gate the startup cost of the light
+commands.
+
+Usage:
+    python -m src.perf.startup perf          # slowest imports of `tias perf`
+"""
+
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class Import:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int          # 0 = imported directly by running code, not by another module
+
+
+def parse_importtime(stderr: str) -> list[Import]:
+    """Imports made after interpreter startup, in -X importtime order (children first)."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0 and module == 'site':
+            imports.clear()         # interpreter startup ends with site
+            continue
+        imports.append(Import(module, int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def startup_imports(args: list[str], project_root: Path) -> list[Import]:
+    """Run `python -X importtime -m src <args>` in project_root; return its imports."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'src', *args],
+        cwd=project_root, capture_output=True, text=True, timeout=120,
+    )
+    return parse_importtime(result.stderr)
+
+
+def total_ms(imports: list[Import]) -> float:
+    """Import time of everything the command loaded, in milliseconds."""
+    return sum(i.cumulative_us for i in imports if i.depth == 0) / 1000
+
+
+def main():
+    args = sys.argv[1:] or ['perf']
+    imports = startup_imports(args, Path(__file__).parent.parent.parent)
+    print(f"tias {' '.join(args)}: {len(imports)} modules, {total_ms(imports):.1f}ms of imports")
+    print(f"\n{'Cumulative ms':>14} {'Self ms':>8}  Module")
+    for i in sorted(imports, key=lambda i: i.cumulative_us, reverse=True)[:25]:
+        print(f"{i.cumulative_us / 1000:>14.1f} {i.self_us / 1000:>8.1f}  {i.module}")
+
+
+if __name__ == '__main__':
+    main()
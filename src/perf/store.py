@@ -0,0 +1,305 @@
+"""
+store.py — Performance records in logs/perf.db.
+
+One row per recorded command run (or play turn) with its phase spans:
+
+    runs   command, args fingerprint, wall / CPU / peak-RSS growth, status,
+           savegame bytes, rows written, host, git revision
+    spans  run_id, name, parent path, wall, cpu, rss_kb
+
+Percentiles are computed in SQL with window functions (nearest rank) over
+indexed columns, so the report never reads the whole history into Python.
+Runs older than RETENTION_DAYS, and all but the newest MAX_RUNS, are
+pruned when a run is written. The CSV logs of earlier versions are
+imported once and renamed *.imported.
+
+Usage:
+    from src.perf.store import open_store, write_run, command_stats
+    with open_store(logs_dir) as conn:
+        write_run(conn, run)
+        command_stats(conn, since='2027-01-01')
+"""
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+PERF_DB = 'perf.db'
+RETENTION_DAYS = 180
+MAX_RUNS = 20_000
+PERCENTILES = (50, 95, 99)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    started_at  TEXT NOT NULL,          -- ISO timestamp
+    command     TEXT NOT NULL,
+    args_hash   TEXT,
+    args        TEXT,                   -- JSON
+    wall        REAL NOT NULL,          -- seconds
+    cpu         REAL,
+    rss_kb      INTEGER,
+    status      TEXT NOT NULL,          -- SUCCESS | FAILED
+    error       TEXT,
+    save_bytes  INTEGER,                -- savegame input size, if any
+    rows        INTEGER,                -- rows written, if any
+    host        TEXT,                   -- JSON
+    revision    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_command ON runs(command, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at);
+
+CREATE TABLE IF NOT EXISTS spans (
+    run_id  INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name    TEXT NOT NULL,
+    parent  TEXT NOT NULL,              -- '' for the root, else 'stage/savegame_db'
+    wall    REAL NOT NULL,
+    cpu     REAL,
+    rss_kb  INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_spans_run ON spans(run_id);
+CREATE INDEX IF NOT EXISTS idx_spans_phase ON spans(parent, name);
+"""
+
+
+@dataclass
+class Run:
+    started_at: str
+    command: str
+    wall: float
+    status: str = 'SUCCESS'
+    error: str | None = None
+    cpu: float | None = None
+    rss_kb: int | None = None
+    args: dict = field(default_factory=dict)
+    save_bytes: int | None = None
+    rows: int | None = None
+    spans: list = field(default_factory=list)     # src.perf.performance.Span, root excluded
+
+
+# ---------------------------------------------------------------------------
+# Context
+# ---------------------------------------------------------------------------
+
+def args_fingerprint(args: dict) -> str:
+    """Short stable hash of the command's arguments."""
+    return hashlib.sha256(json.dumps(args, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def host_info() -> dict:
+    return {
+        'node': platform.node(), 'system': platform.system(), 'release': platform.release(),
+        'machine': platform.machine(), 'python': platform.python_version(), 'cpus': os.cpu_count(),
+    }
+
+
+def git_revision(root: Path) -> str | None:
+    """HEAD commit of the checkout at root, read from .git without running git."""
+    git = root / '.git'
+    try:
+        head = (git / 'HEAD').read_text().strip()
+        if not head.startswith('ref: '):
+            return head[:12]
+        ref = head[5:]
+        if (git / ref).exists():
+            return (git / ref).read_text().strip()[:12]
+        for line in (git / 'packed-refs').read_text().splitlines():
+            if line.endswith(' ' + ref):
+                return line.split()[0][:12]
+    except OSError:
+        pass
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def open_store(logs_dir: Path):
+    """Connection to logs_dir/perf.db, created (and legacy CSV imported) on first use."""
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(logs_dir / PERF_DB, timeout=10)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        _import_legacy(conn, logs_dir)
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def write_run(conn: sqlite3.Connection, run: Run, root: Path | None = None) -> int:
+    """Insert run and its spans, then apply retention. Returns the run id."""
+    cur = conn.execute(
+        "INSERT INTO runs (started_at, command, args_hash, args, wall, cpu, rss_kb, status, error, "
+        "save_bytes, rows, host, revision) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (run.started_at, run.command, args_fingerprint(run.args), json.dumps(run.args, default=str),
+         run.wall, run.cpu, run.rss_kb, run.status, run.error, run.save_bytes, run.rows,
+         json.dumps(host_info()), git_revision(root) if root else None),
+    )
+    run_id = cur.lastrowid
+    conn.executemany(
+        "INSERT INTO spans (run_id, name, parent, wall, cpu, rss_kb) VALUES (?, ?, ?, ?, ?, ?)",
+        [(run_id, s.name, s.parent, s.wall, s.cpu, s.rss_kb) for s in run.spans],
+    )
+    prune(conn)
+    return run_id
+
+
+def prune(conn: sqlite3.Connection, retention_days: int = RETENTION_DAYS, max_runs: int = MAX_RUNS) -> int:
+    """Delete runs past retention or beyond the newest max_runs. Returns runs removed."""
+    removed = conn.execute(
+        "DELETE FROM runs WHERE started_at < strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime', ?)",
+        (f'-{retention_days} days',)
+    ).rowcount
+    removed += conn.execute(
+        "DELETE FROM runs WHERE id <= (SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?)", (max_runs,)
+    ).rowcount
+    return removed
+
+
+def _import_legacy(conn: sqlite3.Connection, logs_dir: Path) -> None:
+    """Import performance.log / spans.log (CSV) once, then rename them *.imported."""
+    perf_log, spans_log = logs_dir / 'performance.log', logs_dir / 'spans.log'
+    if not perf_log.exists():
+        return
+    ids = {}
+    for line in perf_log.read_text(encoding='utf-8', errors='replace').splitlines():
+        # timestamp,command,elapsed,status[,error — may itself contain commas]
+        parts = line.split(',', 4)
+        if len(parts) < 4:
+            continue
+        try:
+            wall = float(parts[2])
+        except ValueError:
+            continue
+        ids[(parts[0], parts[1])] = conn.execute(
+            "INSERT INTO runs (started_at, command, wall, status, error) VALUES (?, ?, ?, ?, ?)",
+            (parts[0], parts[1], wall, parts[3], parts[4] if len(parts) > 4 else None),
+        ).lastrowid
+    if spans_log.exists():
+        rows = []
+        for line in spans_log.read_text(encoding='utf-8', errors='replace').splitlines():
+            parts = line.split(',')
+            if len(parts) != 7 or not parts[3] or (parts[0], parts[1]) not in ids:
+                continue                    # roots duplicate the runs row
+            rows.append((ids[(parts[0], parts[1])], parts[2], parts[3],
+                         float(parts[4]), float(parts[5]), int(parts[6])))
+        conn.executemany("INSERT INTO spans VALUES (?, ?, ?, ?, ?, ?)", rows)
+        spans_log.rename(spans_log.with_name('spans.log.imported'))
+    conn.commit()
+    perf_log.rename(perf_log.with_name('performance.log.imported'))
+    logging.info(f"Imported {len(ids)} runs from {perf_log.name} into {PERF_DB}")
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def _filters(since: str | None, until: str | None, min_save_mb: float | None,
+             max_save_mb: float | None, command: str | None, alias: str = 'runs') -> tuple[str, list]:
+    clauses, params = [], []
+    if since:
+        clauses.append(f"{alias}.started_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append(f"{alias}.started_at < date(?, '+1 day')")
+        params.append(until)
+    if min_save_mb is not None:
+        clauses.append(f"{alias}.save_bytes >= ?")
+        params.append(int(min_save_mb * 1024 * 1024))
+    if max_save_mb is not None:
+        clauses.append(f"{alias}.save_bytes <= ?")
+        params.append(int(max_save_mb * 1024 * 1024))
+    if command:
+        clauses.append(f"{alias}.command = ?")
+        params.append(command)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _percentile_columns(value: str) -> str:
+    # Nearest rank: the smallest value whose rank r satisfies r >= q/100 * n
+    return ", ".join(f"MIN(CASE WHEN rn * 100 >= {q} * n THEN {value} END) AS p{q}" for q in PERCENTILES)
+
+
+def command_stats(conn: sqlite3.Connection, since=None, until=None, min_save_mb=None,
+                  max_save_mb=None, command=None) -> list[sqlite3.Row]:
+    """Per command: count, min, avg, max, p50/p95/p99 wall and failures."""
+    where, params = _filters(since, until, min_save_mb, max_save_mb, command)
+    return conn.execute(f"""
+        WITH ranked AS (
+            SELECT command, wall, status,
+                   ROW_NUMBER() OVER (PARTITION BY command ORDER BY wall) AS rn,
+                   COUNT(*)     OVER (PARTITION BY command)              AS n
+            FROM runs{where}
+        )
+        SELECT command, COUNT(*) AS count, MIN(wall) AS min, AVG(wall) AS avg, MAX(wall) AS max,
+               {_percentile_columns('wall')},
+               SUM(status = 'FAILED') AS failures
+        FROM ranked GROUP BY command ORDER BY command
+    """, params).fetchall()
+
+
+def phase_stats(conn: sqlite3.Connection, since=None, until=None, min_save_mb=None,
+                max_save_mb=None, command=None) -> list[sqlite3.Row]:
+    """
+    Per (command, parent, phase): count, p50/p95/p99/max wall, mean CPU, max RSS
+    growth, and share: the phase's wall time over the wall time of the runs it
+    occurs in (phases on parallel threads can add up past 100%).
+    """
+    where, params = _filters(since, until, min_save_mb, max_save_mb, command, alias='r')
+    return conn.execute(f"""
+        WITH selected AS (SELECT r.id, r.command, r.wall FROM runs r{where}),
+        ranked AS (
+            SELECT s.run_id, sel.command, s.parent, s.name, s.wall, s.cpu, s.rss_kb,
+                   ROW_NUMBER() OVER (PARTITION BY sel.command, s.parent, s.name ORDER BY s.wall) AS rn,
+                   COUNT(*)     OVER (PARTITION BY sel.command, s.parent, s.name)                AS n
+            FROM spans s JOIN selected sel ON sel.id = s.run_id
+        ),
+        per_run AS (
+            SELECT sel.command, s.parent, s.name, SUM(s.wall) AS wall, sel.wall AS run_wall
+            FROM spans s JOIN selected sel ON sel.id = s.run_id
+            GROUP BY sel.command, s.parent, s.name, s.run_id
+        ),
+        shares AS (
+            SELECT command, parent, name, SUM(wall) / NULLIF(SUM(run_wall), 0) AS share
+            FROM per_run GROUP BY command, parent, name
+        )
+        SELECT ranked.command, ranked.parent, ranked.name, COUNT(*) AS count,
+               {_percentile_columns('ranked.wall')}, MAX(ranked.wall) AS max,
+               AVG(cpu) AS cpu, MAX(rss_kb) AS rss_kb, shares.share
+        FROM ranked JOIN shares USING (command, parent, name)
+        GROUP BY ranked.command, ranked.parent, ranked.name
+    """, params).fetchall()
+
+
+TREND_PERIODS = {'day': '%Y-%m-%d', 'week': '%Y-W%W', 'month': '%Y-%m'}
+
+
+def trend(conn: sqlite3.Connection, period: str = 'week', since=None, until=None, min_save_mb=None,
+          max_save_mb=None, command=None) -> list[sqlite3.Row]:
+    """Per command and period: count and p50/p95 wall, oldest period first."""
+    where, params = _filters(since, until, min_save_mb, max_save_mb, command)
+    fmt = TREND_PERIODS[period]
+    return conn.execute(f"""
+        WITH ranked AS (
+            SELECT command, strftime('{fmt}', started_at) AS period, wall,
+                   ROW_NUMBER() OVER (PARTITION BY command, strftime('{fmt}', started_at) ORDER BY wall) AS rn,
+                   COUNT(*)     OVER (PARTITION BY command, strftime('{fmt}', started_at))                AS n
+            FROM runs{where}
+        )
+        SELECT command, period, COUNT(*) AS count,
+               MIN(CASE WHEN rn * 100 >= 50 * n THEN wall END) AS p50,
+               MIN(CASE WHEN rn * 100 >= 95 * n THEN wall END) AS p95
+        FROM ranked GROUP BY command, period ORDER BY command, period
+    """, params).fetchall()
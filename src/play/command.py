@@ -2,7 +2,7 @@
 Play command - Launch KoboldCpp and start interactive advisory session (V2)
 
 Flow:
-  1. Run preset to generate gamestate files
+  1. Run preset to generate gamestate files (skipped when already current)
   2. Launch KoboldCpp as background process
   3. Delegate chat loop to orchestrator.turn()
 """
@@ -11,12 +11,15 @@ import logging
 import os
 import subprocess
 import time
+from contextlib import nullcontext
 from pathlib import Path
 
 import requests
 
 from src.core.core import load_env, get_project_root
 from src.orchestrator.orchestrator import OrchestratorState, turn
+from src.perf.performance import recorded
+from src.perf.profiling import profiled
 
 
 def _wait_for_server(port: str, timeout: int = 60) -> bool:
@@ -113,7 +116,9 @@ def cmd_play(args):
     print("=" * 60)
     print()
 
-    # Phase 4: chat loop
+    # Phase 4: chat loop (under --profile, each turn gets its own report)
+    profile = getattr(args, 'profile', None)
+    turns = 0
     try:
         while True:
             try:
@@ -126,7 +131,9 @@ def cmd_play(args):
                 break
 
             print()
-            response = turn(user_input, state)
+            turns += 1
+            with recorded('turn'), profiled(f'play_turn{turns}', profile) if profile else nullcontext():
+                response = turn(user_input, state)
             print(response)
             print()
 
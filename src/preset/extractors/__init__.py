@@ -1,3 +0,0 @@
-"""
-Domain-specific game state extractors for preset command.
-"""
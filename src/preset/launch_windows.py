@@ -1,84 +1,202 @@
 """
 Terra Invicta Advisory System - Launch Window Calculations
 
-Calculates optimal launch windows for interplanetary missions.
-Uses Keplerian orbital mechanics and game-verified synodic periods.
+Calculates optimal launch windows from Earth for every body with hab sites.
+
+Per body, two parameters are needed: the synodic period with Earth and the
+date of one optimal (Hohmann) departure. They are derived from the orbital
+elements in TISpaceBodyTemplate (semiMajorAxis_AU, longAscendingNode_Deg,
+argPeriapsis_Deg, meanAnomalyAtEpoch_Deg, epoch_floatJYears):
+
+    period   T = a^1.5 years (a in AU, heliocentric)
+    synodic  S = 1 / |1/T - 1/T_earth|
+    window   target leads Earth by φ* = π − n_target · t_transfer,
+             t_transfer = ½ · ((a_earth + a_target) / 2)^1.5 years
+
+Moons and other satellites use the heliocentric orbit of the planet they
+circle; bodies in Earth's own system have no window. Mars, Sisyphus and
+Hephaistos keep their game-verified anchors and periods. Bodies whose orbit
+lacks the semi-major axis or mean anomaly get no window; they are logged.
+
+Parameters are derived once per template file and cached. Next windows and
+penalties for all bodies at a date are then a handful of NumPy array ops.
+
+Usage:
+    from src.preset.launch_windows import calculate_launch_windows
+    windows = calculate_launch_windows(game_date, build_dir / "templates" / "TISpaceBodyTemplate.json")
+    windows['Mars']   # {'display': 'Mars', 'next_window': '2029-01-01', 'days_away': 519, 'current_penalty': 32}
 """
 
+import json
 import logging
 import math
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
+from src.core.orbits import EARTH, SUN, epoch_days, heliocentric_root, mean_longitude_deg, semi_major_axis_au
+
+REFERENCE = datetime(2000, 1, 1)          # ~J2000; window anchors are days from here
+EARTH_A_AU = 1.00000261                   # fallbacks if Earth's template lacks elements
+EARTH_L_J2000_DEG = 100.46457166
+
+# Game-verified (optimal window date, synodic days, label); always reported,
+# and they override derived values
+VERIFIED = {
+    'Mars':       (datetime(2026, 11, 13), 780, 'Mars'),
+    'Sisyphus':   (datetime(2027, 8, 2), 592, '1866 Sisyphus'),
+    'Hephaistos': (datetime(2027, 8, 1), 533, '2212 Hephaistos'),
+}
+
+# Penalty curve, calibrated on Mars (~1% average error against game data):
+# PENALTY_MAX_PCT * sqrt(days from optimal / half a synodic period)
+PENALTY_MAX_PCT = 40.0
+
+
+@dataclass(frozen=True)
+class WindowParameters:
+    """Per-body arrays, index-aligned: dataName, display name, anchor day, synodic days."""
+    names: tuple[str, ...]
+    display: tuple[str, ...]
+    anchor: np.ndarray
+    synodic: np.ndarray
+
+
+_cache: dict[str, tuple[tuple, WindowParameters]] = {}
+_cache_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Parameters
+# ---------------------------------------------------------------------------
+
+def _targets(templates_file: Path, bodies: dict[str, dict]) -> list[str]:
+    """Bodies with hab sites (TIHabSiteTemplate next to templates_file), else every body."""
+    sites_file = templates_file.parent / "TIHabSiteTemplate.json"
+    if sites_file.exists():
+        with open(sites_file, encoding='utf-8') as f:
+            sites = json.load(f)
+        names = {s.get('parentBodyName') for s in sites if isinstance(s, dict)}
+        return sorted(n for n in names if n in bodies)
+    return sorted(bodies)
+
+
+def derive_parameters(bodies: dict[str, dict], targets: list[str]) -> WindowParameters:
+    """Synodic periods and optimal-window anchors for targets, vectorized over bodies."""
+    earth = bodies.get(EARTH, {})
+    earth_a = semi_major_axis_au(earth) or EARTH_A_AU
+    earth_l = mean_longitude_deg(earth)
+    earth_l, earth_epoch = ((earth_l, epoch_days(earth)) if earth_l is not None
+                            else (EARTH_L_J2000_DEG, 0.0))
+
+    names, display, a, lon, epoch, skipped = [], [], [], [], [], []
+    for name in targets:
+        if name in VERIFIED:
+            continue
+        root = heliocentric_root(name, bodies)
+        if root is None or root in (EARTH, SUN):
+            continue
+        elements = bodies[root]
+        root_a, root_l = semi_major_axis_au(elements), mean_longitude_deg(elements)
+        if root_a is None or root_l is None:
+            skipped.append(name)
+            continue
+        if abs(root_a - earth_a) < 1e-6:
+            continue
+        names.append(name)
+        display.append(bodies[name].get('displayName') or bodies[name].get('friendlyName') or name)
+        a.append(root_a)
+        lon.append(root_l)
+        epoch.append(epoch_days(elements))
+
+    if skipped:
+        logging.warning(f"No launch windows for {len(skipped)} bodies whose orbit lacks "
+                        f"semiMajorAxis_AU or meanAnomalyAtEpoch_Deg: {', '.join(skipped)}")
+
+    a, lon, epoch = np.array(a), np.radians(np.array(lon)), np.array(epoch)
+    year = 365.25
+    n_earth = 2 * np.pi / (earth_a ** 1.5 * year)                 # rad/day
+    n_target = 2 * np.pi / (a ** 1.5 * year)
+    rel = n_target - n_earth
+    synodic = 2 * np.pi / np.abs(rel)
+
+    transfer = 0.5 * ((earth_a + a) / 2) ** 1.5 * year            # days
+    optimal_phase = np.pi - n_target * transfer
+    # Phase (target − Earth mean longitude) at J2000, each propagated from its epoch
+    phase0 = (lon - n_target * epoch) - (math.radians(earth_l) - n_earth * earth_epoch)
+    anchor = np.mod((optimal_phase - phase0) / rel, synodic)
+
+    for name, (date, period, label) in VERIFIED.items():
+        names.append(name)
+        display.append((bodies.get(name) or {}).get('displayName') or label)
+        anchor = np.append(anchor, float((date - REFERENCE).days))
+        synodic = np.append(synodic, float(period))
+
+    return WindowParameters(tuple(names), tuple(display), anchor, synodic)
+
+
+def window_parameters(templates_file: Path) -> WindowParameters:
+    """Cached parameters for templates_file; re-derived when the file changes."""
+    sites_file = templates_file.parent / "TIHabSiteTemplate.json"
+    sig = tuple((st.st_ino, st.st_size, st.st_mtime_ns)
+                for st in (p.stat() for p in (templates_file, sites_file) if p.exists()))
+    key = str(templates_file.resolve())
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] == sig:
+            return cached[1]
+
+    with open(templates_file, encoding='utf-8') as f:
+        records = json.load(f)
+    bodies = {b['dataName']: b for b in records if isinstance(b, dict) and b.get('dataName')}
+    params = derive_parameters(bodies, _targets(templates_file, bodies))
+    logging.debug(f"Launch window parameters derived for {len(params.names)} bodies")
+
+    with _cache_lock:
+        _cache[key] = (sig, params)
+    return params
+
+
+# ---------------------------------------------------------------------------
+# Windows at a date
+# ---------------------------------------------------------------------------
+
+def next_windows(params: WindowParameters, day: np.ndarray | float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Next optimal window day (days from J2000, whole days) and penalty (%) for
+    every body at day. day may be a scalar or an array (broadcast as [..., body]).
+    """
+    day = np.asarray(day, dtype=float)[..., None]
+    # Windows fall on whole days, ceil(anchor + k·synodic); take the first k whose
+    # window day is >= day. Rounding keeps float noise on whole-day anchors out.
+    cycles = np.floor(np.round((day - 1 - params.anchor) / params.synodic, 9)) + 1
+    nxt = np.ceil(np.round(params.anchor + cycles * params.synodic, 6))
+    away = nxt - day
+    from_optimal = np.minimum(away, params.synodic - away)
+    penalty = PENALTY_MAX_PCT * np.sqrt(np.clip(from_optimal / (params.synodic / 2.0), 0.0, 1.0))
+    return nxt, penalty
 
-def calculate_launch_windows(game_date: datetime, templates_file: Path) -> dict:
-    """Calculate launch windows for major targets using known synodic periods"""
-    import json
 
+def calculate_launch_windows(game_date: datetime, templates_file: Path) -> dict:
+    """Next window, days away and current penalty for every body with hab sites"""
     if not templates_file.exists():
         logging.warning(f"Templates file not found: {templates_file}")
         return {}
 
-    # Load templates
-    with open(templates_file, encoding='utf-8') as f:
-        templates_data = json.load(f)
-
-    # Known optimal windows (from game verification)
-    # Mars windows repeat every 780 days
-    mars_base_window = datetime(2026, 11, 13)  # Known optimal
-    mars_synodic = 780  # days
-
-    # NEA windows (Near-Earth Asteroids)
-    sisyphus_base_window = datetime(2027, 8, 2)
-    sisyphus_synodic = 592  # days
-
-    hephaistos_base_window = datetime(2027, 8, 1)
-    hephaistos_synodic = 533  # days
+    params = window_parameters(templates_file)
+    day = (game_date - REFERENCE).days
+    nxt, penalty = next_windows(params, day)
 
     results = {}
-
-    # Calculate Mars window
-    days_since_base = (game_date - mars_base_window).days
-    cycles_passed = days_since_base / mars_synodic
-    next_cycle = math.ceil(cycles_passed)
-    next_mars_window = mars_base_window + timedelta(days=next_cycle * mars_synodic)
-    days_to_mars = (next_mars_window - game_date).days
-
-    # Mars penalty (calibrated with game data)
-    # Formula: 40% * (normalized_distance ^ 0.5)
-    # Fits game data with ~1% average error
-    days_from_optimal = min(days_to_mars, mars_synodic - days_to_mars)
-    normalized = days_from_optimal / (mars_synodic / 2.0)
-    mars_penalty = 40.0 * (normalized ** 0.5)
-
-    results['Mars'] = {
-        'next_window': next_mars_window.strftime('%Y-%m-%d'),
-        'days_away': days_to_mars,
-        'current_penalty': int(mars_penalty)
-    }
-
-    # Calculate Sisyphus window (NEA - no penalty yet)
-    days_since_sis = (game_date - sisyphus_base_window).days
-    cycles_sis = days_since_sis / sisyphus_synodic
-    next_cycle_sis = math.ceil(cycles_sis)
-    next_sis_window = sisyphus_base_window + timedelta(days=next_cycle_sis * sisyphus_synodic)
-    days_to_sis = (next_sis_window - game_date).days
-
-    results['1866 Sisyphus'] = {
-        'next_window': next_sis_window.strftime('%Y-%m-%d'),
-        'days_away': days_to_sis
-    }
-
-    # Calculate Hephaistos window (NEA - no penalty yet)
-    days_since_heph = (game_date - hephaistos_base_window).days
-    cycles_heph = days_since_heph / hephaistos_synodic
-    next_cycle_heph = math.ceil(cycles_heph)
-    next_heph_window = hephaistos_base_window + timedelta(days=next_cycle_heph * hephaistos_synodic)
-    days_to_heph = (next_heph_window - game_date).days
-
-    results['2212 Hephaistos'] = {
-        'next_window': next_heph_window.strftime('%Y-%m-%d'),
-        'days_away': days_to_heph
-    }
-
+    for i, name in enumerate(params.names):
+        window = REFERENCE + timedelta(days=int(nxt[i]))
+        results[name] = {
+            'display': params.display[i],
+            'next_window': window.strftime('%Y-%m-%d'),
+            'days_away': int(round(nxt[i] - day)),
+            'current_penalty': int(penalty[i]),
+        }
     return results
@@ -0,0 +1,331 @@
+"""
+Terra Invicta Advisory System - Transfer Planning (Lambert porkchop grids)
+
+Solves Lambert's problem from Earth to a target body over a grid of
+departure dates × times of flight, vectorized across the whole grid:
+
+  - heliocentric states from the Keplerian elements in TISpaceBodyTemplate
+    (Kepler's equation solved by array Newton iteration)
+  - zero-revolution prograde Lambert solutions by universal variables:
+    safeguarded Newton on z for every grid cell at once
+  - Δv = departure excess |v1 − v_earth| + arrival excess |v2 − v_target|
+
+Grids are cached on disk by (origin elements, target elements, grid spec)
+under build/transfer_cache/, least-recently-used entries evicted beyond
+CACHE_ENTRIES. Local minima along the departure axis are the minimum-Δv
+windows.
+
+Usage:
+    from src.preset.transfers import Grid, porkchop, best_windows, orbit_elements
+    grid = Grid(dep_start=9700, dep_days=800, dep_step=2, tof_min=100, tof_max=400, tof_steps=150)
+    dv = porkchop(orbit_elements(earth), orbit_elements(mars), grid, cache_dir)   # (dep, tof) km/s
+    best_windows(dv, grid, limit=3)    # [(departure_day, tof_days, dv_kms), ...]
+
+    # Every hab-site body from Earth, as used by tias stage
+    space = GameState(raw_db).space_bodies()
+    transfer_windows(game_date, space.bodies, space.targets, build_dir / CACHE_DIR_NAME)
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import astuple, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from src.core.orbits import EARTH, SUN, epoch_days, heliocentric_root, semi_major_axis_au
+
+MU_SUN = 2.9591220828559115e-4       # AU^3 / day^2 (Gaussian constant squared)
+AU_PER_DAY_KMS = 1731.45683681       # 1 AU/day in km/s
+CACHE_ENTRIES = 64
+CACHE_DIR_NAME = 'transfer_cache'    # under build/
+GRID_SNAP_DAYS = 30                  # stage dates within a snap share one cached grid
+WINDOWS = 3                          # minimum-Δv windows kept per body
+MAX_ITERATIONS = 60                  # Lambert z iterations (bisection-safe worst case)
+TOLERANCE = 1e-9                     # relative, on time of flight
+
+
+@dataclass(frozen=True)
+class Elements:
+    """Heliocentric Keplerian elements; angles in radians, epoch in days from J2000."""
+    a: float
+    e: float
+    i: float
+    node: float
+    peri: float
+    m0: float
+    epoch: float
+
+
+@dataclass(frozen=True)
+class Grid:
+    """Departure days (from J2000) × times of flight (days)."""
+    dep_start: int
+    dep_days: int
+    dep_step: int
+    tof_min: float
+    tof_max: float
+    tof_steps: int
+
+    def departures(self) -> np.ndarray:
+        return self.dep_start + np.arange(0, self.dep_days, self.dep_step, dtype=float)
+
+    def tofs(self) -> np.ndarray:
+        return np.linspace(self.tof_min, self.tof_max, self.tof_steps)
+
+
+# ---------------------------------------------------------------------------
+# Ephemeris
+# ---------------------------------------------------------------------------
+
+def orbit_elements(body: dict) -> Elements | None:
+    """Elements from a TISpaceBodyTemplate record, or None without a usable orbit."""
+    a = semi_major_axis_au(body)
+    m0 = body.get('meanAnomalyAtEpoch_Deg')
+    if a is None or not isinstance(m0, (int, float)):
+        return None
+
+    def angle(key: str) -> float:
+        value = body.get(key)
+        return float(np.radians(value)) if isinstance(value, (int, float)) else 0.0
+
+    e = body.get('eccentricity', 0.0)
+    return Elements(
+        a=a,
+        e=float(e) if isinstance(e, (int, float)) and 0 <= e < 1 else 0.0,
+        i=angle('inclination_Deg'),
+        node=angle('longAscendingNode_Deg'),
+        peri=angle('argPeriapsis_Deg'),
+        m0=float(np.radians(m0)),
+        epoch=epoch_days(body),
+    )
+
+
+def state_vectors(el: Elements, days: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Position (AU) and velocity (AU/day), shape (*days.shape, 3)."""
+    n = np.sqrt(MU_SUN / el.a ** 3)
+    m = el.m0 + n * (np.asarray(days, dtype=float) - el.epoch)
+    ecc = m + el.e * np.sin(m)                           # Newton on E − e·sin E = M
+    for _ in range(10):
+        delta = (ecc - el.e * np.sin(ecc) - m) / (1 - el.e * np.cos(ecc))
+        ecc -= delta
+        if np.abs(delta).max(initial=0) < 1e-12:
+            break
+
+    cos_e, sin_e = np.cos(ecc), np.sin(ecc)
+    b = el.a * np.sqrt(1 - el.e ** 2)
+    x, y = el.a * (cos_e - el.e), b * sin_e              # perifocal frame
+    rate = n / (1 - el.e * cos_e)
+    vx, vy = -el.a * sin_e * rate, b * cos_e * rate
+
+    cn, sn = np.cos(el.node), np.sin(el.node)
+    cw, sw = np.cos(el.peri), np.sin(el.peri)
+    ci, si = np.cos(el.i), np.sin(el.i)
+    p = np.array([cn * cw - sn * sw * ci, sn * cw + cn * sw * ci, sw * si])
+    q = np.array([-cn * sw - sn * cw * ci, -sn * sw + cn * cw * ci, cw * si])
+    r = x[..., None] * p + y[..., None] * q
+    v = vx[..., None] * p + vy[..., None] * q
+    return r, v
+
+
+# ---------------------------------------------------------------------------
+# Lambert (universal variables, zero revolutions, prograde)
+# ---------------------------------------------------------------------------
+
+def _stumpff(z: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Stumpff C(z), S(z); branch-free over the array (trig for z > 0, hyperbolic below)."""
+    az = np.abs(z)
+    sz = np.sqrt(az)
+    pos = z > 0
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        c = np.where(pos, 1 - np.cos(sz), np.cosh(sz) - 1) / az
+        s = np.where(pos, sz - np.sin(sz), np.sinh(sz) - sz) / (az * sz)
+    small = az < 1e-6
+    c[small], s[small] = 1 / 2, 1 / 6
+    return c, s
+
+
+def lambert(r1: np.ndarray, r2: np.ndarray, tof: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Velocities (v1, v2) for every (r1, r2, tof) triple, shapes (..., 3) / (...).
+    Cells with no zero-revolution solution come back as NaN.
+    """
+    n1, n2 = np.linalg.norm(r1, axis=-1), np.linalg.norm(r2, axis=-1)
+    cos_dnu = np.clip(np.sum(r1 * r2, axis=-1) / (n1 * n2), -1, 1)
+    cross_z = r1[..., 0] * r2[..., 1] - r1[..., 1] * r2[..., 0]
+    dnu = np.where(cross_z >= 0, np.arccos(cos_dnu), 2 * np.pi - np.arccos(cos_dnu))
+    big_a = np.sin(dnu) * np.sqrt(n1 * n2 / (1 - cos_dnu + 1e-300))
+    sqrt_mu = np.sqrt(MU_SUN)
+
+    def time_of_flight(z, n1, n2, big_a):
+        c, s = _stumpff(z)
+        y = n1 + n2 + big_a * (z * s - 1) / np.sqrt(c)
+        valid = y > 0
+        y = np.where(valid, y, 0.0)
+        q = y / c
+        t = (q * np.sqrt(q) * s + big_a * np.sqrt(y)) / sqrt_mu
+        return np.where(valid, t, -np.inf), y, c, s
+
+    # t(z) increases monotonically on (−∞, 4π²) for zero revolutions. Safeguarded
+    # Newton: every evaluation tightens a [lo, hi] bracket and steps that would
+    # leave it bisect instead. Converged cells drop out of the working set.
+    shape = np.broadcast(n1, tof).shape
+    cells = [np.broadcast_to(x, shape).ravel() for x in (n1, n2, big_a, tof)]
+    z = np.minimum(np.broadcast_to(dnu, shape).ravel() ** 2, 4 * np.pi ** 2 - 1)  # ΔE ≈ Δν
+    lo = np.full_like(z, -4 * np.pi ** 2)
+    hi = np.full_like(z, 4 * np.pi ** 2 - 1e-6)
+    y = np.full_like(z, np.nan)                          # stays NaN where unsolved
+    active = slice(None)                                 # every cell, without a gather
+    for _ in range(MAX_ITERATIONS):
+        za, a1, a2, aa, at = z[active], *(x[active] for x in cells)
+        if not za.size:
+            break
+        t, ya, c, s = time_of_flight(za, a1, a2, aa)
+        short = t < at
+        la = np.where(short, za, lo[active])
+        ha = np.where(short, hi[active], za)
+        zs = np.where(np.abs(za) < 1e-6, 1e-6, za)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            q, sc = ya / c, s / c
+            dt = (q * np.sqrt(q) * ((c - 1.5 * sc) / (2 * zs) + 0.75 * s * sc)
+                  + aa / 8 * (3 * sc * np.sqrt(ya) + aa / np.sqrt(q))) / sqrt_mu
+            newton = za - np.log(t / at) * t / dt            # Newton on ln t, near-linear in z
+        inside = np.isfinite(newton) & (newton > la) & (newton < ha)
+        done = np.abs(t - at) <= TOLERANCE * at
+        going = ~done & (ha - la > 1e-9)
+        z[active] = np.where(going, np.where(inside, newton, 0.5 * (la + ha)), za)
+        lo[active], hi[active] = la, ha
+        y[active] = np.where(done, ya, np.nan)
+        active = np.flatnonzero(going) if isinstance(active, slice) else active[going]
+    y = y.reshape(shape)
+
+    f = 1 - y / n1
+    g = big_a * np.sqrt(y / MU_SUN)
+    gdot = 1 - y / n2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v1 = (r2 - f[..., None] * r1) / g[..., None]
+        v2 = (gdot[..., None] * r2 - r1) / g[..., None]
+    return v1, v2
+
+
+# ---------------------------------------------------------------------------
+# Porkchop grid
+# ---------------------------------------------------------------------------
+
+def solve_grid(origin: Elements, target: Elements, grid: Grid) -> np.ndarray:
+    """Total Δv (km/s) over grid, shape (departures, tofs); NaN where unsolved."""
+    dep, tof = grid.departures(), grid.tofs()
+    r1, vo = state_vectors(origin, dep)                              # (D, 3)
+    arr = dep[:, None] + tof[None, :]                                # (D, T)
+    r2, vt = state_vectors(target, arr)                              # (D, T, 3)
+    v1, v2 = lambert(np.broadcast_to(r1[:, None, :], r2.shape), r2, np.broadcast_to(tof, arr.shape))
+    dv = np.linalg.norm(v1 - vo[:, None, :], axis=-1) + np.linalg.norm(v2 - vt, axis=-1)
+    return (dv * AU_PER_DAY_KMS).astype(np.float32)
+
+
+def _cache_key(origin: Elements, target: Elements, grid: Grid) -> str:
+    spec = json.dumps([astuple(origin), astuple(target), astuple(grid)])
+    return hashlib.sha256(spec.encode('utf-8')).hexdigest()[:24]
+
+
+def _evict(cache_dir: Path, keep: int) -> None:
+    entries = sorted(cache_dir.glob("*.npy"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    for stale in entries[keep:]:
+        stale.unlink(missing_ok=True)
+
+
+def porkchop(origin: Elements, target: Elements, grid: Grid,
+             cache_dir: Path | None = None, cache_entries: int = CACHE_ENTRIES) -> np.ndarray:
+    """solve_grid, served from / stored to cache_dir (LRU by file mtime)."""
+    if cache_dir is None:
+        return solve_grid(origin, target, grid)
+
+    path = cache_dir / f"{_cache_key(origin, target, grid)}.npy"
+    if path.exists():
+        os.utime(path)                                   # mark as recently used
+        return np.load(path)
+
+    dv = solve_grid(origin, target, grid)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp.npy")
+    np.save(tmp, dv)
+    os.replace(tmp, path)
+    _evict(cache_dir, cache_entries)
+    return dv
+
+
+def best_windows(dv: np.ndarray, grid: Grid, limit: int = 3) -> list[tuple[float, float, float]]:
+    """
+    Minimum-Δv windows: local minima along departure of the best-over-TOF Δv,
+    cheapest first. Returns [(departure_day, tof_days, dv_kms), ...].
+    """
+    filled = np.where(np.isnan(dv), np.inf, dv)
+    best_tof = filled.argmin(axis=1)
+    best = filled[np.arange(len(filled)), best_tof]
+    if not np.isfinite(best).any():
+        return []
+    padded = np.r_[np.inf, best, np.inf]
+    minima = np.flatnonzero((best <= padded[:-2]) & (best < padded[2:]) & np.isfinite(best))
+    minima = minima[np.argsort(best[minima])][:limit]
+    dep, tof = grid.departures(), grid.tofs()
+    return [(float(dep[i]), float(tof[best_tof[i]]), float(best[i])) for i in minima]
+
+
+def hohmann_days(a1: float, a2: float) -> float:
+    """Half-ellipse transfer time between circular orbits of radius a1, a2 (AU)."""
+    return float(np.pi * np.sqrt(((a1 + a2) / 2) ** 3 / MU_SUN))
+
+
+def default_grid(origin: Elements, target: Elements, dep_start: int,
+                 dep_days: int = 800, dep_step: int = 4, tof_steps: int = 60) -> Grid:
+    """Departures over dep_days from dep_start; TOF 0.5–1.5 × the Hohmann time."""
+    hohmann = hohmann_days(origin.a, target.a)
+    logging.debug(f"Transfer grid: Hohmann {hohmann:.0f}d")
+    return Grid(dep_start, dep_days, dep_step,
+                round(0.5 * hohmann, 1), round(1.5 * hohmann, 1), tof_steps)
+
+
+# ---------------------------------------------------------------------------
+# Windows per hab-site body
+# ---------------------------------------------------------------------------
+
+def transfer_windows(game_date: datetime, bodies: dict[str, dict], targets: Iterable[str],
+                     cache_dir: Path | None = None, limit: int = WINDOWS) -> dict[str, dict]:
+    """
+    Minimum-Δv departures from Earth on or after game_date for every target
+    (TISpaceBodyTemplate records by dataName; targets are the hab-site bodies),
+    keyed by dataName (moons share their planet's grid):
+    {'display': name, 'windows': [(departure_day, tof_days, dv_kms), ...]},
+    cheapest first. Returns {} if the templates lack Earth's or every target's elements.
+    """
+    from src.preset.launch_windows import REFERENCE
+    origin = orbit_elements(bodies.get(EARTH, {}))
+    if origin is None:
+        return {}
+
+    today = (game_date - REFERENCE).days
+    dep_start = today - today % GRID_SNAP_DAYS
+    by_root: dict[str, list[tuple[float, float, float]]] = {}
+    results = {}
+    for name in targets:
+        root = heliocentric_root(name, bodies)
+        if root is None or root in (EARTH, SUN):
+            continue
+        if root not in by_root:
+            target = orbit_elements(bodies[root])
+            if target is None:
+                by_root[root] = []
+                continue
+            grid = default_grid(origin, target, dep_start)
+            windows = best_windows(porkchop(origin, target, grid, cache_dir), grid, limit=limit + 1)
+            future = [w for w in windows if w[0] >= today]                  # cheapest first
+            # Minima at twice the best Δv are grid-edge artefacts, not windows
+            by_root[root] = [w for w in future if w[2] <= 2 * future[0][2]][:limit]
+        if by_root[root]:
+            display = bodies[name].get('displayName') or bodies[name].get('friendlyName') or name
+            results[name] = {'display': display, 'windows': by_root[root]}
+    return results
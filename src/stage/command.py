@@ -3,285 +3,99 @@ Stage command - Parse savegame, evaluate tier, assemble actor context files
 
 The core domain logic command. Three phases in sequence:
 
-  1. PARSE   - load savegame DB (skipped if DB is current)
-  2. EVALUATE - calculate tier readiness from game state, write tier_state.json
+  1. PARSE   - load savegame DB
+  2. EVALUATE - calculate tier readiness from game state, write tier_state.json,
+                populate savegame_{date}.db and precompute report_{date}.json
   3. ASSEMBLE - combine resources/ + tier → campaigns/{faction}/{iso_date}/context_*.txt
 
+Each artifact is a node in the build graph (src/core/build_graph.py): only
+nodes whose inputs, parameters or upstream outputs changed are rebuilt.
+
+Several factions share one parse and one decoded GameState per date. A date
+range parses its saves in a process pool, then evaluates and populates the
+dates in order so each snapshot diffs against the one before it.
+
 Usage:
-  tias stage --date 2027-8-1
-  tias stage --date 2027-8-1 --force   # re-parse even if DB is current
+  tias stage --faction resist --date 2027-8-1
+  tias stage --faction resist --date 2027-8-1 --force     # rebuild every node
+  tias stage --faction resist --date 2027-8-1 --explain   # show why each node ran or was skipped
+  tias stage --faction resist,destroy --from 2027-1-1 --to 2027-12-31 -j 4
 """
 
 import json
 import logging
-import sqlite3
 import tomllib
 from datetime import datetime
 from pathlib import Path
 
 from src.core.core import load_env, get_project_root
 from src.core.date_utils import parse_flexible_date
-from src.perf.performance import timed_command
-
-# Stable Terra Invicta body keys (confirmed across saves)
-BODY_LUNA    = 6
-BODY_MARS    = 7
-BODY_JUPITER = 10   # >= this value = Jupiter system or beyond
-
-# Major power GDP threshold (stub - refine from game data when observed)
-MAJOR_POWER_GDP_THRESHOLD = 1_000_000_000_000  # 1 trillion
+from src.perf.performance import note, span, timed_command
 
 
 # ---------------------------------------------------------------------------
-# Phase 1: Parse-if-stale
+# Phase 1: Parse
 # ---------------------------------------------------------------------------
 
-def _db_is_stale(db_path: Path, saves_dir: Path, game_date) -> bool:
-    """Return True if savegame DB is missing or older than the .gz file."""
-    if not db_path.exists():
-        return True
-
-    game_format = f"{game_date.year}-{game_date.month}-{game_date.day}"
-    matches = list(saves_dir.glob(f"*_{game_format}.gz"))
-    if not matches:
-        return False  # can't find the source, don't re-parse
-
-    gz_mtime = matches[0].stat().st_mtime
-    db_mtime = db_path.stat().st_mtime
-    return gz_mtime > db_mtime
+def _find_source_gz(game_date) -> Path | None:
+    """Return the savegame .gz for game_date, or None if it cannot be found."""
+    from src.parse.command import find_savegame
 
+    env = load_env()
+    try:
+        return find_savegame(Path(env['GAME_SAVES_DIR']), game_date)
+    except FileNotFoundError:
+        return None
 
-def _ensure_db(project_root: Path, game_date, iso_date: str, force: bool) -> Path:
-    """Parse savegame into DB if missing, stale, or forced. Return db_path."""
-    from src.parse.command import parse_savegame, find_savegame
 
-    env = load_env()
-    saves_dir = Path(env['GAME_SAVES_DIR'])
-    db_path = project_root / "build" / f"savegame_{iso_date}.db"
-
-    if force or _db_is_stale(db_path, saves_dir, game_date):
-        logging.info("Parsing savegame...")
-        n_keys = parse_savegame(saves_dir, game_date, db_path)
-        db_size = db_path.stat().st_size / 1024 / 1024
-        logging.info(f"  Parsed: {db_path.name} ({db_size:.1f}MB, {n_keys} keys)")
-    else:
-        logging.info(f"Savegame DB current: {db_path.name}")
+def _parse_raw_db(source_gz: Path | None, game_date, db_path: Path) -> None:
+    """Parse the savegame into the raw DB (no-op if the source .gz is gone)."""
+    from src.parse.command import parse_savegame
 
-    return db_path
+    if source_gz is None:
+        logging.warning(f"Source savegame not found, keeping existing {db_path.name}")
+        return
+    logging.info("Parsing savegame...")
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    n_keys = parse_savegame(source_gz.parent, game_date, db_path)
+    db_size = db_path.stat().st_size / 1024 / 1024
+    logging.info(f"  Parsed: {db_path.name} ({db_size:.1f}MB, {n_keys} keys)")
 
 
 # ---------------------------------------------------------------------------
 # Phase 2: Tier evaluation
 # ---------------------------------------------------------------------------
 
-def _load_gs(db_path: Path, key: str):
-    """Load one gamestate array from the DB, parsed from JSON."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("SELECT data FROM gamestates WHERE key = ?", (key,))
-    row = cursor.fetchone()
-    conn.close()
-    return json.loads(row[0]) if row else []
-
-
-def _find_player_faction(db_path: Path) -> tuple[int, dict]:
-    """Return (faction_key, faction_value) for the human player."""
-    players = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TIPlayerState')
-    human = next((p for p in players if not p['Value']['isAI']), None)
-    if not human:
-        raise ValueError("No human player found in savegame")
-
-    faction_key = human['Value']['faction']['value']
-    factions = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TIFactionState')
-    pf = next((f['Value'] for f in factions if f['Key']['value'] == faction_key), None)
-    if not pf:
-        raise ValueError(f"Player faction {faction_key} not found in TIFactionState")
-
-    return faction_key, pf
-
-
-def _build_hab_body_map(db_path: Path) -> dict:
-    """Return {hab_key: body_display_name} for all habs that have a site."""
-    sites = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TIHabSiteState')
-    bodies = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TISpaceBodyState')
-
-    body_name = {b['Key']['value']: b['Value'].get('displayName', '') for b in bodies}
-    site_body = {s['Key']['value']: body_name.get(s['Value'].get('parentBody', {}).get('value'))
-                 for s in sites}
-
-    habs = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TIHabState')
-    hab_body = {}
-    for h in habs:
-        site_key = h['Value'].get('habSite', {})
-        if site_key:
-            site_key = site_key.get('value')
-        hab_body[h['Key']['value']] = site_body.get(site_key, '')
-
-    return hab_body
-
-
-def evaluate_tier(db_path: Path, campaigns_dir: Path, iso_date: str = '') -> dict:
+def evaluate_tier(db_path: Path, campaigns_dir: Path, iso_date: str = '',
+                  gamestate=None, faction: str | None = None) -> dict:
     """
     Evaluate tier readiness from savegame DB.
+    Conditions are the declared rules in src/stage/tier_rules.py, evaluated
+    in one pass over shared facts.
+    gamestate is a shared GameState for db_path (one is created if omitted);
+    its space body templates give body zones, known planet names without
+    them. faction is a slug, the human player if None (or not in the save,
+    if gamestate allows the fallback).
     Writes tier_state.json to campaigns_dir.
     Returns the state dict.
     """
-    faction_key, pf = _find_player_faction(db_path)
-    hab_body = _build_hab_body_map(db_path)
-
-    # --- Player habs ---
-    all_habs = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TIHabState')
-    player_habs = [h for h in all_habs
-                   if h['Value'].get('faction', {}).get('value') == faction_key]
-
-    # --- Player councilors on habs ---
-    councilor_keys = {c['value'] for c in pf.get('councilors', [])}
-    all_councilors = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TICouncilorState')
-    player_councilors = [c for c in all_councilors
-                         if c['Key']['value'] in councilor_keys]
-    councilors_on_habs = {
-        c['Value']['location']['value']
-        for c in player_councilors
-        if 'TIHabState' in c['Value'].get('location', {}).get('$type', '')
-    }
+    from src.db.gamestate import GameState
+    from src.stage.tier_rules import TIER_NEEDED, Facts, evaluate
 
-    # --- Player fleets ---
-    fleet_keys = {f['value'] for f in pf.get('fleets', [])}
-    all_fleets = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TISpaceFleetState')
-    player_fleets = [f for f in all_fleets if f['Key']['value'] in fleet_keys]
-
-    # --- Player nations (via control points) ---
-    cp_keys = {cp['value'] for cp in pf.get('controlPoints', [])}
-    all_cps = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TIControlPoint')
-    player_nation_keys = {
-        cp['Value']['nation']['value']
-        for cp in all_cps
-        if cp['Key']['value'] in cp_keys
-    }
-
-    # --- Nation and federation data ---
-    all_nations = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TINationState')
-    nation_map = {n['Key']['value']: n['Value'] for n in all_nations}
+    gamestate = gamestate or GameState(db_path)
+    facts = Facts(gamestate.load, gamestate.space_bodies, lambda: gamestate.faction(faction))
+    results = evaluate(facts)
 
-    all_feds = _load_gs(db_path, 'PavonisInteractive.TerraInvicta.TIFederationState')
-    fed_map = {f['Key']['value']: f['Value'] for f in all_feds}
-
-    # -----------------------------------------------------------------------
-    # Evaluate Tier 2 conditions
-    # -----------------------------------------------------------------------
-
-    # C1: Operative on Luna or Mars mine (Base hab on Luna/Mars with councilor aboard)
-    luna_mars_mines = {
-        h['Key']['value'] for h in player_habs
-        if h['Value'].get('habType') == 'Base'
-        and hab_body.get(h['Key']['value']) in ('Luna', 'Mars')
-    }
-    c1_luna_mars_mine = bool(councilors_on_habs & luna_mars_mines)
-
-    # C2: Operative on Earth shipyard (councilor on LEO station with shipyard module)
-    # TODO: confirm shipyard module templateName when one is built in-game
-    # For now: councilor on any player-owned Earth LEO station
-    earth_leo_stations = {
-        h['Key']['value'] for h in player_habs
-        if h['Value'].get('habType') == 'Station'
-        and h['Value'].get('inEarthLEO')
-    }
-    c2_earth_shipyard = bool(councilors_on_habs & earth_leo_stations)
-
-    # C3: 10+ MC capacity
-    mc_capacity = pf.get('baseIncomes_year', {}).get('MissionControl', 0)
-    c3_mc_10 = mc_capacity >= 10
-
-    # C4: Control 3+ space stations
-    stations = [h for h in player_habs if h['Value'].get('habType') == 'Station']
-    c4_stations_3 = len(stations) >= 3
-
-    # C5: Member of 3+ nation federation
-    c5_federation_3 = False
-    for nk in player_nation_keys:
-        nation = nation_map.get(nk, {})
-        if nation.get('aggregateNation'):
-            continue  # skip federation-as-nation entries
-        fed_ref = nation.get('federation')
-        if fed_ref:
-            fed_key = fed_ref.get('value') if isinstance(fed_ref, dict) else fed_ref
-            fed = fed_map.get(fed_key, {})
-            if len(fed.get('members', [])) >= 3:
-                c5_federation_3 = True
-                break
-
-    tier2_conditions = {
-        'luna_mars_mine':   c1_luna_mars_mine,
-        'earth_shipyard':   c2_earth_shipyard,
-        'mc_10plus':        c3_mc_10,
-        'stations_3plus':   c4_stations_3,
-        'federation_3plus': c5_federation_3,
-    }
-    tier2_met = sum(tier2_conditions.values())
-    tier2_needed = 2
-    tier2_unlocked = tier2_met >= tier2_needed
-
-    # -----------------------------------------------------------------------
-    # Evaluate Tier 3 conditions
-    # -----------------------------------------------------------------------
-
-    # D1: Control orbital ring or space elevator
-    # TODO: confirm habType/module name — not observed in early save
-    d1_orbital_ring = False  # stub
-
-    # D2: Fleet in Jupiter system or beyond
-    d2_jupiter_fleet = any(
-        (f['Value'].get('barycenter') or {}).get('value', 0) >= BODY_JUPITER
-        for f in player_fleets
-    )
-
-    # D3: 25+ MC capacity
-    d3_mc_25 = mc_capacity >= 25
-
-    # D4: Control 10+ habs
-    d4_habs_10 = len(player_habs) >= 10
-
-    # D5: Federation of 5+ major powers
-    # Major power stub: GDP > threshold
-    d5_major_fed = False
-    for nk in player_nation_keys:
-        nation = nation_map.get(nk, {})
-        if nation.get('aggregateNation'):
-            continue
-        fed_ref = nation.get('federation')
-        if fed_ref:
-            fed_key = fed_ref.get('value') if isinstance(fed_ref, dict) else fed_ref
-            fed = fed_map.get(fed_key, {})
-            major_members = sum(
-                1 for mk in (m['value'] for m in fed.get('members', []))
-                if nation_map.get(mk, {}).get('GDP', 0) >= MAJOR_POWER_GDP_THRESHOLD
-                and not nation_map.get(mk, {}).get('aggregateNation')
-            )
-            if major_members >= 5:
-                d5_major_fed = True
-                break
-
-    # D6: Councilor mission success rate >80% (stub - mission history not yet parsed)
-    d6_mission_success = False  # stub
-
-    tier3_conditions = {
-        'orbital_ring':     d1_orbital_ring,
-        'jupiter_fleet':    d2_jupiter_fleet,
-        'mc_25plus':        d3_mc_25,
-        'habs_10plus':      d4_habs_10,
-        'major_federation': d5_major_fed,
-        'mission_success':  d6_mission_success,
-    }
-    tier3_met = sum(tier3_conditions.values())
-    tier3_needed = 3
-    tier3_unlocked = tier3_met >= tier3_needed
+    conditions = {tier: {r.name: r.met for r in results if r.tier == tier} for tier in TIER_NEEDED}
+    met = {tier: sum(conds.values()) for tier, conds in conditions.items()}
+    unlocked = {tier: met[tier] >= TIER_NEEDED[tier] for tier in TIER_NEEDED}
 
     # -----------------------------------------------------------------------
     # Determine current tier
     # -----------------------------------------------------------------------
-    if tier3_unlocked:
+    if unlocked[3]:
         current_tier = 3
-    elif tier2_unlocked:
+    elif unlocked[2]:
         current_tier = 2
     else:
         current_tier = 1
@@ -290,26 +104,29 @@ def evaluate_tier(db_path: Path, campaigns_dir: Path, iso_date: str = '') -> dic
     if current_tier == 3:
         readiness = 1.0
     elif current_tier == 2:
-        readiness = 0.6 + 0.1 * (tier3_met / tier3_needed)
+        readiness = 0.6 + 0.1 * (met[3] / TIER_NEEDED[3])
     else:
-        readiness = 0.0 + 0.6 * (tier2_met / tier2_needed)
+        readiness = 0.0 + 0.6 * (met[2] / TIER_NEEDED[2])
 
     state = {
         'date': datetime.now().strftime('%Y-%m-%d'),
         'current_tier': current_tier,
         'readiness': round(readiness, 3),
-        'mc_capacity': mc_capacity,
-        'hab_count': len(player_habs),
-        'station_count': len(stations),
-        'tier2_conditions': tier2_conditions,
-        'tier2_met': tier2_met,
-        'tier2_needed': tier2_needed,
-        'tier2_unlocked': tier2_unlocked,
-        'tier3_conditions': tier3_conditions,
-        'tier3_met': tier3_met,
-        'tier3_needed': tier3_needed,
-        'tier3_unlocked': tier3_unlocked,
-        'stubs': ['earth_shipyard', 'orbital_ring', 'mission_success'],
+        'mc_capacity': facts.mc_capacity,
+        'hab_count': len(facts.player_habs),
+        'station_count': len(facts.habs_by_type.get('Station', ())),
+        'tier2_conditions': conditions[2],
+        'tier2_met': met[2],
+        'tier2_needed': TIER_NEEDED[2],
+        'tier2_unlocked': unlocked[2],
+        'tier3_conditions': conditions[3],
+        'tier3_met': met[3],
+        'tier3_needed': TIER_NEEDED[3],
+        'tier3_unlocked': unlocked[3],
+        'stubs': [r.name for r in results if r.stub],
+        'rules': {r.name: {'tier': r.tier, 'met': r.met, 'detail': r.detail, 'ms': r.ms}
+                  for r in results},
+        'facts_ms': {name: round(ms, 3) for name, ms in facts.timings.items()},
     }
 
     filename = f'tier_state_{iso_date}.json' if iso_date else 'tier_state.json'
@@ -319,8 +136,10 @@ def evaluate_tier(db_path: Path, campaigns_dir: Path, iso_date: str = '') -> dic
 
     logging.info(f"Tier evaluated: {current_tier} "
                  f"(readiness {readiness:.0%}, "
-                 f"T2: {tier2_met}/{tier2_needed}, "
-                 f"T3: {tier3_met}/{tier3_needed})")
+                 f"T2: {met[2]}/{TIER_NEEDED[2]}, "
+                 f"T3: {met[3]}/{TIER_NEEDED[3]})")
+    for r in results:
+        logging.debug(f"  rule {r.name:<18} {'met' if r.met else '---':<4} {r.ms:7.3f}ms  {r.detail}")
 
     return state
 
@@ -474,59 +293,205 @@ def assemble_contexts(resources_dir: Path, campaigns_dir: Path, tier: int):
     return assembled
 
 
+def _context_outputs(resources_dir: Path, campaigns_dir: Path) -> list[Path]:
+    """Context files assemble_contexts will write for the current resources/."""
+    prompts_dir = resources_dir / "prompts"
+    outputs = []
+    if (prompts_dir / "system.txt").exists():
+        outputs.append(campaigns_dir / "context_system.txt")
+    if (prompts_dir / "codex_eval.txt").exists():
+        outputs.append(campaigns_dir / "context_codex.txt")
+    for actor_dir in sorted((resources_dir / "actors").iterdir()):
+        if actor_dir.is_dir() and not actor_dir.name.startswith('_') and (actor_dir / "spec.toml").exists():
+            outputs.append(campaigns_dir / f"context_{actor_dir.name}.txt")
+    return outputs
+
+
+def _previous_snapshot(output_dir: Path, iso_date: str) -> Path | None:
+    """Latest savegame_{date}.db in output_dir dated before iso_date, if any."""
+    earlier = [p for p in output_dir.glob("savegame_*.db")
+               if p.stem.removeprefix("savegame_") < iso_date]
+    return max(earlier, key=lambda p: p.stem, default=None)
+
+
 # ---------------------------------------------------------------------------
-# Command entry point
+# Build graph
 # ---------------------------------------------------------------------------
 
-@timed_command
-def cmd_stage(args):
-    """Parse savegame, evaluate tier, assemble actor context files"""
-    project_root = get_project_root()
-    resources_dir = project_root / "resources"
-    
-    game_date, iso_date = parse_flexible_date(args.date)
-    faction = args.faction
-    force = getattr(args, 'force', False)
+def _raw_node(build_dir: Path, game_date, iso_date: str):
+    """Node parsing the savegame for iso_date into build/savegame_{iso_date}.db."""
+    from src.core.build_graph import Node
+
+    raw_db    = build_dir / f"savegame_{iso_date}.db"
+    source_gz = _find_source_gz(game_date)
+    if source_gz is None and not raw_db.exists():
+        raise FileNotFoundError(f"No savegame found for {iso_date} and no parsed DB in build/")
+    if source_gz is not None:
+        note(save_bytes=source_gz.stat().st_size)
+    return Node(
+        f"raw_db[{iso_date}]",
+        action=lambda: _parse_raw_db(source_gz, game_date, raw_db),
+        inputs=[source_gz] if source_gz else [],
+        outputs=[raw_db],
+    )
 
-    # Output directory: campaigns/{faction}/ (flat — no date subdirectory)
-    output_dir = project_root / "campaigns" / faction
-    output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Phase 1: Parse
-    db_path = _ensure_db(project_root, game_date, iso_date, force)
+def build_stage_graph(project_root: Path, factions: list[str], game_date, iso_date: str,
+                      contexts: bool = True):
+    """
+    Declare the stage artifacts as build nodes, for every faction:
 
-    # Phase 2: Evaluate
-    state = evaluate_tier(db_path, output_dir, iso_date)
-    tier = state['current_tier']
+      raw_db ─┬─ tier_state[f] ── contexts[f]
+              └─ savegame_db[f] ── report[f]
 
-    # Phase 2b: Populate savegame.db
+    The save is parsed once; all factions read one shared GameState, so each
+    gamestate array is decoded once per date. contexts=False leaves out the
+    (flat, per-faction) context files, for dates other than the latest.
+    Source modules are inputs too, so editing a renderer invalidates its output.
+    """
+    import src.db.body_index as body_index_mod
+    import src.db.gamestate as gamestate_mod
+    import src.db.populate as populate_mod
+    import src.db.query as query_mod
+    import src.db.research_bits as research_bits_mod
+    import src.db.report_artifact as report_mod
+    import src.db.schema as schema_mod
+    import src.preset.transfers as transfers_mod
+    import src.stage.tier_rules as tier_rules_mod
+    from src.core.build_graph import BuildGraph, Node
+    from src.db.gamestate import GameState
     from src.db.populate import populate_savegame_db
-    from src.preset.command import (
-        _load_gs as preset_load_gs,
-        _player_faction, _faction_name_map, _nation_map, _hab_body_map
-    )
-    helpers = {
-        'load_gs':         preset_load_gs,
-        'player_faction':  _player_faction,
-        'faction_name_map': _faction_name_map,
-        'nation_map':      _nation_map,
-        'hab_body_map':    _hab_body_map,
-    }
-    savegame_db = output_dir / f"savegame_{iso_date}.db"
-    templates_dir  = project_root / 'build' / 'templates'
-    templates_file = templates_dir / 'TISpaceBodyTemplate.json'
-    populate_savegame_db(db_path, savegame_db, faction, iso_date, helpers,
-                         game_date=game_date, templates_file=templates_file,
-                         templates_dir=templates_dir)
+    from src.db.report_artifact import artifact_path, write_report_artifact
+
+    resources_dir = project_root / "resources"
+    build_dir     = project_root / "build"
+    templates_dir = build_dir / "templates"
+    bodies_file   = templates_dir / 'TISpaceBodyTemplate.json'
+    raw_db        = build_dir / f"savegame_{iso_date}.db"
+
+    graph = BuildGraph(build_dir / "build_manifest.json", project_root)
+    raw = graph.add(_raw_node(build_dir, game_date, iso_date))
+    # Several factions must each be in the save; one falls back to the human player
+    gamestate = GameState(raw_db, player_fallback=len(factions) == 1)
+
+    for faction in factions:
+        output_dir  = project_root / "campaigns" / faction
+        tier_file   = output_dir / f"tier_state_{iso_date}.json"
+        savegame_db = output_dir / f"savegame_{iso_date}.db"
+        report_file = artifact_path(output_dir, iso_date)
+        previous_db = _previous_snapshot(output_dir, iso_date)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Default arguments bind this iteration's values
+        tier = graph.add(Node(
+            f"tier_state[{faction}/{iso_date}]",
+            action=lambda faction=faction, output_dir=output_dir: evaluate_tier(
+                raw_db, output_dir, iso_date, gamestate=gamestate, faction=faction),
+            inputs=[Path(__file__), Path(tier_rules_mod.__file__), Path(body_index_mod.__file__),
+                    Path(gamestate_mod.__file__), build_dir / 'game_templates.db'],
+            outputs=[tier_file],
+            deps=[raw.name],
+            params={'faction': faction},
+        ))
+        populated = graph.add(Node(
+            f"savegame_db[{faction}/{iso_date}]",
+            action=lambda faction=faction, savegame_db=savegame_db, previous_db=previous_db: populate_savegame_db(
+                raw_db, savegame_db, faction, iso_date, gamestate.helpers(faction),
+                game_date=game_date,
+                templates_file=bodies_file,
+                templates_dir=templates_dir,
+                previous_db=previous_db),
+            inputs=[build_dir / 'game_templates.db', build_dir / 'launch_calendar.npy', bodies_file,
+                    Path(populate_mod.__file__), Path(schema_mod.__file__), Path(research_bits_mod.__file__),
+                    Path(transfers_mod.__file__), Path(body_index_mod.__file__), Path(gamestate_mod.__file__)]
+                   + ([previous_db] if previous_db else []),
+            outputs=[savegame_db],
+            deps=[raw.name],
+            params={'faction': faction, 'date': iso_date,
+                    'previous': previous_db.name if previous_db else None},
+        ))
+        graph.add(Node(
+            f"report[{faction}/{iso_date}]",
+            action=lambda savegame_db=savegame_db, report_file=report_file: write_report_artifact(
+                savegame_db, report_file),
+            inputs=[Path(query_mod.__file__), Path(report_mod.__file__)],
+            outputs=[report_file],
+            deps=[populated.name],
+        ))
+        if not contexts:
+            continue
+        # Context files are flat per faction: the last staged date's tier wins,
+        # so a different upstream tier_state node name is itself a change.
+        graph.add(Node(
+            f"contexts[{faction}]",
+            action=lambda output_dir=output_dir, tier_file=tier_file: assemble_contexts(
+                resources_dir, output_dir,
+                json.loads(tier_file.read_text(encoding='utf-8'))['current_tier']),
+            inputs=[resources_dir / "actors", resources_dir / "prompts", Path(__file__)],
+            outputs=_context_outputs(resources_dir, output_dir),
+            deps=[tier.name],
+        ))
+    return graph
 
-    # Phase 3: Assemble
-    assembled = assemble_contexts(resources_dir, output_dir, tier)
 
-    # Summary
+# ---------------------------------------------------------------------------
+# Date ranges
+# ---------------------------------------------------------------------------
+
+def stage_dates(project_root: Path, start, end) -> list[tuple[datetime, str]]:
+    """(game_date, iso_date) for every savegame or parsed raw DB dated start..end, in order."""
+    from src.parse.command import find_savegames
+
+    dates = {}
+    saves_dir = load_env().get('GAME_SAVES_DIR')
+    if saves_dir:
+        dates.update(find_savegames(Path(saves_dir), start, end))
+    for db in (project_root / "build").glob("savegame_*.db"):
+        try:
+            game_date = datetime.strptime(db.stem.removeprefix("savegame_"), '%Y-%m-%d')
+        except ValueError:
+            continue
+        if start <= game_date <= end:
+            dates.setdefault(game_date, db)
+    return [(d, d.strftime('%Y-%m-%d')) for d in sorted(dates)]
+
+
+def _stage_raw(project_root: Path, game_date, iso_date: str, force: bool):
+    """
+    Worker: bring one date's raw DB up to date. Returns the raw node's
+    NodeResult; the parent saves its manifest record (workers finishing
+    together would otherwise overwrite each other's manifest).
+    """
+    from src.core.build_graph import BuildGraph
+
+    build_dir = project_root / "build"
+    graph = BuildGraph(build_dir / "build_manifest.json", project_root)
+    node = graph.add(_raw_node(build_dir, game_date, iso_date))
+    return graph.run(force=force, save=False)[node.name]
+
+
+def format_summary(states: dict[str, dict[str, dict]], factions: list[str]) -> str:
+    """Table of tier, readiness and T2/T3 conditions met per date (rows) and faction (columns)."""
+    width = max(14, *(len(f) for f in factions))
+    lines = [f"     {'Date':<10}  " + "  ".join(f"{f:<{width}}" for f in factions)]
+    for iso_date, by_faction in states.items():
+        cells = []
+        for f in factions:
+            st = by_faction.get(f)
+            cell = (f"T{st['current_tier']} {st['readiness']:>4.0%} "
+                    f"{st['tier2_met']}/{st['tier2_needed']} {st['tier3_met']}/{st['tier3_needed']}"
+                    if st else '—')
+            cells.append(f"{cell:<{width}}")
+        lines.append(f"     {iso_date:<10}  " + "  ".join(cells))
+    return "\n".join(lines)
+
+
+def _print_state(state: dict, assembled: list[str]) -> None:
+    """Detailed single-faction, single-date summary."""
     t2 = state['tier2_conditions']
     t3 = state['tier3_conditions']
     print(f"\n[OK] Stage complete")
-    print(f"     Tier {tier}  (readiness {state['readiness']:.0%})")
+    print(f"     Tier {state['current_tier']}  (readiness {state['readiness']:.0%})")
     print(f"     T2 conditions: {state['tier2_met']}/{state['tier2_needed']}  "
           f"[mine={'✓' if t2['luna_mars_mine'] else '·'}  "
           f"shipyard={'✓' if t2['earth_shipyard'] else '·'}  "
@@ -541,3 +506,111 @@ def cmd_stage(args):
           f"majfed={'✓' if t3['major_federation'] else '·'}  "
           f"missions={'✓' if t3['mission_success'] else '·'}]")
     print(f"     Actors: {', '.join(assembled)}")
+
+
+# ---------------------------------------------------------------------------
+# Command entry point
+# ---------------------------------------------------------------------------
+
+@timed_command
+def cmd_stage(args):
+    """Parse savegame(s), evaluate tier, assemble actor context files for one or more factions"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from src.core.build_graph import explain
+
+    project_root = get_project_root()
+    force = getattr(args, 'force', False)
+    factions = list(dict.fromkeys(f.strip() for f in args.faction.split(',') if f.strip()))
+    if not factions:
+        logging.error("--faction needs at least one faction slug")
+        return 1
+    if len(factions) > 1:
+        from src.db.gamestate import FACTIONS, faction_slug
+        unknown = [f for f in factions if faction_slug(f) is None]
+        if unknown:
+            logging.error(f"Unknown faction slug(s): {', '.join(unknown)} (known: {', '.join(FACTIONS)})")
+            return 1
+
+    try:
+        if getattr(args, 'date', None):
+            dates = [parse_flexible_date(args.date)]
+        else:
+            if not (getattr(args, 'date_from', None) and getattr(args, 'date_to', None)):
+                logging.error("Give --date, or both --from and --to")
+                return 1
+            start, _ = parse_flexible_date(args.date_from)
+            end, _ = parse_flexible_date(args.date_to)
+            dates = stage_dates(project_root, start, end)
+    except ValueError as e:
+        logging.error(str(e))
+        return 1
+    if not dates:
+        logging.error(f"No savegames or parsed DBs dated {args.date_from} .. {args.date_to}")
+        return 1
+
+    from src.db.populate import require_templates
+    try:
+        require_templates(project_root / "build" / "game_templates.db")
+    except FileNotFoundError as e:
+        logging.error(str(e))
+        return 1
+
+    # Phase 1: parse every date's save in a worker pool (one save per process)
+    parsed = {}
+    workers = getattr(args, 'jobs', None)
+    if len(dates) > 1 and workers != 1:
+        from src.core.build_graph import BuildGraph
+        logging.info(f"Parsing {len(dates)} savegames...")
+        with span('parse'), ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [pool.submit(_stage_raw, project_root, d, iso, force) for d, iso in dates]
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        parsed = {r.name: r for r in (f.result() for f in futures if f.exception() is None)}
+        # One manifest write for every date parsed, including those that
+        # finished before another date failed
+        BuildGraph(project_root / "build" / "build_manifest.json", project_root).save(parsed.values())
+        if errors:
+            if isinstance(errors[0], FileNotFoundError):
+                logging.error(str(errors[0]))
+                return 1
+            raise errors[0]
+
+    # Phase 2: evaluate / populate / report, in date order so each snapshot
+    # diffs against the previous date's. Context files only for the last date.
+    states: dict[str, dict[str, dict]] = {}
+    graph = None
+    for i, (game_date, iso_date) in enumerate(dates):
+        try:
+            graph = build_stage_graph(project_root, factions, game_date, iso_date,
+                                      contexts=i == len(dates) - 1)
+        except FileNotFoundError as e:
+            logging.error(str(e))
+            return 1
+        only = set(graph.nodes) - set(parsed) if parsed else None
+        try:
+            results = graph.run(force=force, only=only)
+        except ValueError as e:
+            logging.error(str(e))
+            return 1
+        if getattr(args, 'explain', False):
+            print(explain({**{k: v for k, v in parsed.items() if k in graph.nodes}, **results}))
+        states[iso_date] = {
+            f: json.loads((project_root / "campaigns" / f / f"tier_state_{iso_date}.json").read_text(encoding='utf-8'))
+            for f in factions
+        }
+
+    if len(factions) == 1 and len(dates) == 1:
+        faction, iso_date = factions[0], dates[0][1]
+        state = states[iso_date][faction]
+        assembled = [p.stem.removeprefix('context_') for p in graph.nodes[f"contexts[{faction}]"].outputs
+                     if p.stem not in ('context_system', 'context_codex')]
+        _print_state(state, assembled)
+        if getattr(args, 'explain', False) and state.get('rules'):
+            print("\n     Tier rules:")
+            for name, r in state['rules'].items():
+                print(f"       T{r['tier']} {'✓' if r['met'] else '·'} {name:<18} {r['ms']:7.3f}ms  {r['detail']}")
+        return
+
+    print(f"\n[OK] Stage complete: {len(factions)} factions × {len(dates)} dates")
+    print(format_summary(states, factions))
+    print(f"     (tier, readiness, T2 met, T3 met; contexts assembled for {dates[-1][1]})")
@@ -0,0 +1,289 @@
+"""
+Terra Invicta Advisory System - Tier Rule Engine
+
+Tier conditions are declared as rules: a predicate over shared gamestate
+facts that returns (met, detail). Facts are computed on first use and
+memoized, so every gamestate array is loaded and scanned at most once no
+matter how many rules read it. evaluate() runs all rules in a single pass
+and records per-rule timing and explanation.
+
+    facts    Facts(load, space_bodies, faction)   load(key) -> gamestate array
+    rules    @rule(name, tier)        declared in RULES, report order
+             stub=True                approximate check, listed in tier_state['stubs'];
+                                      its result still counts toward the tier
+    tiers    TIER_NEEDED              conditions met to unlock each tier
+
+Usage:
+    from src.stage.tier_rules import Facts, evaluate
+    results = evaluate(Facts(GameState(db_path).load))
+    results[0]   # RuleResult(name='luna_mars_mine', tier=2, met=False, detail='0/1 ...', ms=0.4, stub=False)
+"""
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable
+
+from src.db.body_index import OUTER_ZONES, SpaceBodies, build_body_index
+
+# Major power GDP threshold (stub - refine from game data when observed)
+MAJOR_POWER_GDP_THRESHOLD = 1_000_000_000_000  # 1 trillion
+
+TIER_NEEDED = {2: 2, 3: 3}
+
+GS = 'PavonisInteractive.TerraInvicta.'
+
+
+# ---------------------------------------------------------------------------
+# Facts
+# ---------------------------------------------------------------------------
+
+def fact(fn):
+    """Memoized Facts property; first computation is timed into Facts.timings."""
+    name = fn.__name__
+
+    def get(self):
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        start = time.perf_counter()
+        value = self._values[name] = fn(self)
+        self.timings[name] = (time.perf_counter() - start) * 1000
+        return value
+
+    return property(get, doc=fn.__doc__)
+
+
+class Facts:
+    """Indexed gamestate facts shared by all rules. Each array is loaded once."""
+
+    def __init__(self, load: Callable[[str], list], space_bodies: Callable[[], SpaceBodies] | None = None,
+                 faction: Callable[[], tuple[int, dict]] | None = None):
+        self._load = load
+        self._space_bodies = space_bodies          # body templates, for zones; planet names if None
+        self._faction = faction                    # evaluated faction; the human player if None
+        self._arrays: dict[str, list] = {}
+        self._values: dict[str, object] = {}
+        self.timings: dict[str, float] = {}   # fact name -> ms (inclusive of facts it reads)
+
+    def gs(self, name: str) -> list:
+        """Gamestate array {GS}{name} (e.g. 'TIHabState'), loaded once."""
+        if name not in self._arrays:
+            self._arrays[name] = self._load(f"{GS}{name}")
+        return self._arrays[name]
+
+    @fact
+    def player(self) -> tuple[int, dict]:
+        """(faction_key, faction_value) of the evaluated faction (default: the human player)."""
+        if self._faction is not None:
+            return self._faction()
+        human = next((p for p in self.gs('TIPlayerState') if not p['Value']['isAI']), None)
+        if not human:
+            raise ValueError("No human player found in savegame")
+        faction_key = human['Value']['faction']['value']
+        pf = next((f['Value'] for f in self.gs('TIFactionState') if f['Key']['value'] == faction_key), None)
+        if not pf:
+            raise ValueError(f"Player faction {faction_key} not found in TIFactionState")
+        return faction_key, pf
+
+    @fact
+    def mc_capacity(self) -> float:
+        return self.player[1].get('baseIncomes_year', {}).get('MissionControl', 0)
+
+    @fact
+    def player_habs(self) -> dict[int, dict]:
+        """{hab_key: value} for player-owned habs."""
+        faction_key = self.player[0]
+        return {h['Key']['value']: h['Value'] for h in self.gs('TIHabState')
+                if h['Value'].get('faction', {}).get('value') == faction_key}
+
+    @fact
+    def habs_by_type(self) -> dict[str, set[int]]:
+        """{habType: player hab keys}."""
+        index = defaultdict(set)
+        for key, hab in self.player_habs.items():
+            index[hab.get('habType')].add(key)
+        return index
+
+    @fact
+    def hab_body(self) -> dict[int, str]:
+        """{player hab_key: body display name} for habs on a site."""
+        body_name = {b['Key']['value']: b['Value'].get('displayName', '') for b in self.gs('TISpaceBodyState')}
+        site_body = {s['Key']['value']: body_name.get(s['Value'].get('parentBody', {}).get('value'))
+                     for s in self.gs('TIHabSiteState')}
+        return {key: site_body.get((hab.get('habSite') or {}).get('value'), '')
+                for key, hab in self.player_habs.items()}
+
+    @fact
+    def body_index(self):
+        """Body hierarchy with zones (src/db/body_index.py)."""
+        axes = self._space_bodies().axes if self._space_bodies is not None else None
+        return build_body_index(self.gs('TISpaceBodyState'), axes)
+
+    @fact
+    def councilors_on_habs(self) -> set[int]:
+        """Hab keys with a player councilor aboard."""
+        councilor_keys = {c['value'] for c in self.player[1].get('councilors', [])}
+        return {
+            c['Value']['location']['value']
+            for c in self.gs('TICouncilorState')
+            if c['Key']['value'] in councilor_keys
+            and 'TIHabState' in c['Value'].get('location', {}).get('$type', '')
+        }
+
+    @fact
+    def player_fleets(self) -> list[dict]:
+        fleet_keys = {f['value'] for f in self.player[1].get('fleets', [])}
+        return [f['Value'] for f in self.gs('TISpaceFleetState') if f['Key']['value'] in fleet_keys]
+
+    @fact
+    def nations(self) -> dict[int, dict]:
+        return {n['Key']['value']: n['Value'] for n in self.gs('TINationState')}
+
+    @fact
+    def player_federations(self) -> dict[int, dict]:
+        """{federation_key: value} for federations any player-controlled nation belongs to."""
+        cp_keys = {cp['value'] for cp in self.player[1].get('controlPoints', [])}
+        nation_keys = {cp['Value']['nation']['value'] for cp in self.gs('TIControlPoint')
+                       if cp['Key']['value'] in cp_keys}
+        feds = {f['Key']['value']: f['Value'] for f in self.gs('TIFederationState')}
+        result = {}
+        for nk in nation_keys:
+            nation = self.nations.get(nk, {})
+            if nation.get('aggregateNation'):
+                continue  # skip federation-as-nation entries
+            ref = nation.get('federation')
+            key = ref.get('value') if isinstance(ref, dict) else ref
+            if key and key in feds:
+                result[key] = feds[key]
+        return result
+
+    @fact
+    def major_powers(self) -> set[int]:
+        """Nation keys at or above MAJOR_POWER_GDP_THRESHOLD (federations excluded)."""
+        return {k for k, n in self.nations.items()
+                if n.get('GDP', 0) >= MAJOR_POWER_GDP_THRESHOLD and not n.get('aggregateNation')}
+
+
+# ---------------------------------------------------------------------------
+# Rules
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    tier: int
+    check: Callable[[Facts], tuple[bool, str]]
+    stub: bool = False
+
+
+@dataclass(frozen=True)
+class RuleResult:
+    name: str
+    tier: int
+    met: bool
+    detail: str
+    ms: float
+    stub: bool
+
+
+RULES: list[Rule] = []
+
+
+def rule(name: str, tier: int, stub: bool = False):
+    """Declare fn(facts) -> (met, detail) as a tier condition; stub only labels it."""
+    def register(fn):
+        RULES.append(Rule(name, tier, fn, stub))
+        return fn
+    return register
+
+
+# --- Tier 2 ---
+
+@rule('luna_mars_mine', tier=2)
+def _luna_mars_mine(f: Facts):
+    """Base hab on Luna or Mars with a player councilor aboard."""
+    mines = {k for k in f.habs_by_type.get('Base', ()) if f.hab_body.get(k) in ('Luna', 'Mars')}
+    crewed = f.councilors_on_habs & mines
+    return bool(crewed), f"{len(crewed)}/{len(mines)} Luna/Mars bases with a councilor aboard"
+
+
+@rule('earth_shipyard', tier=2, stub=True)
+def _earth_shipyard(f: Facts):
+    """Councilor on a player-owned Earth LEO station."""
+    # TODO: confirm shipyard module templateName when one is built in-game
+    leo = {k for k in f.habs_by_type.get('Station', ()) if f.player_habs[k].get('inEarthLEO')}
+    crewed = f.councilors_on_habs & leo
+    return bool(crewed), f"{len(crewed)}/{len(leo)} LEO stations with a councilor aboard (shipyard not checked)"
+
+
+@rule('mc_10plus', tier=2)
+def _mc_10plus(f: Facts):
+    return f.mc_capacity >= 10, f"MC capacity {f.mc_capacity}/10"
+
+
+@rule('stations_3plus', tier=2)
+def _stations_3plus(f: Facts):
+    n = len(f.habs_by_type.get('Station', ()))
+    return n >= 3, f"{n}/3 stations"
+
+
+@rule('federation_3plus', tier=2)
+def _federation_3plus(f: Facts):
+    largest = max((len(fed.get('members', [])) for fed in f.player_federations.values()), default=0)
+    return largest >= 3, f"largest federation has {largest}/3 members"
+
+
+# --- Tier 3 ---
+
+@rule('orbital_ring', tier=3, stub=True)
+def _orbital_ring(f: Facts):
+    # TODO: confirm habType/module name — not observed in early save
+    return False, "not yet detectable"
+
+
+@rule('jupiter_fleet', tier=3)
+def _jupiter_fleet(f: Facts):
+    far = [fl for fl in f.player_fleets
+           if f.body_index.zone((fl.get('barycenter') or {}).get('value')) in OUTER_ZONES]
+    return bool(far), f"{len(far)} fleets in the Jupiter system or beyond"
+
+
+@rule('mc_25plus', tier=3)
+def _mc_25plus(f: Facts):
+    return f.mc_capacity >= 25, f"MC capacity {f.mc_capacity}/25"
+
+
+@rule('habs_10plus', tier=3)
+def _habs_10plus(f: Facts):
+    n = len(f.player_habs)
+    return n >= 10, f"{n}/10 habs"
+
+
+@rule('major_federation', tier=3)
+def _major_federation(f: Facts):
+    best = max((sum(1 for m in fed.get('members', []) if m['value'] in f.major_powers)
+                for fed in f.player_federations.values()), default=0)
+    return best >= 5, f"best federation has {best}/5 major powers"
+
+
+@rule('mission_success', tier=3, stub=True)
+def _mission_success(f: Facts):
+    # Councilor mission success rate >80% — mission history not yet parsed
+    return False, "mission history not parsed"
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+def evaluate(facts: Facts, rules: list[Rule] = RULES) -> list[RuleResult]:
+    """Run every rule once, in order; ms includes facts a rule computes first."""
+    results = []
+    for r in rules:
+        start = time.perf_counter()
+        met, detail = r.check(facts)
+        results.append(RuleResult(r.name, r.tier, bool(met), detail,
+                                  round((time.perf_counter() - start) * 1000, 3), r.stub))
+    return results
@@ -0,0 +1 @@
+# Test package for bench module
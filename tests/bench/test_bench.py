@@ -0,0 +1,165 @@
+"""
+Tests for the benchmark suite
+
+Synthetic savegames parse and stage like real ones and grow with the scale;
+the bench measures every phase per scale and prints one row per phase.
+"""
+
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.bench.baseline import (
+    baseline_scales, bootstrap_ci, compare, format_comparison, load_baseline, save_baseline)
+from src.bench.command import PHASES, format_tables, run_bench
+from src.bench.synthetic import (
+    generate_gamestates, record_count, write_gamestates, write_savegame, write_templates)
+from src.db.gamestate import GS, GameState
+from src.db.populate import populate_savegame_db
+from src.load.command import create_templates_db
+from src.parse.command import parse_savegame
+from src.stage.command import evaluate_tier
+
+GAME_DATE = datetime(2027, 8, 1)
+
+
+def counts(gamestates: dict) -> dict[str, int]:
+    return {key.removeprefix(GS): len(records) for key, records in gamestates.items()}
+
+
+class TestSynthetic:
+    """Deterministic, scaled, and readable by parse and stage"""
+
+    def test_scaling(self):
+        small, large = counts(generate_gamestates(0.5)), counts(generate_gamestates(1))
+        for kind in ('TINationState', 'TIControlPoint', 'TICouncilorState', 'TIHabState',
+                     'TIHabModuleState', 'TISpaceFleetState'):
+            assert large[kind] == 2 * small[kind], kind
+        nation = generate_gamestates(0.5)[f'{GS}TINationState'][0]['Value']
+        assert len(nation['historyGDP']) == len(nation['historyPopulation']) == 145
+
+    def test_real_save_size(self, tmp_path):
+        assert 12 * 2**20 < write_gamestates(tmp_path / "save.gz", generate_gamestates(1)) < 14 * 2**20
+
+    def test_deterministic(self):
+        assert generate_gamestates(0.1, seed=3) == generate_gamestates(0.1, seed=3)
+        assert generate_gamestates(0.1, seed=3) != generate_gamestates(0.1, seed=4)
+
+    def test_parse_and_stage(self, tmp_path):
+        save = write_savegame(tmp_path / "saves", 0.2, GAME_DATE)
+        assert save.name == "Bench_2027-8-1.gz"
+        raw_db = tmp_path / "raw.db"
+        gamestates = generate_gamestates(0.2)
+        assert parse_savegame(save.parent, GAME_DATE, raw_db) == len(gamestates)
+
+        resist = next(f['Key']['value'] for f in gamestates[f'{GS}TIFactionState']
+                      if f['Value']['displayName'] == 'The Resistance')
+        templates_dir = write_templates(tmp_path / "build" / "templates")
+        create_templates_db(templates_dir.parent, templates_dir)
+        gamestate = GameState(raw_db, templates_dir.parent / "game_templates.db")
+        state = evaluate_tier(raw_db, tmp_path, '2027-08-01', faction='resist', gamestate=gamestate)
+        assert state['hab_count'] == sum(h['Value']['faction']['value'] == resist
+                                         for h in gamestates[f'{GS}TIHabState'])
+        assert gamestate.space_bodies().axes['Jupiter'] > 5
+
+        savegame_db = tmp_path / "savegame.db"
+        populate_savegame_db(raw_db, savegame_db, 'resist', '2027-08-01', gamestate.helpers('resist'),
+                             game_date=GAME_DATE, templates_file=templates_dir / "TISpaceBodyTemplate.json",
+                             templates_dir=templates_dir)
+        expected = counts(gamestates)
+        conn = sqlite3.connect(savegame_db)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM gs_nations").fetchone()[0] == expected['TINationState']
+            assert conn.execute("SELECT COUNT(*) FROM gs_habs").fetchone()[0] == expected['TIHabState']
+            assert conn.execute("SELECT COUNT(*) FROM gs_hab_modules WHERE tier > 0").fetchone()[0] > 0
+            assert conn.execute("SELECT object_type FROM gs_space_bodies WHERE name = 'Europa'").fetchone()[0] == 'Moon'
+            assert conn.execute("SELECT COUNT(*) FROM gs_transfers").fetchone()[0] > 0
+        finally:
+            conn.close()
+
+
+class TestBench:
+    """Every phase is measured at every scale, warmup rounds discarded"""
+
+    def test_run_and_format(self):
+        results = run_bench([0.05, 0.1], repeat=2, warmup=1)
+        assert list(results['phases']) == [p for p in PHASES if p != 'stage/contexts']
+        assert list(results['saves']) == [0.05, 0.1]
+        assert results['saves'][0.1]['records'] == record_count(generate_gamestates(0.1))
+        for by_scale in results['phases'].values():
+            for samples in by_scale.values():
+                assert len(samples['wall']) == 2
+                assert all(w > 0 for w in samples['wall']) and all(kb > 0 for kb in samples['peak_kb'])
+
+        table = format_tables(results)
+        assert "0.05x" in table and "0.1x" in table
+        assert table.count("stage/savegame_db") == 3     # latency, throughput, memory
+
+    def test_imports_outside_timings(self, tmp_path):
+        """Running a resolved phase in a fresh process imports no project or numpy module."""
+        templates_dir = write_templates(tmp_path / "build" / "templates")
+        create_templates_db(templates_dir.parent, templates_dir)
+        work = tmp_path / "work"
+        write_savegame(work / "saves", 0.05, GAME_DATE)
+        root = Path(__file__).parents[2]
+        for phase in ('parse', 'stage/tier_state', 'stage/savegame_db', 'stage/report'):
+            code = (f"import sys; from pathlib import Path; from src.bench.command import _phase\n"
+                    f"run = _phase({phase!r}, Path({str(work)!r}), Path({str(templates_dir)!r}), None)\n"
+                    f"before = set(sys.modules); run()\n"
+                    f"print(sorted(m for m in set(sys.modules) - before if m.split('.')[0] in ('src', 'numpy')))")
+            out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+            assert out.stdout.strip() == "[]", phase
+
+
+def samples(*walls: float) -> dict:
+    return {'wall': list(walls), 'cpu': list(walls), 'peak_kb': [1024] * len(walls)}
+
+
+def results(**phases) -> dict:
+    return {'saves': {1: {'records': 10, 'save_bytes': 1, 'json_bytes': 1}},
+            'phases': {phase.replace('__', '/'): {1: s} for phase, s in phases.items()}}
+
+
+class TestBaseline:
+    """Median comparison with bootstrap intervals against a stored baseline"""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "logs" / "bench_baseline.json"
+        save_baseline(path, results(parse=samples(0.1, 0.2)), tmp_path, seed=3, repeat=2, warmup=0)
+        baseline = load_baseline(path)
+        assert (baseline['seed'], baseline['phases']['parse']['1']['wall']) == (3, [0.1, 0.2])
+        assert baseline_scales(baseline) == [1]
+
+        path.write_text('{"version": 0}')
+        assert load_baseline(path) is None
+        assert load_baseline(tmp_path / "missing.json") is None
+
+    def test_bootstrap_ci(self):
+        low, high = bootstrap_ci([1.0, 1.01, 0.99, 1.0, 1.02], [1.5, 1.52, 1.49, 1.5, 1.51])
+        assert 0.4 < low <= high < 0.6
+        low, high = bootstrap_ci([1.0, 1.2, 0.8, 1.1, 0.9], [1.05, 0.85, 1.25, 0.95, 1.0])
+        assert low < 0 < high
+
+    def test_compare(self, tmp_path):
+        base = {'phases': {
+            'parse':             {'1': samples(1.0, 1.01, 0.99, 1.0, 1.02)},
+            'stage/savegame_db': {'1': samples(1.0, 1.2, 0.8, 1.1, 0.9)},
+            'codex':             {'1': samples(0.001, 0.001, 0.001)},
+        }}
+        now = results(parse=samples(1.3, 1.31, 1.29, 1.3, 1.32),
+                      stage__savegame_db=samples(1.15, 0.85, 1.35, 1.05, 1.1),
+                      codex=samples(0.002, 0.002, 0.002),
+                      preset=samples(0.1))
+        rows = {r['phase']: r for r in compare(base, now, threshold=0.10)}
+        assert set(rows) == {'parse', 'stage/savegame_db', 'codex'}      # preset not in baseline
+        assert rows['parse']['regressed'] and rows['parse']['change'] == pytest.approx(0.3)
+        assert not rows['stage/savegame_db']['regressed']                # within noise
+        assert not rows['codex']['regressed']                            # +100% of 1ms
+        assert not compare(base, now, threshold=0.50)[0]['regressed']
+
+        table = format_comparison(list(rows.values()), 0.10)
+        assert "!parse" in table and "1 regression(s) beyond +10%" in table
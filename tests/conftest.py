@@ -0,0 +1,75 @@
+"""
+Shared fixtures: raw parse DBs (build/savegame_{date}.db layout) and a
+minimal gamestate for tier evaluation.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from src.db.gamestate import GS
+from src.stage.tier_rules import MAJOR_POWER_GDP_THRESHOLD
+
+
+def _ref(key):
+    return {'value': key}
+
+
+def _body(key, name, barycenter=None):
+    return {'Key': _ref(key), 'Value': {'displayName': name, 'templateName': name,
+                                        'barycenter': _ref(barycenter) if barycenter else None}}
+
+
+def _tier_gamestate(stations=3, members=3, mc=12, fleet_body=12):
+    """Minimal gamestate: player faction 10, Luna base 100 with a councilor aboard."""
+    ref = _ref
+    nations = [{'Key': ref(n), 'Value': {'federation': ref(900), 'GDP': MAJOR_POWER_GDP_THRESHOLD}}
+               for n in range(200, 200 + members)]
+    return {
+        'TIPlayerState': [{'Key': ref(1), 'Value': {'isAI': False, 'faction': ref(10)}}],
+        'TIFactionState': [{'Key': ref(10), 'Value': {
+            'councilors': [ref(50)], 'fleets': [ref(70)], 'controlPoints': [ref(80)],
+            'baseIncomes_year': {'MissionControl': mc},
+        }}],
+        'TIHabState': (
+            [{'Key': ref(100), 'Value': {'faction': ref(10), 'habType': 'Base', 'habSite': ref(300)}}]
+            + [{'Key': ref(101 + i), 'Value': {'faction': ref(10), 'habType': 'Station'}} for i in range(stations)]
+            + [{'Key': ref(199), 'Value': {'faction': ref(11), 'habType': 'Station'}}]
+        ),
+        'TIHabSiteState': [{'Key': ref(300), 'Value': {'parentBody': ref(6)}}],
+        'TISpaceBodyState': [_body(2, 'Sol'), _body(5, 'Earth', 2), _body(6, 'Luna', 5),
+                             _body(10, 'Jupiter', 2), _body(12, 'Callisto', 10), _body(102, 'Ceres', 2)],
+        'TICouncilorState': [{'Key': ref(50), 'Value': {'location': {'$type': 'TIHabState', 'value': 100}}}],
+        'TISpaceFleetState': [{'Key': ref(70), 'Value': {'barycenter': ref(fleet_body)}}],
+        'TIControlPoint': [{'Key': ref(80), 'Value': {'nation': ref(200)}}],
+        'TINationState': nations,
+        'TIFederationState': [{'Key': ref(900), 'Value': {'members': [ref(n['Key']['value']) for n in nations]}}],
+    }
+
+
+@pytest.fixture
+def ref():
+    """{'value': key} reference builder."""
+    return _ref
+
+
+@pytest.fixture
+def tier_gamestate():
+    """Builder of a minimal gamestate ({type: records}, types without the GS prefix)."""
+    return _tier_gamestate
+
+
+@pytest.fixture
+def write_raw_db(tmp_path):
+    """Writer of a raw parse DB from {type: records}; returns its path."""
+    def write(data: dict[str, list], name: str = "savegame.db"):
+        db = tmp_path / name
+        conn = sqlite3.connect(db)
+        conn.execute("CREATE TABLE gamestates (key TEXT PRIMARY KEY, data TEXT)")
+        conn.executemany("INSERT INTO gamestates VALUES (?, ?)",
+                         [(GS + key, json.dumps(records)) for key, records in data.items()])
+        conn.commit()
+        conn.close()
+        return db
+    return write
@@ -0,0 +1,223 @@
+"""
+Tests for the fingerprinted build graph
+
+Staleness decisions, early cutoff, parallel levels and manifest handling.
+"""
+
+import os
+import threading
+
+import pytest
+
+from src.core.build_graph import BuildGraph, Node, explain
+
+
+@pytest.fixture
+def tree(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("hello", encoding='utf-8')
+    return tmp_path, src
+
+
+def _graph(root):
+    return BuildGraph(root / "build" / "manifest.json", root)
+
+
+def _copy_node(name, src, dst, calls, deps=(), transform=str.upper):
+    def action():
+        calls.append(name)
+        dst.write_text(transform(src.read_text(encoding='utf-8')), encoding='utf-8')
+    return Node(name, action=action, inputs=[src], outputs=[dst], deps=list(deps))
+
+
+class TestStaleness:
+    """Why a node runs or is skipped"""
+
+    def test_first_run_then_up_to_date(self, tree):
+        root, src = tree
+        calls = []
+        g = _graph(root)
+        g.add(_copy_node("a", src, root / "a.txt", calls))
+        first = g.run()
+        second = g.run()
+        assert first["a"].ran and first["a"].reason == "never built"
+        assert second["a"].ran is False and second["a"].reason == "up to date"
+        assert calls == ["a"]
+
+    def test_input_content_change(self, tree):
+        root, src = tree
+        calls = []
+        g = _graph(root)
+        g.add(_copy_node("a", src, root / "a.txt", calls))
+        g.run()
+        src.write_text("changed", encoding='utf-8')
+        results = g.run()
+        assert results["a"].ran
+        assert results["a"].reason == "input changed: src.txt"
+
+    def test_touch_without_change_is_skipped(self, tree):
+        root, src = tree
+        calls = []
+        g = _graph(root)
+        g.add(_copy_node("a", src, root / "a.txt", calls))
+        g.run()
+        st = src.stat()
+        os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        assert g.run()["a"].ran is False
+
+    def test_missing_output(self, tree):
+        root, src = tree
+        g = _graph(root)
+        g.add(_copy_node("a", src, root / "a.txt", []))
+        g.run()
+        (root / "a.txt").unlink()
+        assert g.run()["a"].reason == "output missing: a.txt"
+
+    def test_params_change(self, tree):
+        root, src = tree
+        for date, expect in (("2027-08-01", True), ("2027-08-01", False), ("2027-09-01", True)):
+            g = _graph(root)
+            g.add(Node("p", action=lambda: None, inputs=[src], params={'date': date}))
+            assert g.run()["p"].ran is expect
+
+    def test_force(self, tree):
+        root, src = tree
+        g = _graph(root)
+        g.add(_copy_node("a", src, root / "a.txt", []))
+        g.run()
+        assert g.run(force=True)["a"].reason == "forced"
+
+
+class TestDependencies:
+    """Upstream propagation and scheduling"""
+
+    def test_upstream_change_cascades(self, tree):
+        root, src = tree
+        calls = []
+        g = _graph(root)
+        g.add(_copy_node("a", src, root / "a.txt", calls))
+        g.add(_copy_node("b", root / "a.txt", root / "b.txt", calls, deps=["a"]))
+        g.run()
+        src.write_text("other", encoding='utf-8')
+        results = g.run()
+        assert calls == ["a", "b", "a", "b"]
+        assert results["b"].reason in ("upstream changed: a", "input changed: a.txt")
+
+    def test_early_cutoff(self, tree):
+        """An upstream rebuild with byte-identical output does not cascade."""
+        root, src = tree
+        calls = []
+        g = _graph(root)
+        g.add(_copy_node("a", src, root / "a.txt", calls, transform=lambda s: "constant"))
+        g.add(Node("b", action=lambda: calls.append("b"), outputs=[], deps=["a"]))
+        g.run()
+        src.write_text("other", encoding='utf-8')
+        g.run()
+        assert calls == ["a", "b", "a"]
+
+    def test_independent_nodes_run_in_parallel(self, tree):
+        root, _ = tree
+        barrier = threading.Barrier(2, timeout=5)
+        g = _graph(root)
+        g.add(Node("x", action=barrier.wait))
+        g.add(Node("y", action=barrier.wait))
+        results = g.run()
+        assert results["x"].ran and results["y"].ran
+
+    def test_cycle_rejected(self, tree):
+        root, _ = tree
+        g = _graph(root)
+        g.add(Node("a", action=lambda: None, deps=["b"]))
+        g.add(Node("b", action=lambda: None, deps=["a"]))
+        with pytest.raises(ValueError, match="cycle"):
+            g.run()
+
+    def test_unknown_dep_rejected(self, tree):
+        root, _ = tree
+        g = _graph(root)
+        g.add(Node("a", action=lambda: None, deps=["missing"]))
+        with pytest.raises(ValueError, match="unknown node"):
+            g.run()
+
+    def test_failure_keeps_completed_nodes(self, tree):
+        root, src = tree
+        calls = []
+        g = _graph(root)
+        g.add(_copy_node("a", src, root / "a.txt", calls))
+
+        def boom():
+            raise RuntimeError("boom")
+        g.add(Node("b", action=boom, deps=["a"]))
+        with pytest.raises(RuntimeError):
+            g.run()
+        g2 = _graph(root)
+        g2.add(_copy_node("a", src, root / "a.txt", calls))
+        assert g2.run()["a"].ran is False
+
+    def test_failure_keeps_finished_siblings(self, tree):
+        root, src = tree
+        calls, failed = [], threading.Event()
+        g = _graph(root)
+        ok = _copy_node("ok", src, root / "ok.txt", calls)
+        copy = ok.action
+
+        def after_failure():
+            assert failed.wait(5)       # finishes after its sibling raised
+            copy()
+        ok.action = after_failure
+
+        def boom():
+            failed.set()
+            raise RuntimeError("boom")
+        g.add(Node("bad", action=boom))
+        g.add(ok)
+        with pytest.raises(RuntimeError, match="boom"):
+            g.run()
+        g2 = _graph(root)
+        g2.add(_copy_node("ok", src, root / "ok.txt", calls))
+        assert g2.run()["ok"].ran is False
+
+
+class TestManifest:
+    """Manifest persistence"""
+
+    def test_corrupt_manifest_rebuilds(self, tree):
+        root, src = tree
+        g = _graph(root)
+        g.add(_copy_node("a", src, root / "a.txt", []))
+        g.run()
+        g.manifest_path.write_text("{not json", encoding='utf-8')
+        assert g.run()["a"].reason == "never built"
+
+    def test_other_graph_entries_preserved(self, tree):
+        root, src = tree
+        g1 = _graph(root)
+        g1.add(_copy_node("a", src, root / "a.txt", []))
+        g1.run()
+        g2 = _graph(root)
+        g2.add(_copy_node("b", src, root / "b.txt", []))
+        g2.run()
+        assert g1.run()["a"].ran is False
+
+    def test_deferred_save(self, tree):
+        """Workers run with save=False; the parent records their results once."""
+        root, src = tree
+        calls = []
+        worker = _graph(root)
+        worker.add(_copy_node("a", src, root / "a.txt", calls))
+        results = worker.run(save=False)
+        assert not worker.manifest_path.exists()
+        parent = _graph(root)
+        parent.save(results.values())
+        again = _graph(root)
+        again.add(_copy_node("a", src, root / "a.txt", calls))
+        assert again.run()["a"].ran is False
+        assert calls == ["a"]
+
+    def test_explain_lists_every_node(self, tree):
+        root, src = tree
+        g = _graph(root)
+        g.add(_copy_node("a", src, root / "a.txt", []))
+        text = explain(g.run())
+        assert "ran" in text and "never built" in text
+        assert explain({}) == "Build graph: nothing to do"
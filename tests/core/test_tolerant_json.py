@@ -0,0 +1,82 @@
+"""
+Tests for the tolerant JSON reader
+
+Repairs outside strings only, repair positions, and the source-hash cache.
+"""
+
+import json
+
+import pytest
+
+from src.core.tolerant_json import load_tolerant, repair
+
+
+class TestRepair:
+    """repair() strips comments and trailing commas outside strings"""
+
+    def test_trailing_commas(self):
+        text, repairs = repair('[1, 2,]\n{"a": 1,\n}')
+        assert text == '[1, 2]\n{"a": 1\n}'
+        assert [r[2] for r in repairs] == ['trailing_comma', 'trailing_comma']
+
+    def test_line_comment_positions(self):
+        text, repairs = repair('{\n  "a": 1 // note\n}')
+        assert json.loads(text) == {"a": 1}
+        assert repairs == [(2, 10, 'line_comment')]
+
+    def test_urls_in_strings_untouched(self):
+        source = '{"url": "https://example.com/a,]", "b": "say \\"//hi\\"",}'
+        text, repairs = repair(source)
+        assert json.loads(text) == {"url": "https://example.com/a,]", "b": 'say "//hi"'}
+        assert [r[2] for r in repairs] == ['trailing_comma']
+
+    def test_comma_before_comment_then_bracket(self):
+        text, _ = repair('[1, // last\n]')
+        assert json.loads(text) == [1]
+
+    def test_block_comment_keeps_lines(self):
+        text, repairs = repair('[1, /* a\nb */ 2]')
+        assert json.loads(text) == [1, 2]
+        assert text.count('\n') == 1
+        assert repairs[0][2] == 'block_comment'
+
+    def test_valid_json_unchanged(self):
+        assert repair('{"a": [1, 2]}') == ('{"a": [1, 2]}', [])
+
+
+class TestLoadTolerant:
+    """load_tolerant parses, repairs and caches"""
+
+    def test_valid_file_no_cache_written(self, tmp_path):
+        src = tmp_path / "ok.json"
+        src.write_text('{"a": 1}', encoding='utf-8')
+        assert load_tolerant(src, tmp_path / "cache") == ({"a": 1}, [])
+        assert not (tmp_path / "cache").exists()
+
+    def test_malformed_file_cached(self, tmp_path):
+        src = tmp_path / "bad.json"
+        src.write_text('[1, 2,] ', encoding='utf-8')
+        cache = tmp_path / "cache"
+        data, repairs = load_tolerant(src, cache)
+        assert data == [1, 2] and repairs == [(1, 6, 'trailing_comma')]
+        assert len(list(cache.glob("*.json"))) == 1
+        assert load_tolerant(src, cache) == ([1, 2], [(1, 6, 'trailing_comma')])
+
+    def test_cache_keyed_by_content(self, tmp_path):
+        src = tmp_path / "bad.json"
+        cache = tmp_path / "cache"
+        src.write_text('[1,]', encoding='utf-8')
+        load_tolerant(src, cache)
+        src.write_text('[2,]', encoding='utf-8')
+        assert load_tolerant(src, cache)[0] == [2]
+
+    def test_bom_accepted(self, tmp_path):
+        src = tmp_path / "bom.json"
+        src.write_bytes(b'\xef\xbb\xbf[1]')
+        assert load_tolerant(src) == ([1], [])
+
+    def test_unrecoverable_raises(self, tmp_path):
+        src = tmp_path / "broken.json"
+        src.write_text('[1, 2', encoding='utf-8')
+        with pytest.raises(json.JSONDecodeError):
+            load_tolerant(src, tmp_path / "cache")
@@ -0,0 +1,123 @@
+"""
+tests/db/test_body_index.py
+
+Unit tests for src/db/body_index.py — Euler-tour ancestry, zones from
+semi-major axes or planet names, and the gs_body_index snapshot table.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from src.db.body_index import build_body_index, load_space_bodies
+from src.db.populate import _attach_templates, _populate_space
+from src.db.query import _section_fleets
+from src.db.schema import init_savegame_db
+from src.db.template_tables import import_all_templates
+
+
+def ref(key):
+    return {'value': key}
+
+
+def body(key, name, barycenter=None, **extra):
+    return {'Key': ref(key), 'Value': {'displayName': name, 'templateName': name, 'exists': True,
+                                       'barycenter': ref(barycenter) if barycenter else None, **extra}}
+
+
+BODIES = [
+    body(2, 'Sol'), body(5, 'Earth', 2), body(6, 'Luna', 5),
+    body(7, 'Mars', 2), body(8, 'Phobos', 7),
+    body(10, 'Jupiter', 2), body(46, 'Europa', 10),
+    body(102, 'Ceres', 2), body(400, 'Hektor', 2),
+    body(999, 'Gone', 2, archived=True),
+]
+
+
+@pytest.fixture
+def index():
+    return build_body_index(BODIES, {'Hektor': 5.2})
+
+
+class TestBodyIndex:
+    """Hierarchy, ancestry and zones"""
+
+    def test_paths_and_depth(self, index):
+        europa = index.nodes[46]
+        assert europa.path == (2, 10, 46) and europa.depth == 2 and europa.parent == 10
+        assert europa.helio_key == 10
+        assert index.nodes[2].depth == 0 and index.nodes[2].parent is None
+        assert 999 not in index
+
+    def test_within(self, index):
+        assert index.within(46, 10) and index.within(46, 2) and index.within(10, 10)
+        assert not index.within(102, 10)       # Ceres' key is above Jupiter's
+        assert not index.within(10, 46)
+        assert not index.within(None, 2)
+
+    @pytest.mark.parametrize("key,zone", [
+        (2, 'sol'), (6, 'earth'), (8, 'inner'), (102, 'belt'), (46, 'jupiter'), (400, 'jupiter'),
+    ])
+    def test_zones(self, index, key, zone):
+        assert index.zone(key) == zone
+
+    def test_unknown_without_axes(self):
+        index = build_body_index(BODIES)
+        assert index.zone(400) == 'unknown' and index.zone(46) == 'jupiter'
+
+    def test_cycle_is_cut(self):
+        index = build_body_index([body(1, 'A', 2), body(2, 'B', 1)])
+        assert set(index.nodes) == {1, 2}
+        assert index.within(2, 1) and not index.within(1, 2)
+
+
+class TestBodyIndexSnapshot:
+    """gs_body_index is populated with the space bodies and joined by queries"""
+
+    def test_fleet_zone(self, tmp_path):
+        arrays = {
+            'PavonisInteractive.TerraInvicta.TISpaceBodyState': BODIES,
+            'PavonisInteractive.TerraInvicta.TISpaceFleetState': [
+                {'Key': ref(70), 'Value': {'exists': True, 'displayName': 'Far', 'faction': ref(1),
+                                           'barycenter': ref(46)}},
+                {'Key': ref(71), 'Value': {'exists': True, 'displayName': 'Near', 'faction': ref(1),
+                                           'barycenter': ref(102)}},
+            ],
+        }
+        templates_dir = tmp_path / "templates"
+        templates_dir.mkdir()
+        for template, records in {
+            'TISpaceBodyTemplate': [{'dataName': 'Jupiter', 'objectType': 'Planet', 'semiMajorAxis_AU': 5.2,
+                                     'barycenterName': 'Sol'}],
+            'TIHabModuleTemplate': [{'dataName': 'Core', 'tier': 1, 'crew': 5, 'power': -2}],
+        }.items():
+            (templates_dir / f"{template}.json").write_text(json.dumps(records), encoding='utf-8')
+        tpl = sqlite3.connect(tmp_path / "game_templates.db")
+        import_all_templates(tpl, templates_dir)
+        tpl.commit()
+        tpl.close()
+
+        conn = sqlite3.connect(tmp_path / "savegame.db")
+        conn.row_factory = sqlite3.Row
+        init_savegame_db(conn)
+        _attach_templates(conn, templates_dir)
+        space_bodies = load_space_bodies(tmp_path / "game_templates.db")
+        assert space_bodies.axes == {'Jupiter': 5.2} and space_bodies.targets == ('Jupiter',)
+        _populate_space(conn, None, lambda _db, key: arrays.get(key, []), None, None, None,
+                        lambda _db: space_bodies, 1, {1: 'Resistance'}, templates_dir=templates_dir)
+
+        jupiter_system = conn.execute("""
+            SELECT f.name FROM gs_fleets f
+            JOIN gs_body_index b ON b.body_key = f.body_key
+            JOIN gs_body_index j ON j.name = 'Jupiter'
+            WHERE b.tin BETWEEN j.tin AND j.tout
+        """).fetchall()
+        assert [r['name'] for r in jupiter_system] == ['Far']
+        assert conn.execute("SELECT path FROM gs_body_index WHERE body_key = 46").fetchone()[0] == '/2/10/46/'
+        assert conn.execute("SELECT object_type FROM gs_space_bodies WHERE body_key = 10").fetchone()[0] == 'Planet'
+
+        lines = _section_fleets(conn)
+        assert any('Far' in line and 'jupiter' in line for line in lines)
+        assert any('Near' in line and 'belt' in line for line in lines)
+        conn.close()
@@ -0,0 +1,92 @@
+"""
+tests/db/test_connection.py
+
+Unit tests for src/db/connection.py — profiles and the per-thread pool.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.db.connection import attach, close_pool, connect, pooled
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "test.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.commit()
+    conn.close()
+    yield path
+    close_pool()
+
+
+class TestProfiles:
+
+    def test_readonly_rejects_writes(self, db):
+        conn = connect(db, 'readonly')
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO t VALUES (2)")
+        conn.close()
+
+    def test_snapshot_reads(self, db):
+        conn = connect(db, 'snapshot')
+        assert conn.execute("SELECT x FROM t").fetchone()['x'] == 1
+        conn.close()
+
+    def test_readwrite_enables_wal(self, db):
+        conn = connect(db, 'readwrite')
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        conn.close()
+
+    def test_unknown_profile(self, db):
+        with pytest.raises(ValueError):
+            connect(db, 'turbo')
+
+    def test_missing_db_readonly(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            connect(tmp_path / "missing.db", 'readonly')
+
+    def test_attach_read_only(self, db, tmp_path):
+        conn = connect(tmp_path / "main.db", 'readwrite')
+        attach(conn, db, 'other')
+        assert conn.execute("SELECT x FROM other.t").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO other.t VALUES (2)")
+        with pytest.raises(ValueError):
+            attach(conn, db, 'rw', profile='readwrite')
+        conn.close()
+
+
+class TestPool:
+
+    def test_reuses_connection(self, db):
+        assert pooled(db, 'snapshot') is pooled(db, 'snapshot')
+
+    def test_profiles_pooled_separately(self, db):
+        assert pooled(db, 'snapshot') is not pooled(db, 'readonly')
+
+    def test_reopens_after_file_change(self, db):
+        first = pooled(db, 'snapshot')
+        conn = sqlite3.connect(db)
+        conn.execute("INSERT INTO t VALUES (2)")
+        conn.commit()
+        conn.close()
+        second = pooled(db, 'snapshot')
+        assert second is not first
+        assert second.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
+
+    def test_per_thread(self, db):
+        main = pooled(db, 'readonly')
+        other = []
+        t = threading.Thread(target=lambda: other.append(pooled(db, 'readonly')))
+        t.start()
+        t.join()
+        assert other[0] is not main
+
+    def test_writers_not_pooled(self, db):
+        with pytest.raises(ValueError):
+            pooled(db, 'readwrite')
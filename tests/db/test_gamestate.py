@@ -0,0 +1,68 @@
+"""
+tests/db/test_gamestate.py
+
+Unit tests for src/db/gamestate.py — a shared GameState decodes each array
+once and resolves faction slugs to factions in the save.
+"""
+
+import pytest
+
+import src.db.gamestate as gamestate_mod
+from src.db.gamestate import GS, RAW_HELPERS, GameState, faction_slug
+
+
+@pytest.fixture
+def raw_db(write_raw_db, ref):
+    return write_raw_db({
+        'TIPlayerState': [{'Key': ref(1), 'Value': {'isAI': False, 'faction': ref(10)}},
+                          {'Key': ref(2), 'Value': {'isAI': True, 'faction': ref(11)}}],
+        'TIFactionState': [{'Key': ref(10), 'Value': {'displayName': 'The Resistance'}},
+                           {'Key': ref(11), 'Value': {'displayName': 'The Academy'}}],
+        'TINationState': [{'Key': ref(200), 'Value': {'displayName': 'France'}}],
+    })
+
+
+class TestGameState:
+    """Arrays decoded once; slugs resolve by in-save display name"""
+
+    def test_decoded_once(self, raw_db, monkeypatch):
+        calls = []
+        load_gs = gamestate_mod.load_gs
+        monkeypatch.setattr(gamestate_mod, 'load_gs', lambda db, key: calls.append(key) or load_gs(db, key))
+        gs = GameState(raw_db)
+        for slug in ('resist', 'cooperate', 'escape'):
+            gs.faction(slug)
+        assert gs.load(f'{GS}TINationState') is gs.load(f'{GS}TINationState')
+        assert sorted(calls) == sorted({f'{GS}TIFactionState', f'{GS}TIPlayerState', f'{GS}TINationState'})
+
+    @pytest.mark.parametrize("slug,key", [
+        ('resist', 10), ('cooperate', 11), ('academy', 11), ('Academy', 11),
+        ('escape', 10), ('nonsense', 10), (None, 10),     # not in save: the human player (warned)
+    ])
+    def test_faction(self, raw_db, slug, key):
+        assert GameState(raw_db).faction(slug)[0] == key
+
+    def test_fallback_warns(self, raw_db, caplog):
+        gs = GameState(raw_db)
+        gs.faction('nonsense')
+        gs.faction('nonsense')
+        warnings = [r for r in caplog.records if r.levelname == 'WARNING']
+        assert len(warnings) == 1 and "'nonsense' not found in save" in warnings[0].getMessage()
+
+    @pytest.mark.parametrize("slug", ['nonsense', 'escape'])
+    def test_no_fallback(self, raw_db, slug):
+        gs = GameState(raw_db, player_fallback=False)
+        assert gs.faction('academy')[0] == 11 and gs.faction(None)[0] == 10
+        with pytest.raises(ValueError, match=f"Faction '{slug}' is not in this save"):
+            gs.faction(slug)
+
+    def test_faction_slug(self):
+        assert [faction_slug(s) for s in ('resist', 'Academy', 'EXODUS', 'nonsense', None)] == \
+            ['resist', 'cooperate', 'escape', None, None]
+
+    def test_helpers(self, raw_db):
+        helpers = GameState(raw_db).helpers('academy')
+        assert helpers.keys() == RAW_HELPERS.keys()
+        assert helpers['player_faction'](raw_db)[1]['displayName'] == 'The Academy'
+        assert helpers['faction_name_map'](raw_db) == RAW_HELPERS['faction_name_map'](raw_db)
+        assert helpers['nation_map'](raw_db) == {200: {'displayName': 'France'}}
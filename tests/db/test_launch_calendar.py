@@ -0,0 +1,87 @@
+"""
+tests/db/test_launch_calendar.py
+
+Unit tests for src/db/launch_calendar.py — precomputed windows and penalties
+must agree with the live calculation, and serve upcoming windows to stage.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from src.db.launch_calendar import CALENDAR_NAME, build_launch_calendar, lookup_windows
+from src.db.populate import _populate_launch_windows
+from src.db.schema import init_savegame_db
+from src.preset.launch_windows import calculate_launch_windows
+
+START, END = datetime(2025, 1, 1), datetime(2035, 1, 1)
+
+
+@pytest.fixture
+def calendar(tmp_path):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "TISpaceBodyTemplate.json").write_text(json.dumps([
+        {"dataName": "Sol"},
+        {"dataName": "Earth", "barycenterName": "Sol", "semiMajorAxis_AU": 1.0, "meanAnomalyAtEpoch_Deg": 100.46},
+        {"dataName": "Ceres", "barycenterName": "Sol", "semiMajorAxis_AU": 2.7675, "meanAnomalyAtEpoch_Deg": 60.0},
+    ]), encoding='utf-8')
+    (templates / "TIHabSiteTemplate.json").write_text(json.dumps([
+        {"dataName": "CeresSite", "parentBodyName": "Ceres"},
+    ]), encoding='utf-8')
+
+    db = tmp_path / "game_templates.db"
+    conn = sqlite3.connect(db)
+    build_launch_calendar(conn, templates / "TISpaceBodyTemplate.json", tmp_path / CALENDAR_NAME, START, END)
+    conn.commit()
+    conn.close()
+    return tmp_path
+
+
+class TestLaunchCalendar:
+    """Calendar lookups equal live computation inside the span"""
+
+    @pytest.fixture
+    def conn(self, calendar):
+        conn = sqlite3.connect(calendar / "game_templates.db")
+        yield conn
+        conn.close()
+
+    @pytest.mark.parametrize("date", ["2025-01-01", "2026-11-13", "2027-08-01", "2027-09-01", "2031-06-15"])
+    def test_matches_live(self, conn, calendar, date):
+        game_date = datetime.strptime(date, "%Y-%m-%d")
+        live = calculate_launch_windows(game_date, calendar / "templates" / "TISpaceBodyTemplate.json")
+        assert lookup_windows(conn, game_date, calendar / CALENDAR_NAME) == live
+
+    def test_out_of_range(self, conn, calendar):
+        assert lookup_windows(conn, datetime(2040, 1, 1), calendar / CALENDAR_NAME) == {}
+        assert lookup_windows(conn, datetime(2024, 12, 31), calendar / CALENDAR_NAME) == {}
+
+    def test_windows_indexed_by_body(self, conn):
+        rows = conn.execute(
+            "SELECT window_date FROM launch_windows WHERE body = 'Mars' AND window_date >= '2027-01-01' "
+            "ORDER BY day LIMIT 3"
+        ).fetchall()
+        assert [r[0] for r in rows] == ["2029-01-01", "2031-02-20", "2033-04-10"]
+
+    def test_no_calendar(self, tmp_path):
+        conn = sqlite3.connect(":memory:")
+        assert lookup_windows(conn, datetime(2027, 1, 1), tmp_path / CALENDAR_NAME) == {}
+
+
+class TestUpcomingWindows:
+    """_populate_launch_windows copies the next windows per body"""
+
+    def test_upcoming(self, tmp_path, calendar):
+        conn = sqlite3.connect(tmp_path / "savegame.db")
+        init_savegame_db(conn)
+        conn.execute(f"ATTACH DATABASE '{calendar / 'game_templates.db'}' AS tpl")
+        _populate_launch_windows(conn, datetime(2027, 8, 1))
+        rows = conn.execute(
+            "SELECT seq, window_date, days_away FROM gs_launch_windows WHERE body = 'Hephaistos' ORDER BY seq"
+        ).fetchall()
+        assert rows == [(1, "2027-08-01", 0), (2, "2029-01-15", 533), (3, "2030-07-02", 1066)]
+        assert conn.execute("SELECT COUNT(DISTINCT body) FROM gs_launch_windows").fetchone()[0] == 4
+        conn.close()
@@ -0,0 +1,74 @@
+"""
+tests/db/test_localization.py
+
+Localization ingest: incremental refresh by file hash and indexed lookups.
+"""
+
+import pytest
+
+from src.db.connection import close_pool
+from src.db.localization import display_name, ingest_localization, template_strings
+
+
+@pytest.fixture
+def loc_dir(tmp_path):
+    d = tmp_path / "en"
+    d.mkdir()
+    (d / "TITraitTemplate.en").write_text(
+        "TITraitTemplate.displayName.Brave=Brave\n"
+        "TITraitTemplate.description.Brave=Fearless\n"
+        "TITraitTemplate.displayName.Mr.Dotted=Dotted\n"
+        "garbage line\n"
+        "Too.short=x\n",
+        encoding='utf-8')
+    (d / "TIHabModuleTemplate.en").write_text(
+        "TIHabModuleTemplate.displayName.Core=Core Module\n", encoding='utf-8')
+    yield d
+    close_pool()
+
+
+class TestIngest:
+    """ingest_localization keeps the table in sync with the .en files"""
+
+    def test_first_ingest(self, loc_dir, tmp_path):
+        db = tmp_path / "loc.db"
+        assert ingest_localization(loc_dir, db) == (2, 0)
+        strings = template_strings(db, 'TITraitTemplate')
+        assert strings == {
+            'Brave':     {'displayName': 'Brave', 'description': 'Fearless'},
+            'Mr.Dotted': {'displayName': 'Dotted'},
+        }
+
+    def test_unchanged_files_skipped(self, loc_dir, tmp_path):
+        db = tmp_path / "loc.db"
+        ingest_localization(loc_dir, db)
+        assert ingest_localization(loc_dir, db) == (0, 2)
+
+    def test_changed_file_replaced(self, loc_dir, tmp_path):
+        db = tmp_path / "loc.db"
+        ingest_localization(loc_dir, db)
+        (loc_dir / "TITraitTemplate.en").write_text(
+            "TITraitTemplate.displayName.Shy=Shy\n", encoding='utf-8')
+        assert ingest_localization(loc_dir, db) == (1, 1)
+        assert template_strings(db, 'TITraitTemplate') == {'Shy': {'displayName': 'Shy'}}
+
+    def test_removed_file_dropped(self, loc_dir, tmp_path):
+        db = tmp_path / "loc.db"
+        ingest_localization(loc_dir, db)
+        (loc_dir / "TIHabModuleTemplate.en").unlink()
+        ingest_localization(loc_dir, db)
+        assert template_strings(db, 'TIHabModuleTemplate') == {}
+
+
+class TestLookup:
+    """Runtime display-name probes"""
+
+    def test_display_name(self, loc_dir, tmp_path):
+        db = tmp_path / "loc.db"
+        ingest_localization(loc_dir, db)
+        assert display_name(db, 'TIHabModuleTemplate', 'Core') == 'Core Module'
+        assert display_name(db, 'TIHabModuleTemplate', 'Nope') is None
+
+    def test_missing_db(self, tmp_path):
+        assert display_name(tmp_path / "none.db", 'T', 'x') is None
+        assert template_strings(tmp_path / "none.db", 'T') == {}
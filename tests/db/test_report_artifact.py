@@ -0,0 +1,94 @@
+"""
+tests/db/test_report_artifact.py
+
+Unit tests for src/db/report_artifact.py.
+Builds a tiny savegame.db in tmp_path with the real schema.
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.db.query import build_codex_report, render_codex_domains, render_codex_sections
+from src.db.report_artifact import (
+    artifact_path,
+    estimate_tokens,
+    load_report_artifact,
+    load_report_text,
+    write_report_artifact,
+)
+from src.db.schema import init_savegame_db
+
+
+@pytest.fixture
+def savegame_db(tmp_path) -> Path:
+    db = tmp_path / "savegame_2027-08-01.db"
+    conn = sqlite3.connect(db)
+    init_savegame_db(conn)
+    conn.execute("INSERT INTO gs_global VALUES (1, 421.5, 3.2, 0, 1)")
+    conn.execute("INSERT INTO gs_nations VALUES (1, 'France', 3.1, 0.5, 2.0, 0.1, 8.0, 290)")
+    conn.execute("INSERT INTO gs_control_points VALUES (10, 1, 5, 'The Resistance', 'Executive', 1)")
+    conn.execute("INSERT INTO gs_research_completed VALUES ('Fusion')")
+    conn.commit()
+    conn.close()
+    return db
+
+
+class TestRenderSections:
+
+    def test_sections_join_to_full_report(self, savegame_db):
+        sections = render_codex_sections(savegame_db)
+        joined = "\n".join(text for _, text in sections).strip()
+        assert joined == build_codex_report(savegame_db)
+
+    def test_empty_sections_omitted(self, savegame_db):
+        names = [name for name, _ in render_codex_sections(savegame_db)]
+        assert "nations" in names
+        assert "fleets" not in names          # no gs_fleets rows
+        assert names[0] == "earth"            # domain heading first
+
+    def test_domains_split(self, savegame_db):
+        domains = render_codex_domains(savegame_db)
+        assert set(domains) == {"earth", "intel", "research", "space"}
+        assert domains["earth"].startswith("# EARTH & POLITICAL STATE")
+        assert "France" in domains["earth"]
+        assert "Fusion" in domains["research"]
+        assert "France" not in domains["research"]
+
+
+class TestArtifact:
+
+    def test_roundtrip_matches_report(self, savegame_db, tmp_path):
+        out = artifact_path(tmp_path, "2027-08-01")
+        write_report_artifact(savegame_db, out)
+        assert load_report_text(out) == build_codex_report(savegame_db)
+
+    def test_counts_recorded(self, savegame_db, tmp_path):
+        out = artifact_path(tmp_path, "2027-08-01")
+        artifact = write_report_artifact(savegame_db, out)
+        for s in artifact['sections']:
+            assert s['lines'] == s['text'].count("\n") + 1
+            assert s['tokens'] == estimate_tokens(s['text'])
+        assert artifact['total_lines'] == sum(s['lines'] for s in artifact['sections'])
+
+    def test_missing_artifact_returns_none(self, tmp_path):
+        assert load_report_text(tmp_path / "report_2027-08-01.json") is None
+
+    def test_version_mismatch_ignored(self, tmp_path):
+        out = tmp_path / "report_2027-08-01.json"
+        out.write_text(json.dumps({'version': 0, 'sections': []}), encoding='utf-8')
+        assert load_report_artifact(out) is None
+
+    def test_stale_source_ignored(self, savegame_db, tmp_path):
+        out = artifact_path(tmp_path, "2027-08-01")
+        write_report_artifact(savegame_db, out)
+        assert load_report_artifact(out) is not None
+        conn = sqlite3.connect(savegame_db)
+        conn.execute("INSERT INTO gs_research_completed VALUES ('Fission')")
+        conn.commit()
+        conn.close()
+        os.utime(savegame_db, ns=(0, savegame_db.stat().st_mtime_ns + 1))
+        assert load_report_artifact(out) is None
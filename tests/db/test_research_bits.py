@@ -0,0 +1,130 @@
+"""
+tests/db/test_research_bits.py
+
+Unit tests for src/db/research_bits.py — bitset encoding, snapshot storage,
+digest fallback, and the gained-since-previous diff in populate.
+"""
+
+import sqlite3
+
+import pytest
+
+from src.db.populate import _populate_research_bits
+from src.db.research_bits import (
+    encode, index_digest, load_index, names_of, snapshot_bits, store_bits, to_blob,
+)
+from src.db.schema import init_savegame_db
+
+NAMES = ["A", "B", "C", "D", "P"]
+
+
+def _snapshot(path, techs=(), projects=(), iso_date="2027-01-01"):
+    conn = sqlite3.connect(path)
+    init_savegame_db(conn)
+    conn.executemany("INSERT INTO gs_research_completed VALUES (?)", [(t,) for t in techs])
+    conn.executemany("INSERT INTO gs_projects_completed VALUES (?)", [(p,) for p in projects])
+    conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('iso_date', ?)", (iso_date,))
+    return conn
+
+
+@pytest.fixture
+def templates_db(tmp_path):
+    db = tmp_path / "game_templates.db"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE tech_index (name TEXT PRIMARY KEY, bit INTEGER NOT NULL UNIQUE)")
+    conn.executemany("INSERT INTO tech_index VALUES (?, ?)", [(n, i) for i, n in enumerate(NAMES)])
+    conn.commit()
+    conn.close()
+    return db
+
+
+class TestEncoding:
+    """encode / names_of / to_blob round-trip"""
+
+    def test_round_trip(self):
+        bits = encode(["C", "A", "Unknown"], NAMES)
+        assert bits == 0b101
+        assert names_of(bits, NAMES) == ["A", "C"]
+
+    def test_set_operations(self):
+        older, newer = encode(["A", "B"], NAMES), encode(["A", "C", "D"], NAMES)
+        assert names_of(newer & ~older, NAMES) == ["C", "D"]
+        assert names_of(older & ~newer, NAMES) == ["B"]
+        assert newer.bit_count() == 3
+
+    def test_blob_little_endian(self):
+        assert to_blob(0b1_0000_0001, 9) == b"\x01\x01"
+        assert int.from_bytes(to_blob(0, 5), "little") == 0
+
+
+class TestSnapshotBits:
+    """store_bits persists bitsets; snapshot_bits trusts them only with a matching index"""
+
+    def test_store_and_read(self, tmp_path):
+        conn = _snapshot(tmp_path / "s.db", techs=["A", "B"], projects=["P"])
+        stored = store_bits(conn, NAMES)
+        assert stored == {"tech": 0b11, "project": 0b10000}
+        row = conn.execute("SELECT width, index_digest, count FROM gs_research_bits WHERE kind = 'tech'").fetchone()
+        assert row == (5, index_digest(NAMES), 2)
+        assert snapshot_bits(conn, NAMES) == stored
+
+    def test_appended_index_still_valid(self, tmp_path):
+        conn = _snapshot(tmp_path / "s.db", techs=["B"])
+        store_bits(conn, NAMES)
+        conn.execute("DELETE FROM gs_research_completed")  # prove the blob is what is read
+        assert snapshot_bits(conn, NAMES + ["New"])["tech"] == 0b10
+
+    def test_regenerated_index_reencodes_rows(self, tmp_path):
+        conn = _snapshot(tmp_path / "s.db", techs=["B"])
+        store_bits(conn, NAMES)
+        reordered = ["B", "A", "C", "D", "P"]
+        assert snapshot_bits(conn, reordered)["tech"] == 0b1
+
+    def test_load_index_missing(self):
+        conn = sqlite3.connect(":memory:")
+        assert load_index(conn, schema="main") == []
+
+
+class TestResearchGained:
+    """_populate_research_bits diffs against the attached previous snapshot"""
+
+    def test_gained_since_previous(self, tmp_path, templates_db):
+        prev = _snapshot(tmp_path / "prev.db", techs=["A"], iso_date="2027-01-01")
+        store_bits(prev, NAMES)
+        prev.commit()
+        prev.close()
+
+        conn = _snapshot(tmp_path / "cur.db", techs=["A", "B", "C"], projects=["P"], iso_date="2027-06-01")
+        conn.execute(f"ATTACH DATABASE '{templates_db}' AS tpl")
+        conn.execute(f"ATTACH DATABASE '{tmp_path / 'prev.db'}' AS prev")
+        _populate_research_bits(conn, has_previous=True)
+
+        gained = conn.execute("SELECT name, kind FROM gs_research_gained ORDER BY name").fetchall()
+        assert gained == [("B", "tech"), ("C", "tech"), ("P", "project")]
+        assert conn.execute(
+            "SELECT value FROM meta WHERE key = 'research_baseline_date'"
+        ).fetchone() == ("2027-01-01",)
+
+    def test_no_previous(self, tmp_path, templates_db):
+        conn = _snapshot(tmp_path / "cur.db", techs=["A"])
+        conn.execute(f"ATTACH DATABASE '{templates_db}' AS tpl")
+        _populate_research_bits(conn, has_previous=False)
+        assert conn.execute("SELECT COUNT(*) FROM gs_research_bits").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM gs_research_gained").fetchone()[0] == 0
+
+    def test_previous_predates_new_tables(self, tmp_path, templates_db):
+        """A snapshot staged before gs_research_bits/gs_projects_completed existed."""
+        prev = sqlite3.connect(tmp_path / "prev.db")
+        prev.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        prev.execute("CREATE TABLE gs_research_completed (tech_name TEXT PRIMARY KEY)")
+        prev.execute("INSERT INTO gs_research_completed VALUES ('A')")
+        prev.commit()
+        prev.close()
+
+        conn = _snapshot(tmp_path / "cur.db", techs=["A", "B"], projects=["P"], iso_date="2027-06-01")
+        conn.execute(f"ATTACH DATABASE '{templates_db}' AS tpl")
+        conn.execute(f"ATTACH DATABASE '{tmp_path / 'prev.db'}' AS prev")
+        _populate_research_bits(conn, has_previous=True)
+
+        gained = conn.execute("SELECT name, kind FROM gs_research_gained ORDER BY name").fetchall()
+        assert gained == [("B", "tech")]
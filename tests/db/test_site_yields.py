@@ -0,0 +1,110 @@
+"""
+tests/db/test_site_yields.py
+
+Unit tests for src/db/site_yields.py — clamped-normal expectation, Monte Carlo
+bands, per-body ranking, and the copy into savegame.db.
+"""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.db.populate import _populate_mining_sites
+from src.db.schema import init_savegame_db
+from src.db.site_yields import build_site_values, expected_yield, sample_yields
+
+
+@pytest.fixture
+def templates_db(tmp_path):
+    db = tmp_path / "game_templates.db"
+    conn = sqlite3.connect(db)
+    conn.executescript("""
+        CREATE TABLE space_bodies (dataName TEXT PRIMARY KEY, displayName TEXT);
+        CREATE TABLE hab_sites (dataName TEXT PRIMARY KEY, displayName TEXT, body TEXT, miningProfile TEXT);
+        CREATE TABLE mining_profiles (
+            dataName TEXT PRIMARY KEY,
+            water_mean REAL, water_width REAL, water_min REAL,
+            metals_mean REAL, metals_width REAL, metals_min REAL,
+            nobles_mean REAL, nobles_width REAL, nobles_min REAL,
+            fissiles_mean REAL, fissiles_width REAL, fissiles_min REAL);
+        INSERT INTO space_bodies VALUES ('Mars', 'Mars'), ('Ceres', 'Ceres');
+        INSERT INTO mining_profiles VALUES
+            ('Rich', 4, 1, 0,  6, 2, 1,  1, 0.5, 0,  1, 0.5, 0),
+            ('Poor', 1, 0, 0,  1, 0, 0,  0, 0,   0,  0, 0,   0);
+        INSERT INTO hab_sites VALUES
+            ('MarsA', 'Mars A', 'Mars', 'Rich'),
+            ('MarsB', 'Mars B', 'Mars', 'Poor'),
+            ('CeresA', 'Ceres A', 'Ceres', 'Poor'),
+            ('Nowhere', NULL, NULL, 'Missing');
+    """)
+    build_site_values(conn, samples=4000)
+    conn.commit()
+    conn.close()
+    return db
+
+
+class TestExpectedYield:
+    """expected_yield matches E[max(min, N(mean, width))]"""
+
+    def test_matches_sampling(self):
+        mean, width, floor = np.array([2.0, 0.5, 3.0]), np.array([1.0, 1.0, 0.0]), np.array([1.0, 0.0, 0.0])
+        exact = expected_yield(mean, width, floor)
+        rolls = sample_yields(mean, width, floor, 200_000, np.random.default_rng(1))
+        assert np.allclose(exact, rolls.mean(axis=0), atol=0.01)
+        assert exact[2] == 3.0
+
+    def test_floor_dominates(self):
+        assert expected_yield(np.array([0.0]), np.array([0.1]), np.array([5.0]))[0] == pytest.approx(5.0)
+
+
+class TestBuildSiteValues:
+    """build_site_values stores ranked, banded site values"""
+
+    @pytest.fixture
+    def conn(self, templates_db):
+        conn = sqlite3.connect(templates_db)
+        conn.row_factory = sqlite3.Row
+        yield conn
+        conn.close()
+
+    def test_rows_and_ranks(self, conn):
+        rows = {r['dataName']: r for r in conn.execute("SELECT * FROM site_values")}
+        assert set(rows) == {"MarsA", "MarsB", "CeresA", "Nowhere"}
+        assert rows["MarsA"]['body_rank'] == 1 and rows["MarsB"]['body_rank'] == 2
+        assert rows["CeresA"]['body_rank'] == 1
+        assert rows["MarsA"]['value'] > rows["MarsB"]['value'] == rows["CeresA"]['value']
+        assert rows["Nowhere"]['value'] == 0
+
+    def test_bands_ordered(self, conn):
+        for r in conn.execute("SELECT * FROM site_values"):
+            assert r['value_p10'] <= r['value_p50'] <= r['value_p90']
+        fixed = conn.execute("SELECT * FROM site_values WHERE dataName = 'MarsB'").fetchone()
+        assert fixed['value_p10'] == fixed['value_p90'] == pytest.approx(fixed['value'])
+
+    def test_reproducible(self, conn):
+        before = conn.execute("SELECT * FROM site_values ORDER BY dataName").fetchall()
+        build_site_values(conn, samples=4000)
+        after = conn.execute("SELECT * FROM site_values ORDER BY dataName").fetchall()
+        assert [tuple(r) for r in before] == [tuple(r) for r in after]
+
+    def test_empty(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE hab_sites (dataName, displayName, body, miningProfile)")
+        conn.execute("CREATE TABLE mining_profiles (dataName, " + ", ".join(
+            f"{r}_{k}" for r in ("water", "metals", "nobles", "fissiles") for k in ("mean", "width", "min")) + ")")
+        assert build_site_values(conn) == 0
+
+
+class TestMiningSitesSnapshot:
+    """_populate_mining_sites copies the best sites into savegame.db"""
+
+    def test_copy(self, tmp_path, templates_db):
+        conn = sqlite3.connect(tmp_path / "savegame.db")
+        init_savegame_db(conn)
+        conn.execute(f"ATTACH DATABASE '{templates_db}' AS tpl")
+        _populate_mining_sites(conn)
+        rows = conn.execute("SELECT site, body, body_rank FROM gs_mining_sites ORDER BY value DESC").fetchall()
+        assert rows[0] == ("MarsA", "Mars", 1)
+        assert {r[0] for r in rows} == {"MarsA", "MarsB", "CeresA"}  # valueless sites skipped
+        conn.close()
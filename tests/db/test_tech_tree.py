@@ -0,0 +1,152 @@
+"""
+tests/db/test_tech_tree.py
+
+Unit tests for src/db/tech_tree.py — topological levels, transitive closure,
+and the stage-time research frontier derived from them.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from src.db.populate import _populate_research_targets
+from src.db.schema import init_savegame_db
+from src.db.tech_tree import build_tech_tree, topological_levels
+
+
+@pytest.fixture
+def templates_db(tmp_path):
+    d = tmp_path / "templates"
+    d.mkdir()
+    # A ─┬─ B ─┬─ D
+    #    └─ C ─┘     E (no prereqs)   P (project, needs D)
+    (d / "TITechTemplate.json").write_text(json.dumps([
+        {"dataName": "A", "displayName": "Alpha", "techCategory": "Energy", "researchCost": 100},
+        {"dataName": "B", "prereqs": ["A"]},
+        {"dataName": "C", "prereqs": ["A", ""]},
+        {"dataName": "D", "prereqs": ["B", "C", "Unknown"]},
+        {"dataName": "E", "prereqs": []},
+    ]), encoding='utf-8')
+    (d / "TIProjectTemplate.json").write_text(json.dumps([
+        {"dataName": "P", "prereqs": ["D"]},
+    ]), encoding='utf-8')
+    db = tmp_path / "game_templates.db"
+    conn = sqlite3.connect(db)
+    build_tech_tree(conn, d)
+    conn.commit()
+    conn.close()
+    return db
+
+
+class TestTopologicalLevels:
+    """topological_levels assigns 1 + max prerequisite level"""
+
+    def test_levels(self):
+        assert topological_levels({"a": [], "b": ["a"], "c": ["a", "b"]}) == {"a": 0, "b": 1, "c": 2}
+
+    def test_cycle_placed_on_top(self):
+        levels = topological_levels({"a": [], "x": ["y"], "y": ["x"]})
+        assert levels == {"a": 0, "x": 1, "y": 1}
+
+
+class TestBuildTechTree:
+    """build_tech_tree stores nodes, direct edges and the closure"""
+
+    @pytest.fixture
+    def conn(self, templates_db):
+        conn = sqlite3.connect(templates_db)
+        yield conn
+        conn.close()
+
+    def test_nodes(self, conn):
+        rows = dict(conn.execute("SELECT name, level FROM tech_nodes").fetchall())
+        assert rows == {"A": 0, "B": 1, "C": 1, "D": 2, "E": 0, "P": 3}
+        assert conn.execute(
+            "SELECT kind, display_name, category, cost FROM tech_nodes WHERE name = 'A'"
+        ).fetchone() == ("tech", "Alpha", "Energy", 100)
+        assert conn.execute("SELECT kind FROM tech_nodes WHERE name = 'P'").fetchone() == ("project",)
+
+    def test_unknown_and_empty_prereqs_dropped(self, conn):
+        assert conn.execute("SELECT prereq FROM tech_prereqs WHERE name = 'D' ORDER BY prereq").fetchall() \
+            == [("B",), ("C",)]
+        assert conn.execute("SELECT prereq FROM tech_prereqs WHERE name = 'C'").fetchall() == [("A",)]
+
+    def test_closure_shortest_depth(self, conn):
+        rows = conn.execute("SELECT ancestor, depth FROM tech_closure WHERE name = 'P' ORDER BY ancestor").fetchall()
+        assert rows == [("A", 3), ("B", 2), ("C", 2), ("D", 1)]
+
+    def test_rebuild_replaces(self, conn, templates_db):
+        build_tech_tree(conn, templates_db.parent / "templates")
+        assert conn.execute("SELECT COUNT(*) FROM tech_closure").fetchone()[0] == 9
+
+
+class TestResearchTargets:
+    """_populate_research_targets derives the frontier from the completed sets"""
+
+    @pytest.fixture
+    def conn(self, tmp_path, templates_db):
+        conn = sqlite3.connect(tmp_path / "savegame.db")
+        conn.row_factory = sqlite3.Row
+        init_savegame_db(conn)
+        conn.execute(f"ATTACH DATABASE '{templates_db}' AS tpl")
+        yield conn
+        conn.close()
+
+    def _targets(self, conn):
+        return {r['name']: (r['available'], r['remaining_prereqs'], r['total_prereqs'])
+                for r in conn.execute("SELECT * FROM gs_research_targets")}
+
+    def test_nothing_completed(self, conn):
+        _populate_research_targets(conn)
+        targets = self._targets(conn)
+        assert targets["A"] == (1, 0, 0)
+        assert targets["E"] == (1, 0, 0)
+        assert targets["B"] == (0, 1, 1)
+        assert targets["P"] == (0, 4, 4)
+
+    def test_partial_progress(self, conn):
+        conn.executemany("INSERT INTO gs_research_completed VALUES (?)", [("A",), ("B",)])
+        _populate_research_targets(conn)
+        targets = self._targets(conn)
+        assert "A" not in targets and "B" not in targets
+        assert targets["C"] == (1, 0, 1)
+        assert targets["D"] == (0, 1, 3)
+        assert targets["P"] == (0, 2, 4)
+
+    def test_project_completion_counts(self, conn):
+        conn.executemany("INSERT INTO gs_research_completed VALUES (?)", [("A",), ("B",), ("C",), ("D",)])
+        _populate_research_targets(conn)
+        assert self._targets(conn)["P"] == (1, 0, 4)
+        conn.execute("DELETE FROM gs_research_targets")
+        conn.execute("INSERT INTO gs_projects_completed VALUES ('P')")
+        _populate_research_targets(conn)
+        assert "P" not in self._targets(conn)
+
+    def test_missing_tree_is_skipped(self, tmp_path):
+        conn = sqlite3.connect(tmp_path / "other.db")
+        init_savegame_db(conn)
+        conn.execute(f"ATTACH DATABASE '{tmp_path / 'empty.db'}' AS tpl")
+        _populate_research_targets(conn)
+        assert conn.execute("SELECT COUNT(*) FROM gs_research_targets").fetchone()[0] == 0
+        conn.close()
+
+
+class TestTechIndex:
+    """tech_index bits are append-only across rebuilds"""
+
+    def test_bits_stable_when_techs_added(self, tmp_path, templates_db):
+        templates = templates_db.parent / "templates"
+        conn = sqlite3.connect(templates_db)
+        before = dict(conn.execute("SELECT name, bit FROM tech_index").fetchall())
+        assert sorted(before.values()) == list(range(6))
+
+        (templates / "TITechTemplate.json").write_text(json.dumps([
+            {"dataName": "AA", "prereqs": []}, {"dataName": "A"}, {"dataName": "B"},
+        ]), encoding='utf-8')
+        build_tech_tree(conn, templates)
+        after = dict(conn.execute("SELECT name, bit FROM tech_index").fetchall())
+        assert after["A"] == before["A"] and after["B"] == before["B"]
+        assert after["AA"] == 6
+        assert "C" in after  # removed names keep their bit
+        conn.close()
@@ -0,0 +1,116 @@
+"""
+tests/db/test_template_tables.py
+
+Unit tests for src/db/template_tables.py — column inference, import, indexes.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from src.db.populate import require_templates
+from src.db.template_tables import import_all_templates, infer_columns, template_records, template_table
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    d = tmp_path / "templates"
+    d.mkdir()
+    (d / "TIHabModuleTemplate.json").write_text(json.dumps([
+        {"dataName": "Core", "tier": 1, "crew": 5, "power": -2.5, "requiresModule": "",
+         "costs": {"money": 10}, "mixed": 1},
+        {"dataName": "Mine", "tier": 2, "crew": 3, "power": 4, "requiresModule": "Core",
+         "costs": {"money": 20}, "mixed": "x", "isSpecial": True},
+    ]), encoding='utf-8')
+    (d / "TIHabSiteTemplate.json").write_text(json.dumps([
+        {"dataName": "MarsSite", "parentBodyName": "Mars"},
+    ]), encoding='utf-8')
+    (d / "TIGlobalConfig.json").write_text(json.dumps({"maxTier": 3, "data": "kept"}), encoding='utf-8')
+    return d
+
+
+class TestInferColumns:
+    """infer_columns picks one SQL type per scalar key"""
+
+    def test_types(self):
+        cols = dict(infer_columns([{"a": 1, "b": 1.5, "c": "s", "d": True, "e": [1]},
+                                   {"a": 2, "b": 2, "c": None, "d": False}]))
+        assert cols == {"a": "INTEGER", "b": "REAL", "c": "TEXT", "d": "INTEGER"}
+
+    def test_mixed_and_reserved_excluded(self):
+        cols = dict(infer_columns([{"m": 1, "data": 1, "rowid": 2}, {"m": "x"}]))
+        assert cols == {}
+
+    def test_case_collision(self):
+        assert infer_columns([{"Name": "a", "name": "b"}]) == [("Name", "TEXT")]
+
+
+class TestImport:
+    """import_all_templates loads every template into tpl_* tables"""
+
+    @pytest.fixture
+    def conn(self, templates_dir):
+        conn = sqlite3.connect(":memory:")
+        import_all_templates(conn, templates_dir)
+        yield conn
+        conn.close()
+
+    def test_typed_columns_and_json_rest(self, conn):
+        row = conn.execute(
+            "SELECT tier, crew, power, isSpecial, data FROM tpl_TIHabModuleTemplate WHERE dataName = 'Mine'"
+        ).fetchone()
+        assert row[:4] == (2, 3, 4.0, 1)
+        assert json.loads(row[4]) == {"costs": {"money": 20}, "mixed": "x"}
+
+    def test_dict_template_single_row(self, conn):
+        row = conn.execute("SELECT maxTier, data FROM tpl_TIGlobalConfig").fetchall()
+        assert row == [(3, json.dumps({"data": "kept"}))]
+
+    def test_indexes(self, conn):
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_tpl_TIHabModuleTemplate_dataName" in indexes
+        assert "idx_tpl_TIHabModuleTemplate_requiresModule" in indexes   # values match dataNames
+        assert "idx_tpl_TIHabSiteTemplate_parentBodyName" in indexes     # *Name reference
+
+    def test_registry(self, conn):
+        assert template_table(conn, "TIHabModuleTemplate") == "tpl_TIHabModuleTemplate"
+        assert template_table(conn, "TINothing") is None
+        assert template_table(sqlite3.connect(":memory:"), "TIHabModuleTemplate") is None
+
+    def test_records_round_trip(self, conn):
+        records = {r['dataName']: r for r in template_records(conn, "TIHabModuleTemplate")}
+        assert records['Mine'] == {"dataName": "Mine", "tier": 2, "crew": 3, "power": 4.0,
+                                   "requiresModule": "Core", "isSpecial": 1,
+                                   "costs": {"money": 20}, "mixed": "x"}
+        assert "isSpecial" not in records['Core']                        # null left out
+        assert template_records(conn, "TINothing") == []
+
+    def test_reimport_replaces(self, conn, templates_dir):
+        import_all_templates(conn, templates_dir)
+        assert conn.execute("SELECT COUNT(*) FROM tpl_TIHabModuleTemplate").fetchone()[0] == 2
+
+
+class TestRequireTemplates:
+    """Stage refuses to run without the tpl_* tables it joins against"""
+
+    def test_missing_db(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match="tias load"):
+            require_templates(tmp_path / "game_templates.db")
+
+    def test_missing_table(self, tmp_path, templates_dir):
+        db = tmp_path / "game_templates.db"
+        conn = sqlite3.connect(db)
+        import_all_templates(conn, templates_dir)
+        conn.commit()
+        conn.close()
+        with pytest.raises(FileNotFoundError, match=r"TISpaceBodyTemplate\(dataName, objectType\)"):
+            require_templates(db)
+
+        (templates_dir / "TISpaceBodyTemplate.json").write_text(
+            json.dumps([{"dataName": "Mars", "objectType": "Planet"}]), encoding='utf-8')
+        conn = sqlite3.connect(db)
+        import_all_templates(conn, templates_dir)
+        conn.commit()
+        conn.close()
+        require_templates(db)
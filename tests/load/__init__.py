@@ -0,0 +1 @@
+# Test package for load module
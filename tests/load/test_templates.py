@@ -0,0 +1,128 @@
+"""
+tests/load/test_templates.py
+
+Incremental, pooled template loading: per-template hash skipping and recovery.
+"""
+
+import json
+
+import pytest
+
+import src.core.tolerant_json as tolerant_json
+import src.db.localization as localization
+import src.load.command as load_command
+from src.load.command import load_templates, merge_localization
+
+
+@pytest.fixture
+def game_dir(tmp_path):
+    root = tmp_path / "game"
+    templates = root / "TerraInvicta_Data/StreamingAssets/Templates"
+    loc = root / "TerraInvicta_Data/StreamingAssets/Localization/en"
+    templates.mkdir(parents=True)
+    loc.mkdir(parents=True)
+    (templates / "TITraitTemplate.json").write_text(
+        json.dumps([{"dataName": "Brave"}, {"dataName": "Shy"}]), encoding='utf-8')
+    (templates / "TIBrokenTemplate.json").write_text(
+        '[{"dataName": "X",}, // trailing\n]', encoding='utf-8')
+    (loc / "TITraitTemplate.en").write_text(
+        "TITraitTemplate.displayName.Brave=Brave One\n", encoding='utf-8')
+    return root
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    d = tmp_path / "build"
+    d.mkdir()
+    return d
+
+
+def _manifest(build_dir):
+    return json.loads((build_dir / "templates_manifest.json").read_text(encoding='utf-8'))
+
+
+class TestLoadTemplates:
+    """load_templates builds, localizes and skips unchanged templates"""
+
+    def test_builds_and_localizes(self, game_dir, build_dir):
+        built = load_templates(game_dir, build_dir, workers=1)
+        assert set(built) == {"TITraitTemplate", "TIBrokenTemplate"}
+        traits = json.loads((build_dir / "templates/TITraitTemplate.json").read_text(encoding='utf-8'))
+        assert traits[0]["displayName"] == "Brave One"
+        assert _manifest(build_dir)["templates"]["TIBrokenTemplate"]["status"] == "recovered"
+
+    def test_unchanged_templates_skipped(self, game_dir, build_dir):
+        load_templates(game_dir, build_dir, workers=1)
+        out = build_dir / "templates/TITraitTemplate.json"
+        out.write_text("sentinel", encoding='utf-8')
+        load_templates(game_dir, build_dir, workers=1)
+        assert out.read_text(encoding='utf-8') == "sentinel"
+
+    def test_localization_change_rebuilds_only_that_template(self, game_dir, build_dir):
+        load_templates(game_dir, build_dir, workers=1)
+        broken_out = build_dir / "templates/TIBrokenTemplate.json"
+        broken_out.write_text("sentinel", encoding='utf-8')
+        loc = game_dir / "TerraInvicta_Data/StreamingAssets/Localization/en/TITraitTemplate.en"
+        loc.write_text("TITraitTemplate.displayName.Brave=Bold\n", encoding='utf-8')
+        load_templates(game_dir, build_dir, workers=1)
+        traits = json.loads((build_dir / "templates/TITraitTemplate.json").read_text(encoding='utf-8'))
+        assert traits[0]["displayName"] == "Bold"
+        assert broken_out.read_text(encoding='utf-8') == "sentinel"
+
+    def test_helper_code_change_rebuilds_all(self, game_dir, build_dir, tmp_path, monkeypatch):
+        """tolerant_json / localization shape the output, so they are part of the code hash."""
+        assert {tolerant_json.__file__, localization.__file__} <= set(map(str, load_command.TEMPLATE_CODE))
+        copies = []
+        for module in load_command.TEMPLATE_CODE:
+            copy = tmp_path / f"{len(copies)}_{module.name}"
+            copy.write_bytes(module.read_bytes())
+            copies.append(copy)
+        monkeypatch.setattr(load_command, 'TEMPLATE_CODE', tuple(copies))
+        load_templates(game_dir, build_dir, workers=1)
+        out = build_dir / "templates/TITraitTemplate.json"
+        out.write_text("sentinel", encoding='utf-8')
+        copies[1].write_text(copies[1].read_text(encoding='utf-8') + "\n# changed\n", encoding='utf-8')
+        load_templates(game_dir, build_dir, workers=1)
+        assert out.read_text(encoding='utf-8') != "sentinel"
+
+    def test_force_rebuilds_all(self, game_dir, build_dir):
+        load_templates(game_dir, build_dir, workers=1)
+        out = build_dir / "templates/TITraitTemplate.json"
+        out.write_text("sentinel", encoding='utf-8')
+        load_templates(game_dir, build_dir, workers=1, force=True)
+        assert out.read_text(encoding='utf-8') != "sentinel"
+
+    def test_process_pool_matches_serial(self, game_dir, build_dir, tmp_path):
+        load_templates(game_dir, build_dir, workers=2)
+        pooled = (build_dir / "templates/TITraitTemplate.json").read_text(encoding='utf-8')
+        serial_dir = tmp_path / "serial"
+        serial_dir.mkdir()
+        load_templates(game_dir, serial_dir, workers=1)
+        assert pooled == (serial_dir / "templates/TITraitTemplate.json").read_text(encoding='utf-8')
+
+
+class TestMergeLocalization:
+    """merge_localization mutates in place without recursion"""
+
+    def test_nested_nodes_localized_in_place(self):
+        data = [{'dataName': 'A', 'children': [{'dataName': 'B', 'x': 1}]}]
+        loc = {'A': {'displayName': 'Alpha'}, 'B': {'displayName': 'Beta', 'description': 'b'}}
+        result = merge_localization(data, loc)
+        assert result is data
+        assert data[0]['displayName'] == 'Alpha'
+        assert data[0]['children'][0] == {'dataName': 'B', 'x': 1, 'displayName': 'Beta', 'description': 'b'}
+
+    def test_existing_key_keeps_position(self):
+        data = {'displayName': 'old', 'dataName': 'A', 'z': 0}
+        merge_localization(data, {'A': {'displayName': 'new'}})
+        assert list(data) == ['displayName', 'dataName', 'z']
+        assert data['displayName'] == 'new'
+
+    def test_deep_tree_no_recursion_limit(self):
+        root = node = {'dataName': 'Deep'}
+        for _ in range(50_000):
+            node['next'] = {}
+            node = node['next']
+        node['dataName'] = 'Leaf'
+        merge_localization(root, {'Leaf': {'displayName': 'Bottom'}})
+        assert node['displayName'] == 'Bottom'
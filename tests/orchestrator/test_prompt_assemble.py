@@ -129,6 +129,20 @@ class TestGameState:
         )
         assert "CODEX is silent" in result.user
 
+    def test_report_artifact_preferred(self, tmp_path):
+        import json
+        from src.db.report_artifact import ARTIFACT_VERSION
+        from src.orchestrator.prompt_assemble import _load_gamestate
+        artifact = {
+            "version": ARTIFACT_VERSION,
+            "sections": [{"name": "earth", "text": "# EARTH & POLITICAL STATE\n"},
+                         {"name": "global", "text": "## Global\nCO2: 1 ppm"}],
+        }
+        (tmp_path / "report_2027-08-01.json").write_text(json.dumps(artifact), encoding="utf-8")
+        (tmp_path / "gamestate_earth.txt").write_text("legacy", encoding="utf-8")
+        report = _load_gamestate(tmp_path, "2027-08-01")
+        assert report == "# EARTH & POLITICAL STATE\n\n## Global\nCO2: 1 ppm"
+
 
 # ---------------------------------------------------------------------------
 # History
@@ -0,0 +1,85 @@
+"""
+Tests for performance spans
+
+Spans nest into a tree under the recorded command, across threads, and are
+stored with the run in logs/perf.db.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+import src.core.core as core
+from src.perf.performance import note, recorded, span
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(core, 'get_project_root', lambda: tmp_path)
+    return tmp_path / "logs"
+
+
+def runs(logs):
+    conn = sqlite3.connect(logs / "perf.db")
+    try:
+        return conn.execute("SELECT command, status, error, save_bytes, rows, args FROM runs ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def spans(logs):
+    conn = sqlite3.connect(logs / "perf.db")
+    try:
+        return conn.execute("SELECT name, parent, wall FROM spans ORDER BY rowid").fetchall()
+    finally:
+        conn.close()
+
+
+class TestSpans:
+    """Parent paths, thread roots and unrecorded spans"""
+
+    def test_nesting(self, logs):
+        @span('evaluate')
+        def evaluate():
+            with span('facts'):
+                pass
+
+        with recorded('stage', {'faction': 'resist'}):
+            with span('populate'):
+                with span('earth'):
+                    pass
+            evaluate()
+        assert [s[:2] for s in spans(logs)] == [
+            ('earth', 'stage/populate'),
+            ('populate', 'stage'),
+            ('facts', 'stage/evaluate'),
+            ('evaluate', 'stage'),
+        ]
+        assert all(s[2] >= 0 for s in spans(logs))
+        assert runs(logs) == [('stage', 'SUCCESS', None, None, None, '{"faction": "resist"}')]
+
+    def test_worker_thread_parent_is_root(self, logs):
+        with recorded('load'), span('templates'):
+            worker = threading.Thread(target=lambda: span('pack').__enter__().__exit__(None, None, None))
+            worker.start()
+            worker.join()
+        assert ('pack', 'load') in [s[:2] for s in spans(logs)]
+
+    def test_not_recorded(self, logs):
+        with span('orphan'):
+            note(rows=3)
+        assert not logs.exists()
+
+    def test_nested_recording_is_a_span(self, logs):
+        with recorded('play'), recorded('preset'):
+            pass
+        assert [s[:2] for s in spans(logs)] == [('preset', 'play')]
+        assert [r[0] for r in runs(logs)] == ['play']
+
+    def test_metrics_and_failure(self, logs):
+        with pytest.raises(ValueError), recorded('stage'):
+            note(save_bytes=1000, rows=5)
+            note(rows=7)
+            raise ValueError("bad, date")
+        assert runs(logs) == [('stage', 'FAILED', 'bad, date', 1000, 12, '{}')]
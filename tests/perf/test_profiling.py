@@ -0,0 +1,80 @@
+"""
+Tests for --profile
+
+CPU profiles merge build-graph worker threads; memory profiles report
+allocation sites per span; the flag works before any command.
+"""
+
+import pstats
+import sys
+import threading
+
+import pytest
+
+import src.core.core as core
+from src.perf.performance import span
+from src.perf.profiling import profiled
+
+
+def busy_worker():
+    return sum(i * i for i in range(20000))
+
+
+def run_in_worker():
+    def work():
+        with span('node'):
+            busy_worker()
+
+    worker = threading.Thread(target=work)
+    worker.start()
+    worker.join()
+
+
+class TestCpu:
+    """Profile file plus a text summary; worker threads included"""
+
+    def test_worker_threads_merged(self, tmp_path):
+        with profiled('stage', 'cpu', tmp_path):
+            run_in_worker()
+        (prof,) = tmp_path.glob("stage_*.prof")
+        functions = {name for _, _, name in pstats.Stats(str(prof)).stats}
+        assert 'busy_worker' in functions
+        summary = next(tmp_path.glob("stage_*.txt")).read_text(encoding='utf-8')
+        assert "1 worker thread profile(s) merged" in summary and "cumulative" in summary
+
+    def test_nested_is_noop(self, tmp_path):
+        with profiled('outer', 'cpu', tmp_path), profiled('inner', 'cpu', tmp_path) as inner:
+            assert inner is None
+        assert [p.stem.split('_')[0] for p in tmp_path.glob("*.prof")] == ['outer']
+
+
+class TestMem:
+    """Top allocation sites of the run and of each span"""
+
+    def test_span_sites(self, tmp_path):
+        with profiled('stage', 'mem', tmp_path):
+            with span('populate'):
+                with span('earth'):
+                    kept = [bytes(1000) for _ in range(2000)]
+        report = next(tmp_path.glob("stage_*_mem.txt")).read_text(encoding='utf-8')
+        assert "Top 30 allocation sites" in report
+        assert "populate/earth" in report and "  populate " in report
+        assert __file__ in report
+        assert len(kept) == 2000
+
+    def test_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError), profiled('stage', 'gpu', tmp_path):
+            pass
+
+
+class TestFlag:
+    """tias --profile <command> writes the report under logs/profiles/"""
+
+    @pytest.mark.parametrize('flag, suffix', [('--profile', '.prof'), ('--profile=mem', '_mem.txt')])
+    def test_main(self, tmp_path, monkeypatch, flag, suffix):
+        from src.__main__ import main
+
+        monkeypatch.setattr(core, 'get_project_root', lambda: tmp_path)
+        monkeypatch.setattr(sys, 'argv', ['tias', flag, 'perf'])
+        main()
+        assert [p.name for p in (tmp_path / "logs" / "profiles").iterdir() if p.name.endswith(suffix)]
@@ -0,0 +1,68 @@
+"""
+Tests for startup import cost
+
+Commands are imported only when selected, so light commands start without
+requests, numpy, the orchestrator or tomllib. The import time of `tias perf`
+and `tias validate` is measured with -X importtime and gated.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.__main__ import COMMANDS, load_command
+from src.perf.startup import parse_importtime, startup_imports, total_ms
+
+# Import time budget for the light commands (ms, after interpreter startup).
+# They measure ~30ms; the margin absorbs slower machines and -X importtime overhead.
+STARTUP_BUDGET_MS = 75
+
+HEAVY_MODULES = ('requests', 'numpy', 'src.orchestrator', 'tomllib', 'src.db.launch_calendar')
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 | encodings
+import time:       300 |        900 | site
+import time:       200 |        200 |     _sqlite3
+import time:       400 |        600 |   sqlite3
+import time:       500 |       1100 | src.perf.store
+import time:       700 |        700 | argparse
+"""
+
+
+@pytest.fixture(scope='module')
+def project(tmp_path_factory):
+    """A copy of src/ in a scratch project, so recorded runs go to its own logs/."""
+    root = tmp_path_factory.mktemp("project")
+    shutil.copytree(Path(__file__).parents[2] / "src", root / "src",
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    return root
+
+
+class TestLazyCommands:
+    """Every registered command resolves; none is imported up front"""
+
+    def test_registry(self):
+        for name in COMMANDS:
+            assert load_command(name).__name__ == f"cmd_{name}"
+
+    def test_parse_importtime(self):
+        imports = parse_importtime(SAMPLE)
+        assert [(i.module, i.depth) for i in imports] == [
+            ('_sqlite3', 2), ('sqlite3', 1), ('src.perf.store', 0), ('argparse', 0)]
+        assert total_ms(imports) == 1.8
+
+
+class TestStartupBudget:
+    """tias perf / tias validate start in tens of milliseconds"""
+
+    @pytest.mark.parametrize('command', ['perf', 'validate'])
+    def test_budget(self, project, command):
+        startup_imports([command], project)          # compile .pyc files first
+        imports = startup_imports([command], project)
+        modules = {i.module for i in imports}
+        assert f"src.{command}.command" in modules
+        assert not [m for m in modules if m.split('.')[0] in HEAVY_MODULES or m in HEAVY_MODULES
+                    or any(m.startswith(h + '.') for h in HEAVY_MODULES)]
+        assert total_ms(imports) < STARTUP_BUDGET_MS
@@ -0,0 +1,102 @@
+"""
+Tests for the performance store
+
+SQL percentiles and filters, retention, legacy CSV import and the phase tree
+shown by tias perf.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.perf.command import phase_tree
+from src.perf.performance import Span
+from src.perf.store import Run, command_stats, open_store, phase_stats, prune, trend, write_run
+
+
+def run(command='stage', wall=1.0, started_at='2027-08-01T10:00:00', **kwargs):
+    return Run(started_at=started_at, command=command, wall=wall, **kwargs)
+
+
+class TestStats:
+    """Nearest-rank percentiles per command and phase"""
+
+    def test_command_percentiles(self, tmp_path):
+        with open_store(tmp_path) as conn:
+            for i in range(1, 101):
+                write_run(conn, run(wall=float(i), status='FAILED' if i == 100 else 'SUCCESS'))
+            write_run(conn, run('parse', 0.5))
+            (parse, stage) = command_stats(conn)
+        assert (parse['command'], parse['count'], parse['p99']) == ('parse', 1, 0.5)
+        assert (stage['p50'], stage['p95'], stage['p99'], stage['max']) == (50.0, 95.0, 99.0, 100.0)
+        assert stage['failures'] == 1
+
+    def test_filters(self, tmp_path):
+        mb = 1024 * 1024
+        with open_store(tmp_path) as conn:
+            write_run(conn, run(wall=1.0, started_at='2027-07-31T23:00:00', save_bytes=2 * mb))
+            write_run(conn, run(wall=2.0, started_at='2027-08-01T09:00:00', save_bytes=2 * mb))
+            write_run(conn, run(wall=3.0, started_at='2027-08-02T09:00:00', save_bytes=40 * mb))
+            assert command_stats(conn, since='2027-08-01', until='2027-08-01')[0]['count'] == 1
+            assert command_stats(conn, min_save_mb=10)[0]['max'] == 3.0
+            assert command_stats(conn, max_save_mb=10)[0]['count'] == 2
+            assert command_stats(conn, command='parse') == []
+
+    def test_trend(self, tmp_path):
+        with open_store(tmp_path) as conn:
+            for day, wall in [(1, 1.0), (1, 3.0), (2, 2.0)]:
+                write_run(conn, run(wall=wall, started_at=f'2027-08-0{day}T10:00:00'))
+            rows = [tuple(r) for r in trend(conn, 'day')]
+        assert rows == [('stage', '2027-08-01', 2, 1.0, 3.0), ('stage', '2027-08-02', 1, 2.0, 2.0)]
+
+    def test_phase_tree(self, tmp_path):
+        with open_store(tmp_path) as conn:
+            for wall, parse in [(1.0, 0.6), (2.0, 1.4)]:
+                write_run(conn, run(wall=wall, spans=[
+                    Span('raw_db', 'stage', parse), Span('savegame_db', 'stage', 0.3, 0.3, 2048),
+                    Span('earth', 'stage/savegame_db', 0.1)]))
+            write_run(conn, run('preset', 0.1, spans=[Span('preset', 'preset', 0.05)]))
+            tree = phase_tree(phase_stats(conn))
+        assert [(d, n) for d, n, _ in tree['stage']] == [(1, 'raw_db'), (1, 'savegame_db'), (2, 'earth')]
+        raw = tree['stage'][0][2]
+        assert (raw['count'], raw['p50'], raw['p99']) == (2, 0.6, 1.4)
+        assert raw['share'] == pytest.approx(2.0 / 3.0)
+        assert tree['stage'][1][2]['rss_kb'] == 2048
+        assert [(d, n) for d, n, _ in tree['preset']] == [(1, 'preset')]
+
+
+class TestRetention:
+    """Old runs and runs past the cap are pruned with their spans"""
+
+    def test_prune(self, tmp_path):
+        now = datetime.now()
+        with open_store(tmp_path) as conn:
+            write_run(conn, run(started_at=(now - timedelta(days=400)).isoformat(),
+                                spans=[Span('raw_db', 'stage', 0.1)]))
+            for i in range(5):
+                write_run(conn, run(wall=float(i), started_at=(now - timedelta(minutes=5 - i)).isoformat()))
+            assert conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 5
+            assert conn.execute("SELECT COUNT(*) FROM spans").fetchone()[0] == 0
+            assert prune(conn, max_runs=3) == 2
+            assert [r[0] for r in conn.execute("SELECT wall FROM runs ORDER BY id")] == [2.0, 3.0, 4.0]
+
+
+class TestLegacyImport:
+    """CSV logs are imported once, including errors containing commas"""
+
+    def test_import(self, tmp_path):
+        (tmp_path / "performance.log").write_text(
+            "2027-08-01T10:00:00,stage,0.500,SUCCESS\n"
+            "2027-08-01T11:00:00,stage,0.700,FAILED,No savegame found, check GAME_SAVES_DIR\n"
+            "garbage\n")
+        (tmp_path / "spans.log").write_text(
+            "2027-08-01T10:00:00,stage,stage,,0.5000,0.4000,100\n"
+            "2027-08-01T10:00:00,stage,raw_db,stage,0.2000,0.1000,50\n")
+        with open_store(tmp_path) as conn:
+            rows = conn.execute("SELECT wall, status, error FROM runs ORDER BY id").fetchall()
+            assert [tuple(r) for r in rows] == [
+                (0.5, 'SUCCESS', None), (0.7, 'FAILED', 'No savegame found, check GAME_SAVES_DIR')]
+            assert [tuple(r) for r in conn.execute("SELECT name, parent FROM spans")] == [('raw_db', 'stage')]
+        assert (tmp_path / "performance.log.imported").exists() and not (tmp_path / "spans.log").exists()
+        with open_store(tmp_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
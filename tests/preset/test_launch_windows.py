@@ -4,6 +4,8 @@ Tests for launch window calculations
 Verifies against known game data points.
 """
 
+import logging
+
 import pytest
 from datetime import datetime
 from pathlib import Path
@@ -161,5 +163,70 @@ class TestEdgeCases:
         assert windows['Mars']['days_away'] > 0
 
 
+
+class TestDerivedWindows:
+    """Windows derived from orbital elements for every body with hab sites"""
+
+    @pytest.fixture
+    def templates_file(self, tmp_path):
+        import json
+        bodies = [
+            {"dataName": "Sol"},
+            {"dataName": "Earth", "barycenterName": "Sol", "semiMajorAxis_AU": 1.00000261,
+             "meanAnomalyAtEpoch_Deg": 100.46457166},
+            {"dataName": "MarsTwin", "displayName": "Mars Twin", "barycenterName": "Sol",
+             "semiMajorAxis_AU": 1.52371034, "meanAnomalyAtEpoch_Deg": 355.44656795},
+            {"dataName": "Deimos", "barycenterName": "MarsTwin", "semiMajorAxis_AU": 0.000157},
+            {"dataName": "Luna", "barycenterName": "Earth", "semiMajorAxis_AU": 0.00257},
+            {"dataName": "Vesta", "barycenterName": "Sol", "semiMajorAxis_AU": 2.36},
+        ]
+        sites = [{"dataName": f"{b}Site", "parentBodyName": b} for b in ("MarsTwin", "Deimos", "Luna", "Vesta")]
+        path = tmp_path / "TISpaceBodyTemplate.json"
+        path.write_text(json.dumps(bodies), encoding='utf-8')
+        (tmp_path / "TIHabSiteTemplate.json").write_text(json.dumps(sites), encoding='utf-8')
+        return path
+
+    def test_bodies_covered(self, templates_file):
+        windows = calculate_launch_windows(datetime(2026, 2, 1), templates_file)
+        # Luna is in Earth's system, Vesta lacks a mean anomaly; verified bodies always reported
+        assert set(windows) == {"MarsTwin", "Deimos", "Mars", "Sisyphus", "Hephaistos"}
+        assert windows["MarsTwin"]["display"] == "Mars Twin"
+
+    def test_skipped_bodies_logged(self, templates_file, caplog):
+        from src.preset.launch_windows import _cache
+        _cache.clear()
+        with caplog.at_level(logging.WARNING):
+            calculate_launch_windows(datetime(2026, 2, 1), templates_file)
+        assert "No launch windows for 1 bodies" in caplog.text and "Vesta" in caplog.text
+
+    def test_derived_matches_verified_mars(self, templates_file):
+        windows = calculate_launch_windows(datetime(2026, 2, 1), templates_file)
+        derived = datetime.strptime(windows["MarsTwin"]["next_window"], "%Y-%m-%d")
+        assert abs((derived - datetime(2026, 11, 13)).days) <= 5
+        assert abs(windows["MarsTwin"]["current_penalty"] - windows["Mars"]["current_penalty"]) <= 1
+
+    def test_moon_follows_planet(self, templates_file):
+        windows = calculate_launch_windows(datetime(2030, 5, 1), templates_file)
+        assert windows["Deimos"]["next_window"] == windows["MarsTwin"]["next_window"]
+
+    def test_verified_mars_unchanged(self, templates_file):
+        windows = calculate_launch_windows(datetime(2027, 8, 1), templates_file)
+        assert windows["Mars"]["next_window"] == "2029-01-01"
+        assert windows["Mars"]["days_away"] == 519
+        assert 31 <= windows["Mars"]["current_penalty"] <= 34
+
+    def test_vectorized_over_dates(self, templates_file):
+        import numpy as np
+        from src.preset.launch_windows import next_windows, window_parameters
+        params = window_parameters(templates_file)
+        days = np.arange(9000, 9800)
+        nxt, penalty = next_windows(params, days)
+        assert nxt.shape == penalty.shape == (len(days), len(params.names))
+        assert (nxt >= days[:, None]).all()
+        assert ((penalty >= 0) & (penalty <= 40)).all()
+        single, _ = next_windows(params, days[0])
+        assert (single == nxt[0]).all()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,128 @@
+"""
+Tests for transfer planning
+
+Lambert solutions against a textbook case, porkchop caching, and minimum-Δv
+window extraction.
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.db.body_index import SpaceBodies
+from src.db.populate import _populate_transfers
+from src.db.schema import init_savegame_db
+from src.preset.transfers import (
+    MU_SUN, Grid, best_windows, default_grid, lambert, orbit_elements, porkchop, transfer_windows,
+)
+
+# J2000 mean elements (Standish), in TISpaceBodyTemplate keys
+EARTH = {"dataName": "Earth", "barycenterName": "Sol", "semiMajorAxis_AU": 1.00000261,
+         "eccentricity": 0.01671123, "inclination_Deg": 0.0, "longAscendingNode_Deg": 0.0,
+         "argPeriapsis_Deg": 102.93768193, "meanAnomalyAtEpoch_Deg": -2.47311027}
+MARS = {"dataName": "Mars", "barycenterName": "Sol", "semiMajorAxis_AU": 1.52371034,
+        "eccentricity": 0.09339410, "inclination_Deg": 1.84969142, "longAscendingNode_Deg": 49.55953891,
+        "argPeriapsis_Deg": -73.5031685, "meanAnomalyAtEpoch_Deg": 19.39019754}
+
+
+class TestLambert:
+    """Universal-variable solver matches a known solution"""
+
+    def test_curtis_example(self):
+        # Curtis, Orbital Mechanics for Engineering Students, Example 5.2 (geocentric,
+        # km and s), rescaled so that μ_earth becomes MU_SUN
+        length = 10_000.0                                       # km per unit
+        time = np.sqrt(MU_SUN * length ** 3 / 398_600.0)        # s per unit
+        r1 = np.array([5000.0, 10000.0, 2100.0]) / length
+        r2 = np.array([-14600.0, 2500.0, 7000.0]) / length
+        v1, v2 = lambert(r1, r2, np.array(3600.0 / time))
+        assert v1 * length / time == pytest.approx([-5.9925, 1.9254, 3.2456], abs=1e-3)
+        assert v2 * length / time == pytest.approx([-3.3125, -4.1966, -0.38529], abs=1e-3)
+
+    def test_broadcasts(self):
+        r1 = np.array([1.0, 0.0, 0.0])
+        r2 = np.array([[0.0, 1.5, 0.0], [-1.2, 0.5, 0.0]])
+        v1, v2 = lambert(np.broadcast_to(r1, r2.shape), r2, np.array([150.0, 250.0]))
+        assert v1.shape == v2.shape == (2, 3)
+        assert np.isfinite(v1).all()
+
+
+class TestPorkchop:
+    """Earth–Mars grid finds the 2026 window and is cached"""
+
+    @pytest.fixture
+    def grid(self):
+        return Grid(dep_start=9600, dep_days=400, dep_step=4, tof_min=150, tof_max=400, tof_steps=50)
+
+    def test_mars_2026_window(self, grid):
+        dv = porkchop(orbit_elements(EARTH), orbit_elements(MARS), grid)
+        assert dv.shape == (100, 50) and dv.dtype == np.float32
+        dep, tof, best = best_windows(dv, grid, limit=1)[0]
+        assert 9800 <= dep <= 9820                   # late Oct – mid Nov 2026
+        assert 5.4 < best < 6.0
+
+    def test_cache_hit_and_eviction(self, tmp_path, grid):
+        earth, mars = orbit_elements(EARTH), orbit_elements(MARS)
+        first = porkchop(earth, mars, grid, tmp_path, cache_entries=2)
+        (entry,) = tmp_path.glob("*.npy")
+        os.utime(entry, (0, 0))
+        assert np.array_equal(porkchop(earth, mars, grid, tmp_path, cache_entries=2), first, equal_nan=True)
+        assert entry.stat().st_mtime > 0             # hit refreshes recency
+
+        for start in (9700, 9800):
+            porkchop(earth, mars, Grid(start, 40, 4, 150, 400, 10), tmp_path, cache_entries=2)
+        assert len(list(tmp_path.glob("*.npy"))) == 2
+        assert not entry.exists()                    # oldest evicted
+
+    def test_default_grid_brackets_hohmann(self):
+        grid = default_grid(orbit_elements(EARTH), orbit_elements(MARS), 9000)
+        assert grid.tof_min < 259 < grid.tof_max
+
+
+class TestBestWindows:
+    """Local minima along departure, cheapest first"""
+
+    def test_minima(self):
+        grid = Grid(0, 6, 1, 100, 200, 2)
+        dv = np.array([[9, 8], [7, 6], [8, 9], [5, np.nan], [6, 7], [9, 9]], dtype=np.float32)
+        assert best_windows(dv, grid) == [(3.0, 100.0, 5.0), (1.0, 200.0, 6.0)]
+
+    def test_unsolved(self):
+        assert best_windows(np.full((3, 2), np.nan), Grid(0, 3, 1, 1, 2, 2)) == []
+
+
+class TestTransferWindows:
+    """Hab-site bodies get future windows; moons share their planet's"""
+
+    @pytest.fixture
+    def space_bodies(self):
+        bodies = [
+            {"dataName": "Sol"}, EARTH, MARS,
+            {"dataName": "Phobos", "barycenterName": "Mars", "displayName": "Phobos"},
+            {"dataName": "Luna", "barycenterName": "Earth"},
+        ]
+        return SpaceBodies({b["dataName"]: b for b in bodies}, ("Luna", "Mars", "Phobos"), {})
+
+    def test_windows(self, space_bodies, tmp_path):
+        result = transfer_windows(datetime(2026, 6, 1), space_bodies.bodies, space_bodies.targets,
+                                  tmp_path / "cache")
+        assert set(result) == {"Mars", "Phobos"}
+        assert result["Phobos"]["windows"] == result["Mars"]["windows"]
+        today = (datetime(2026, 6, 1) - datetime(2000, 1, 1)).days
+        assert all(dep >= today for dep, _, _ in result["Mars"]["windows"])
+        assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+
+    def test_snapshot(self, space_bodies, tmp_path):
+        conn = sqlite3.connect(tmp_path / "savegame.db")
+        init_savegame_db(conn)
+        _populate_transfers(conn, datetime(2026, 6, 1), space_bodies, tmp_path / "templates")
+        row = conn.execute(
+            "SELECT display_name, departure_date, tof_days, dv_kms FROM gs_transfers "
+            "WHERE body = 'Phobos' AND seq = 1"
+        ).fetchone()
+        assert row[0] == "Phobos" and row[1].startswith("2026-1")
+        assert 5.4 < row[3] < 6.0
+        conn.close()
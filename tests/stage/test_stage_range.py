@@ -0,0 +1,72 @@
+"""
+Tests for multi-faction, multi-date staging
+
+Savegame discovery over a date range, per-faction tier evaluation from one
+shared GameState, and the summary table.
+"""
+
+import sys
+from datetime import datetime
+
+import pytest
+
+from src.__main__ import main
+from src.db.gamestate import GameState
+from src.parse.command import find_savegames
+from src.stage.command import evaluate_tier, format_summary
+
+
+class TestFindSavegames:
+    """Dates come from the filename suffix; results are in date order"""
+
+    def test_range(self, tmp_path):
+        for name in ("Resist_2027-8-1.gz", "Resist_2027-6-1.gz", "Resist_2026-12-31.gz",
+                     "Autosave_2027-7-15.gz", "notes.gz", "Resist_2027-6-1.json"):
+            (tmp_path / name).touch()
+        found = find_savegames(tmp_path, datetime(2027, 1, 1), datetime(2027, 8, 1))
+        assert list(found) == [datetime(2027, 6, 1), datetime(2027, 7, 15), datetime(2027, 8, 1)]
+        assert found[datetime(2027, 7, 15)].name == "Autosave_2027-7-15.gz"
+
+
+class TestMultiFaction:
+    """Factions staged from one save each get their own tier"""
+
+    def test_factions_share_gamestate(self, tmp_path, tier_gamestate, write_raw_db, ref):
+        data = tier_gamestate(stations=0, members=1)
+        data['TIFactionState'][0]['Value']['displayName'] = 'The Resistance'
+        data['TIFactionState'].append({'Key': ref(11), 'Value': {'displayName': 'Humanity First'}})
+        db = write_raw_db(data)
+
+        gs = GameState(db)
+        states = {}
+        for faction in ('resist', 'destroy'):
+            (tmp_path / faction).mkdir()
+            states[faction] = evaluate_tier(db, tmp_path / faction, '2027-08-01', gamestate=gs, faction=faction)
+        assert states['resist']['current_tier'] == 2
+        assert states['destroy']['current_tier'] == 1
+        assert states['destroy']['station_count'] == 1      # faction 11's station only
+
+    def test_summary(self):
+        state = {'current_tier': 2, 'readiness': 0.633, 'tier2_met': 2, 'tier2_needed': 2,
+                 'tier3_met': 1, 'tier3_needed': 3}
+        table = format_summary({'2027-06-01': {'resist': state}, '2027-08-01': {}}, ['resist', 'destroy'])
+        header, first, second = table.splitlines()
+        assert header.split() == ['Date', 'resist', 'destroy']
+        assert first.split() == ['2027-06-01', 'T2', '63%', '2/2', '1/3', '—']
+        assert second.split() == ['2027-08-01', '—', '—']
+
+
+class TestArguments:
+    """--date and --from/--to are checked when the command line is parsed"""
+
+    @pytest.mark.parametrize("dates,message", [
+        (['--date', '2027-8-1', '--to', '2027-9-1'], "--to goes with --from, not --date"),
+        (['--from', '2027-1-1'], "--from needs --to"),
+        (['--to', '2027-9-1'], "one of the arguments --date --from is required"),
+    ])
+    def test_invalid(self, monkeypatch, capsys, dates, message):
+        monkeypatch.setattr(sys, 'argv', ['tias', 'stage', '--faction', 'resist', *dates])
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+        assert exit_info.value.code == 2
+        assert message in capsys.readouterr().err
@@ -0,0 +1,82 @@
+"""
+Tests for the tier rule engine
+
+Rules read shared facts (each gamestate array loaded once) and agree with
+the tier thresholds.
+"""
+
+import json
+from collections import Counter
+
+import pytest
+
+from src.stage.command import evaluate_tier
+from src.stage.tier_rules import GS, RULES, Facts, evaluate
+
+
+class TestRules:
+    """Single pass over shared facts"""
+
+    def test_arrays_loaded_once(self, tier_gamestate):
+        data, loads = tier_gamestate(), Counter()
+
+        def load(key):
+            loads[key] += 1
+            return data[key.removeprefix(GS)]
+
+        results = evaluate(Facts(load))
+        assert [r.name for r in results] == [r.name for r in RULES]
+        assert loads and max(loads.values()) == 1
+
+    def test_conditions(self, tier_gamestate):
+        data = tier_gamestate()
+        results = {r.name: r for r in evaluate(Facts(lambda key: data[key.removeprefix(GS)]))}
+        assert results['luna_mars_mine'].met
+        assert results['stations_3plus'].met and results['stations_3plus'].detail == "3/3 stations"
+        assert results['federation_3plus'].met
+        assert results['mc_10plus'].met and not results['mc_25plus'].met
+        assert results['jupiter_fleet'].met
+        assert not results['major_federation'].met
+        assert results['orbital_ring'].stub and not results['orbital_ring'].met
+
+    @pytest.mark.parametrize("fleet_body,met", [(12, True), (10, True), (102, False), (6, False)])
+    def test_jupiter_fleet_by_zone(self, tier_gamestate, fleet_body, met):
+        data = tier_gamestate(fleet_body=fleet_body)      # Ceres' key is above Jupiter's
+        results = {r.name: r.met for r in evaluate(Facts(lambda key: data[key.removeprefix(GS)]))}
+        assert results['jupiter_fleet'] == met
+
+    @pytest.mark.parametrize("stations,members,met", [(2, 2, False), (3, 2, True), (0, 5, True)])
+    def test_thresholds(self, tier_gamestate, stations, members, met):
+        data = tier_gamestate(stations=stations, members=members)
+        results = {r.name: r.met for r in evaluate(Facts(lambda key: data[key.removeprefix(GS)]))}
+        assert (results['stations_3plus'] or results['federation_3plus']) == met
+        assert results['major_federation'] == (members >= 5)
+
+
+class TestEvaluateTier:
+    """evaluate_tier writes tier_state with per-rule explanations"""
+
+    def test_state(self, tmp_path, tier_gamestate, write_raw_db):
+        db = write_raw_db(tier_gamestate(stations=0, members=1))
+
+        state = evaluate_tier(db, tmp_path, '2027-08-01')
+        assert state['current_tier'] == 2                   # mine + MC
+        assert state['tier2_met'] == 2 and state['hab_count'] == 1
+        assert state['stubs'] == ['earth_shipyard', 'orbital_ring', 'mission_success']
+        assert state['rules']['mc_10plus']['detail'] == "MC capacity 12/10"
+        assert json.loads((tmp_path / "tier_state_2027-08-01.json").read_text()) == state
+
+    @pytest.mark.parametrize("aboard", [True, False])
+    def test_earth_shipyard_counts(self, tmp_path, tier_gamestate, write_raw_db, ref, aboard):
+        """Flagged as a stub, but a councilor on an Earth LEO station still counts (as before the rules)."""
+        data = tier_gamestate(stations=0, members=1)
+        data['TIHabState'].append({'Key': ref(150), 'Value': {'faction': ref(10), 'habType': 'Station',
+                                                              'inEarthLEO': True}})
+        if aboard:      # moved off the Luna base, so the mine no longer counts
+            data['TICouncilorState'][0]['Value']['location']['value'] = 150
+
+        state = evaluate_tier(write_raw_db(data), tmp_path, '2027-08-01')
+        assert state['tier2_conditions']['earth_shipyard'] is aboard
+        assert state['tier2_conditions']['luna_mars_mine'] is not aboard
+        assert state['tier2_met'] == 2 and state['current_tier'] == 2
+        assert 'earth_shipyard' in state['stubs']